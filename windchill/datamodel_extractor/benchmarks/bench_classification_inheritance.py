@@ -0,0 +1,237 @@
+"""
+File: bench_classification_inheritance.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Benchmark of the Classification extraction done by `extract_xml_transformer.py` on a synthetic classification tree.
+It generates a flat Windchill classification load file (10 000 nodes by default, with inherited and overridden attributes),
+then compares the previous string based algorithm (split, re-join and merge of '~' rows at every node) with the current
+record based one (shared attribute sets, rows built at output), and checks both produce the same rows.
+With --shuffle, the same nodes are also written in random order to check the hierarchy is resolved whatever the node order.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_classification_inheritance.py -n 10000 -r 3
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_classification_inheritance.py -n 10000 --shuffle
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_classification_inheritance.py -n 10000 -o .\\synthetic_classification.xml
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from extract_xml_transformer import XMLTransformer, XPATHS, property_index, EMPTY_PROPERTY, CLASSIFICATION_HEADER
+from xml_normalizer import HANDLER_NORMALIZER
+
+LOADER = 'com.ptc.core.lwc.server.TypeDefinitionLoader'
+CONSTRAINTS = [
+    ('com.ptc.core.lwc.server.LWCValueRequiredConstraint', ''),
+    ('com.ptc.core.lwc.server.LWCSingleValuedConstraint', ''),
+    ('com.ptc.core.lwc.server.LWCUpperCaseConstraint', ''),
+    ('com.ptc.core.lwc.server.LWCStringLengthConstraint', 'DATA|com.ptc.core.meta.common.AnalogSet|[DATA|java.lang.Long|0 \\, DATA|java.lang.Long|40]'),
+    ('com.ptc.core.lwc.server.LWCDiscreteSetConstraint', 'DATA|com.ptc.core.meta.common.DiscreteSet|DATA|java.lang.Boolean|false , DATA|java.lang.String|A , DATA|java.lang.String|B'),
+]
+
+def property_block(handler, name, value, value_fr=''):
+    return (f'   <csvPropertyValue handler="{LOADER}.{handler}">\n'
+            f'      <csvname>{name}</csvname>\n'
+            f'      <csvisDefault>false</csvisDefault>\n'
+            f'      <csvvalue>{value}</csvvalue>\n'
+            f'      <csvlocale_fr>{value_fr}</csvlocale_fr>\n'
+            f'   </csvPropertyValue>\n')
+
+def attribute_block(name, datatype, unit, constraints, displayed):
+    lines = [f'   <csvBeginAttributeDefView handler="{LOADER}.beginProcessAttributeDefinition">\n'
+             f'      <csvname>{name}</csvname>\n'
+             f'      <csvattDefClass>com.ptc.core.lwc.server.LWCIBAAttDefinition</csvattDefClass>\n'
+             f'      <csvdatatype>{datatype}</csvdatatype>\n'
+             f'      <csvIBA>{name}</csvIBA>\n'
+             f'      <csvQoM>{unit}</csvQoM>\n'
+             f'      <csvdefaults/>\n'
+             f'   </csvBeginAttributeDefView>\n']
+    if displayed:
+        lines.append(property_block('processAttributePropertyValue', 'displayName', name + ' label', name + ' libelle'))
+    for rule_classname, rule_data in constraints:
+        lines.append(f'   <csvBeginConstraintDefView handler="{LOADER}.beginProcessConstraintDefinition">\n'
+                     f'      <csvruleClassname>{rule_classname}</csvruleClassname>\n'
+                     f'      <csvruleData>{rule_data}</csvruleData>\n'
+                     f'      <csvdefQualifier/>\n'
+                     f'   </csvBeginConstraintDefView>\n'
+                     f'   <csvEndConstraintDefView handler="{LOADER}.endProcessConstraintDefinition"/>\n')
+    lines.append(f'   <csvEndAttributeDefView handler="{LOADER}.endProcessAttributeDefinition"/>\n')
+    return ''.join(lines)
+
+def generate_classification(node_count, seed=1, max_depth=6, shuffle=False):
+    # Flat classification load file shaped like a Windchill export: one root, one top node, then families and their sub-trees.
+    # Each node defines a few attributes and redefines some inherited ones with extra constraints (override merge).
+    # Nodes are written parent first (depth-first), or in random order when shuffle is set
+    generator = random.Random(seed)
+    depths = {'': -1}
+    inherited_names = {'': []}
+    children = {}
+    blocks = {}
+    parents = []
+    for index in range(node_count):
+        parent = generator.choice(parents[-200:]) if index > 1 else (f'SYN{index - 1:05d}' if index else '')
+        node = f'SYN{index:05d}'
+        parts = [f'   <csvBeginTypeDefView handler="{LOADER}.beginProcessTypeDefinition">\n'
+                 f'      <csvattTemplate>LWCSTRUCT</csvattTemplate>\n'
+                 f'      <csvname>{node}</csvname>\n'
+                 f'      <csvtypeParent>{parent}</csvtypeParent>\n'
+                 f'   </csvBeginTypeDefView>\n']
+        parts.append(property_block('processTypePropertyValue', 'displayName', node + ' display', node + ' affichage'))
+        parts.append(property_block('processTypePropertyValue', 'instantiable', 'true' if index % 3 else 'false'))
+        names = list(inherited_names[parent])
+        for attribute in range(generator.randint(0, 3)):
+            name = f'{node}Attr{attribute}'
+            names.append(name)
+            datatype, unit = generator.choice([('java.lang.String', ''), ('java.lang.Long', ''), ('wt.units.FloatingPointWithUnits', 'Mass')])
+            parts.append(attribute_block(name, datatype, unit, generator.sample(CONSTRAINTS, generator.randint(0, 2)), True))
+        for name in generator.sample(inherited_names[parent], min(len(inherited_names[parent]), generator.randint(0, 2))):
+            parts.append(attribute_block(name, '', '', generator.sample(CONSTRAINTS[:3], 1), False))
+        parts.append(f'   <csvEndTypeDefView handler="{LOADER}.endProcessTypeDefinition"/>\n')
+        blocks[node] = ''.join(parts)
+        children.setdefault(parent, []).append(node)
+        inherited_names[node] = names
+        depths[node] = depths[parent] + 1
+        if 0 < depths[node] < max_depth:
+            parents.append(node)  # the root only has the top node, nodes at max_depth are leaves
+    if shuffle:
+        order = list(blocks)
+        generator.shuffle(order)
+    else:
+        order = []
+        pending = [children[''][0]]
+        while pending:
+            node = pending.pop()
+            order.append(node)
+            pending.extend(reversed(children.get(node, [])))
+    return ''.join(['<?xml version="1.0" encoding="UTF-8"?>\n<NmLoader>\n',
+                    f'   <csvBeginTypes handler="{LOADER}.beginProcessTypes">\n      <csvattTemplate>LWCSTRUCT</csvattTemplate>\n   </csvBeginTypes>\n']
+                   + [blocks[node] for node in order]
+                   + [f'   <csvEndTypes handler="{LOADER}.endProcessTypes"/>\n</NmLoader>\n'])
+
+class StringClassificationTransformer(XMLTransformer):
+    # Classification extraction as written before the attribute records: '~' rows are split, re-keyed and merged at every node
+    def extract_data_classification(self, root):
+        header_line = CLASSIFICATION_HEADER
+        self.extracted_strings.clear()
+        self.extracted_strings.append(header_line)
+        type_depth_map = {}
+        type_attributes_map = {}
+        Family = "ROOT"
+        for type_def_view in XPATHS['type_defs_lwcstruct'](root):
+            typeObject = type_def_view.findtext('./csvname') or ''
+            parentType = type_def_view.findtext('./csvtypeParent') or ''
+            properties = property_index(type_def_view)
+            instantiable = properties.get('instantiable', EMPTY_PROPERTY)[0]
+            instantiable = 'Yes' if instantiable and instantiable.lower() == 'true' else 'No'
+            displayType, displayTypeFR = properties.get('displayName', EMPTY_PROPERTY)
+            descriptionType, descriptionTypeFR = properties.get('description', EMPTY_PROPERTY)
+            depth = 0
+            current_parent = parentType
+            while current_parent:
+                depth += 1
+                current_parent = type_depth_map.get(current_parent, None)
+            if str(depth) == "2":
+                Family = typeObject
+            type_depth_map[typeObject] = parentType
+            type_line = f"{Family}~{depth}~{typeObject}~{parentType}~{instantiable}~{displayType}~{displayTypeFR}~{descriptionType}~{descriptionTypeFR}" + "~" * 14
+            current_attributes = []
+            for attr_def_view in XPATHS['attribute_defs'](type_def_view):
+                current_attributes.extend(self.extract_attribute_definitions(attr_def_view, typeObject, parentType, depth, Family, instantiable, displayType, displayTypeFR, descriptionType, descriptionTypeFR, 'Classification'))
+            ancestor_attributes = []
+            if parentType in type_attributes_map:
+                for attr in type_attributes_map[parentType]:
+                    updated_attr = attr.split("~")
+                    updated_attr[:9] = [Family, str(depth), typeObject, parentType, instantiable, displayType, displayTypeFR, descriptionType, descriptionTypeFR]
+                    ancestor_attributes.append("~".join(updated_attr))
+            combined_attributes = ancestor_attributes + current_attributes
+            combined_attributes.sort(key=lambda x: x.split("~")[9])
+            unique_attributes = list(dict.fromkeys(combined_attributes))
+            merged_and_unique_attributes = self.merge_attributes_with_override(header_line, unique_attributes)
+            merged_and_unique_attributes.sort(key=lambda x: x.split("~")[9])
+            self.extracted_strings.append(type_line)
+            self.extracted_strings.extend(merged_and_unique_attributes)
+            type_attributes_map[typeObject] = merged_and_unique_attributes
+        if len(self.extracted_strings) == 1:
+            self.extracted_strings.clear()
+        return self.extracted_strings
+
+    def merge_attributes_with_override(self, header_line, unique_attributes):
+        boolean_columns = [index for index, column_name in enumerate(header_line.split("~")) if column_name in {"required", "single", "upperCase"}]
+        attribute_groups = {}
+        for attribute in unique_attributes:
+            attr_parts = attribute.split("~")
+            attribute_groups.setdefault(tuple(attr_parts[:10]), []).append(attr_parts)
+        merged_attributes = []
+        for group in attribute_groups.values():
+            merged_row = group[0]
+            for attr_parts in group[1:]:
+                for i, value in enumerate(attr_parts):
+                    if i >= 10:
+                        if i in boolean_columns:
+                            if value == "Yes" or merged_row[i] == "Yes":
+                                merged_row[i] = "Yes"
+                        elif value:
+                            merged_row[i] = value if merged_row[i] == "" else merged_row[i]
+            merged_attributes.append("~".join(merged_row))
+        return merged_attributes
+
+def measure(transformer, root, repeat):
+    # Best time over repeat runs, then peak memory of one traced run
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = list(transformer.extract_data_classification(root))
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    transformer.extract_data_classification(root)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, min(timings), peak
+
+def run():
+    parser = argparse.ArgumentParser(description="Benchmark string based against record based Classification extraction on a synthetic tree.")
+    parser.add_argument('-n', '--nodes', type=int, default=10000, help="Number of classification nodes to generate (default: 10000)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Number of runs, best time is reported (default: 3)")
+    parser.add_argument('-d', '--max_depth', type=int, default=6, help="Maximum depth of the generated tree (default: 6)")
+    parser.add_argument('-s', '--seed', type=int, default=1, help="Random seed of the generator (default: 1)")
+    parser.add_argument('-o', '--output', type=str, help="Optional path to save the generated XML file")
+    parser.add_argument('--shuffle', action='store_true', help="Also extract the same nodes written in random order and check the rows are the same")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    xml_content = generate_classification(args.nodes, args.seed, args.max_depth)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(xml_content)
+    transformer = XMLTransformer('synthetic_classification.xml', '.')
+    root = etree.fromstring(HANDLER_NORMALIZER.normalize(xml_content).encode('utf-8'))
+
+    string_rows, string_time, string_peak = measure(StringClassificationTransformer('synthetic_classification.xml', '.'), root, args.repeat)
+    record_rows, record_time, record_peak = measure(transformer, root, args.repeat)
+    if string_rows != record_rows:
+        print("ERROR: string based and record based extraction produce different rows")
+        sys.exit(1)
+
+    print(f"Nodes: {args.nodes}, rows: {len(record_rows)}, XML size: {len(xml_content) / 1048576:.1f} MB")
+    print(f"String rows (previous code): {string_time * 1000:9.1f} ms, peak {string_peak / 1048576:7.1f} MB")
+    print(f"Attribute records:           {record_time * 1000:9.1f} ms, peak {record_peak / 1048576:7.1f} MB")
+    print(f"Speedup: x{string_time / record_time:.1f}")
+
+    if args.shuffle:
+        # Same nodes in random order: children may come before their parents
+        shuffled_root = etree.fromstring(HANDLER_NORMALIZER.normalize(generate_classification(args.nodes, args.seed, args.max_depth, shuffle=True)).encode('utf-8'))
+        shuffled_rows, shuffled_time, _ = measure(transformer, shuffled_root, args.repeat)
+        same_rows = sorted(shuffled_rows) == sorted(record_rows)
+        print(f"Shuffled nodes:              {shuffled_time * 1000:9.1f} ms, same rows: {'yes' if same_rows else 'NO'}")
+        if not same_rows:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,193 @@
+"""
+File: bench_extractor.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Throughput benchmark of the datamodel extractor. For each sample folder (input and inputSEP by default) and each scale,
+a corpus is generated with `generate_corpus.py`, then:
+- XMLTransformer is run on the files of each kind (Types, Classification, Enum, Lifecycle, OIR)
+- ExcelFileProcessor builds the workbook of each folder of the corpus (kind 'Workbook')
+Each measurement runs in a fresh process, so its peak RSS is its own. Files/s, MB/s, rows/s and peak RSS are printed and can be saved as JSON.
+The compare mode reads two JSON results and flags the measurements that regressed by more than a threshold.
+Peak RSS is read from /proc (Linux) or the resource module (macOS); it is reported as null elsewhere.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_extractor.py -s 1 10 -o .\\bench_baseline.json
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_extractor.py -s 1 10 -o .\\bench_new.json
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_extractor.py --compare .\\bench_baseline.json .\\bench_new.json -t 10
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_corpus import generate_corpus
+
+KINDS = ['Types', 'Classification', 'Enum', 'Lifecycle', 'OIR']
+# Metrics compared between two runs: higher is better for the throughputs, lower is better for the memory
+HIGHER_IS_BETTER = ['files_per_s', 'mb_per_s', 'rows_per_s']
+LOWER_IS_BETTER = ['peak_rss_mb']
+
+def peak_rss_mb():
+    # Peak resident set size of this process. On Linux VmHWM is read first: ru_maxrss is kept across exec,
+    # so a spawned process would report the peak of the process that started it
+    try:
+        with open('/proc/self/status', 'r') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KB on Linux, in bytes on macOS
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1048576 if sys.platform == 'darwin' else peak / 1024
+
+def measure_transform(file_paths, repeat):
+    # Runs in a fresh process: transform the files of one kind, best time of the repeats
+    logging.getLogger().setLevel(logging.WARNING)
+    from extract_xml_transformer import XMLTransformer
+    best = None
+    rows = 0
+    with tempfile.TemporaryDirectory() as output_folder:
+        for _ in range(repeat):
+            rows = 0
+            start = time.perf_counter()
+            for file_path in file_paths:
+                transformer = XMLTransformer(file_path, output_folder)
+                transformer.transform(write_csv=False)
+                rows += len(transformer.extracted_strings)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best, rows, peak_rss_mb()
+
+def measure_workbooks(folders, repeat):
+    # Runs in a fresh process: build the workbook of each folder, every file transformed (force), best time of the repeats
+    logging.getLogger().setLevel(logging.WARNING)
+    from extract_excel_processor import ExcelFileProcessor
+    best = None
+    rows = 0
+    with tempfile.TemporaryDirectory() as output_root:
+        for _ in range(repeat):
+            rows = 0
+            start = time.perf_counter()
+            for index, folder in enumerate(folders):
+                processor = ExcelFileProcessor(folder, os.path.join(output_root, str(index)), force=True)
+                processor.process_excel_file()
+                rows += sum(timing[3] for timing in processor.file_timings)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best, rows, peak_rss_mb()
+
+def measure_in_process(function, *args):
+    # Each measurement gets its own interpreter (spawn), so the peak RSS does not carry over from earlier measurements
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(function, *args).result()
+
+def result_entry(sample, scale, kind, file_paths, seconds, rows, peak):
+    size = sum(os.path.getsize(file_path) for file_path in file_paths)
+    return {'sample': sample, 'scale': scale, 'kind': kind, 'files': len(file_paths), 'bytes': size, 'rows': rows,
+            'seconds': round(seconds, 6), 'files_per_s': round(len(file_paths) / seconds, 3), 'mb_per_s': round(size / 1048576 / seconds, 3),
+            'rows_per_s': round(rows / seconds, 3), 'peak_rss_mb': None if peak is None else round(peak, 1)}
+
+def benchmark_sample(sample_folder, scale, repeat, corpus_root):
+    # Measurements of one sample folder at one scale
+    sample = os.path.basename(os.path.normpath(sample_folder))
+    corpus = os.path.join(corpus_root, f"{sample}_x{scale}")
+    kinds = generate_corpus(sample_folder, corpus, scale)
+    results = []
+    for kind in KINDS:
+        file_paths = [os.path.join(corpus, path) for path, file_kind in sorted(kinds.items()) if file_kind == kind]
+        if file_paths:
+            seconds, rows, peak = measure_in_process(measure_transform, file_paths, repeat)
+            results.append(result_entry(sample, scale, kind, file_paths, seconds, rows, peak))
+    folders = sorted({os.path.dirname(os.path.join(corpus, path)) for path in kinds})
+    file_paths = [os.path.join(corpus, path) for path in sorted(kinds)]
+    seconds, rows, peak = measure_in_process(measure_workbooks, folders, repeat)
+    results.append(result_entry(sample, scale, 'Workbook', file_paths, seconds, rows, peak))
+    return results
+
+def print_results(results):
+    print(f"{'Sample':10} {'Scale':>5} {'Kind':15} {'Files':>6} {'MB':>8} {'Rows':>9} {'files/s':>9} {'MB/s':>8} {'rows/s':>10} {'RSS (MB)':>9}")
+    for entry in results:
+        peak = '-' if entry['peak_rss_mb'] is None else f"{entry['peak_rss_mb']:.1f}"
+        print(f"{entry['sample'][:10]:10} {entry['scale']:5} {entry['kind']:15} {entry['files']:6} {entry['bytes'] / 1048576:8.2f} {entry['rows']:9} "
+              f"{entry['files_per_s']:9.1f} {entry['mb_per_s']:8.2f} {entry['rows_per_s']:10.0f} {peak:>9}")
+
+def compare_results(baseline, current, threshold):
+    # Measurements of both runs are matched on (sample, scale, kind); returns the number of regressions
+    baseline_entries = {(entry['sample'], entry['scale'], entry['kind']): entry for entry in baseline['results']}
+    regressions = 0
+    print(f"{'Sample':10} {'Scale':>5} {'Kind':15} {'Metric':12} {'Baseline':>12} {'Current':>12} {'Change':>8}")
+    for entry in current['results']:
+        key = (entry['sample'], entry['scale'], entry['kind'])
+        if key not in baseline_entries:
+            print(f"{key[0][:10]:10} {key[1]:5} {key[2]:15} not in baseline")
+            continue
+        base = baseline_entries[key]
+        if base['rows'] != entry['rows']:
+            # Same corpus, other number of rows: the extraction output changed
+            print(f"{key[0][:10]:10} {key[1]:5} {key[2]:15} {'rows':12} {base['rows']:12} {entry['rows']:12}   OUTPUT CHANGED")
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            if base.get(metric) is None or entry.get(metric) is None or not base[metric]:
+                continue
+            change = (entry[metric] - base[metric]) / base[metric] * 100
+            regressed = change < -threshold if metric in HIGHER_IS_BETTER else change > threshold
+            regressions += regressed
+            flag = '  REGRESSION' if regressed else ''
+            print(f"{key[0][:10]:10} {key[1]:5} {key[2]:15} {metric:12} {base[metric]:12.2f} {entry[metric]:12.2f} {change:+7.1f}%{flag}")
+    print(f"Regressions over {threshold}%: {regressions}")
+    return regressions
+
+def run():
+    package_root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+    parser = argparse.ArgumentParser(description="Benchmark XMLTransformer and ExcelFileProcessor throughput on scaled sample folders.")
+    parser.add_argument('-i', '--input', nargs='+', default=[os.path.join(package_root, 'input'), os.path.join(package_root, 'inputSEP')],
+                        help="Sample folders (default: input and inputSEP)")
+    parser.add_argument('-s', '--scale', type=int, nargs='+', default=[1, 10], help="Scale factors of the generated corpus (default: 1 10, 100 for a large run)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Number of runs per measurement, best time is reported (default: 3)")
+    parser.add_argument('-o', '--output', type=str, help="JSON file the results are written to")
+    parser.add_argument('-c', '--corpus', type=str, help="Folder keeping the generated corpus (default: temporary folder)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help="Compare two JSON results instead of running the benchmark")
+    parser.add_argument('-t', '--threshold', type=float, default=10.0, help="Regression threshold in percent for --compare (default: 10)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        with open(args.compare[1], 'r', encoding='utf-8') as file:
+            current = json.load(file)
+        sys.exit(1 if compare_results(baseline, current, args.threshold) else 0)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_folder:
+        corpus_root = args.corpus or temp_folder
+        for sample_folder in args.input:
+            for scale in args.scale:
+                results.extend(benchmark_sample(sample_folder, scale, args.repeat, corpus_root))
+    print_results(results)
+    if args.output:
+        report = {'created': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                  'platform': platform.platform(), 'repeat': args.repeat, 'results': results}
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    run()
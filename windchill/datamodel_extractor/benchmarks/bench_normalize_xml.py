@@ -0,0 +1,77 @@
+"""
+File: bench_normalize_xml.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Benchmark of the normalization of Windchill load files done by `xml_normalizer.py` on the largest files of a folder (inputSEP by default).
+It compares the chained str.replace calls of the previous normalize_xml (file decoded, one full copy per replacement, encoded again for lxml)
+with the single scan normalizer in str mode and in bytes mode on an mmap, and checks the three give the same content.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_normalize_xml.py -i .\\inputSEP -c 5 -r 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from xml_normalizer import HANDLER_REPLACEMENTS, HANDLER_NORMALIZER
+
+def chained_replace(file_path):
+    # Normalization as written before xml_normalizer.py
+    with open(file_path, 'r', encoding='utf-8') as file:
+        xml_content = file.read()
+    for old, new in HANDLER_REPLACEMENTS:
+        xml_content = xml_content.replace(old, new)
+    return xml_content.encode('utf-8')
+
+def single_scan(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        xml_content = file.read()
+    return HANDLER_NORMALIZER.normalize(xml_content).encode('utf-8')
+
+def single_scan_mmap(file_path):
+    return HANDLER_NORMALIZER.normalize_file(file_path)
+
+def best_time(function, file_path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(file_path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def largest_xml_files(folder, count):
+    xml_files = []
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in filenames:
+            if filename.endswith('.xml'):
+                file_path = os.path.join(dirpath, filename)
+                xml_files.append((os.path.getsize(file_path), file_path))
+    return [file_path for _, file_path in sorted(xml_files, reverse=True)[:count]]
+
+def run():
+    default_input = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'inputSEP'))
+    parser = argparse.ArgumentParser(description="Benchmark chained str.replace normalization against the single scan normalizer.")
+    parser.add_argument('-i', '--input', type=str, default=default_input, help="Folder scanned recursively for XML files (default: inputSEP)")
+    parser.add_argument('-c', '--count', type=int, default=5, help="Number of largest XML files to benchmark (default: 5)")
+    parser.add_argument('-r', '--repeat', type=int, default=10, help="Number of runs per file, best time is reported (default: 10)")
+    args = parser.parse_args()
+
+    totals = [0.0, 0.0, 0.0]
+    print(f"{'File':40} {'Size (KB)':>10} {'replace (ms)':>13} {'scan (ms)':>10} {'mmap (ms)':>10}")
+    for file_path in largest_xml_files(args.input, args.count):
+        expected = chained_replace(file_path)
+        if single_scan(file_path) != expected or single_scan_mmap(file_path) != expected:
+            print(f"ERROR: normalizers give different content for {file_path}")
+            sys.exit(1)
+        timings = [best_time(function, file_path, args.repeat) for function in (chained_replace, single_scan, single_scan_mmap)]
+        totals = [total + timing for total, timing in zip(totals, timings)]
+        print(f"{os.path.basename(file_path)[:40]:40} {os.path.getsize(file_path) / 1024:10.0f} "
+              f"{timings[0] * 1000:13.2f} {timings[1] * 1000:10.2f} {timings[2] * 1000:10.2f}")
+    print(f"{'Total':51} {totals[0] * 1000:13.2f} {totals[1] * 1000:10.2f} {totals[2] * 1000:10.2f}")
+    print(f"Speedup: single scan x{totals[0] / totals[1]:.1f}, single scan on mmap x{totals[0] / totals[2]:.1f}")
+
+if __name__ == "__main__":
+    run()
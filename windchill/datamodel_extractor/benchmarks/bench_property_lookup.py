@@ -0,0 +1,103 @@
+"""
+File: bench_property_lookup.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Micro-benchmark of the csvPropertyValue lookups done by `extract_xml_transformer.py` on a Classification file.
+It compares the string XPath expressions evaluated for every type, attribute and enum member (previous code) with the precompiled
+XPATHS registry and the per-element property_index (current code), and checks both return the same values.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_property_lookup.py -i .\\input\\Classification\\Classification.xml -r 20
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from extract_xml_transformer import XPATHS, property_index, EMPTY_PROPERTY
+from xml_normalizer import HANDLER_NORMALIZER
+
+def first_text(element, expression):
+    values = element.xpath(expression)
+    return values[0] if values else ''
+
+def string_xpath_lookups(root):
+    # Lookups as written before the XPATHS registry: one string XPath per value, compiled and evaluated each time
+    values = []
+    for type_def_view in root.xpath(".//csvBeginTypeDefView[csvattTemplate='LWCSTRUCT']"):
+        values.append(first_text(type_def_view, "./csvPropertyValue[csvname='instantiable']/csvvalue/text()"))
+        values.append(first_text(type_def_view, "./csvPropertyValue[csvname='displayName']/csvvalue/text()"))
+        values.append(first_text(type_def_view, "./csvPropertyValue[csvname='displayName']/csvlocale_fr/text()"))
+        values.append(first_text(type_def_view, "./csvPropertyValue[csvname='description']/csvvalue/text()"))
+        values.append(first_text(type_def_view, "./csvPropertyValue[csvname='description']/csvlocale_fr/text()"))
+        for attr_def_view in type_def_view.xpath("./csvBeginAttributeDefView"):
+            values.append(first_text(attr_def_view, "./csvPropertyValue[csvname='displayName']/csvvalue/text()"))
+            values.append(first_text(attr_def_view, "./csvPropertyValue[csvname='displayName']/csvlocale_fr/text()"))
+            for constraint_def_view in attr_def_view.xpath("./csvBeginConstraintDefView"):
+                values.append(first_text(constraint_def_view, "./csvBeginEnumDefView[1]/csvname/text()"))
+                for enum_member in constraint_def_view.xpath(".//csvBeginEnumMemberView"):
+                    values.append(first_text(enum_member, "./csvname/text()"))
+                    values.append(first_text(enum_member, "./csvPropertyValue[csvname='displayName']/csvvalue/text()"))
+                    values.append(first_text(enum_member, "./csvPropertyValue[csvname='displayName']/csvlocale_fr/text()"))
+                    values.append(first_text(enum_member, "./csvPropertyValue[csvname='selectable'][1]/csvvalue/text()"))
+    return values
+
+def indexed_lookups(root):
+    # Same lookups with the precompiled XPATHS registry and one property_index per element
+    values = []
+    for type_def_view in XPATHS['type_defs_lwcstruct'](root):
+        properties = property_index(type_def_view)
+        values.append(properties.get('instantiable', EMPTY_PROPERTY)[0])
+        values.extend(properties.get('displayName', EMPTY_PROPERTY))
+        values.extend(properties.get('description', EMPTY_PROPERTY))
+        for attr_def_view in XPATHS['attribute_defs'](type_def_view):
+            values.extend(property_index(attr_def_view).get('displayName', EMPTY_PROPERTY))
+            for constraint_def_view in XPATHS['constraint_defs'](attr_def_view):
+                enum_def = XPATHS['first_enum_def_name'](constraint_def_view)
+                values.append(enum_def[0] if enum_def else '')
+                for enum_member in XPATHS['enum_members'](constraint_def_view):
+                    name = XPATHS['name'](enum_member)
+                    values.append(name[0] if name else '')
+                    properties = property_index(enum_member)
+                    values.extend(properties.get('displayName', EMPTY_PROPERTY))
+                    values.append(properties.get('selectable', EMPTY_PROPERTY)[0])
+    return values
+
+def best_time(function, root, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(root)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run():
+    default_input = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'input', 'Classification', 'Classification.xml'))
+    parser = argparse.ArgumentParser(description="Benchmark string XPath lookups against the XPATHS registry and property_index.")
+    parser.add_argument('-i', '--input', type=str, default=default_input, help="Classification XML file (default: input/Classification/Classification.xml)")
+    parser.add_argument('-r', '--repeat', type=int, default=20, help="Number of runs, best time is reported (default: 20)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with open(args.input, 'r', encoding='utf-8') as file:
+        root = etree.fromstring(HANDLER_NORMALIZER.normalize(file.read()).encode('utf-8'))
+
+    if string_xpath_lookups(root) != indexed_lookups(root):
+        print("ERROR: string XPath and indexed lookups return different values")
+        sys.exit(1)
+
+    lookups = len(string_xpath_lookups(root))
+    string_time = best_time(string_xpath_lookups, root, args.repeat)
+    indexed_time = best_time(indexed_lookups, root, args.repeat)
+    print(f"File: {args.input}")
+    print(f"Lookups per run: {lookups}")
+    print(f"String XPath (previous code): {string_time * 1000:8.2f} ms")
+    print(f"XPATHS + property_index:      {indexed_time * 1000:8.2f} ms")
+    print(f"Speedup: x{string_time / indexed_time:.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,93 @@
+"""
+File: bench_workbook_modes.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Benchmark of the workbook written by `extract_excel_processor.py` in the default mode and in write-only mode (--write_only).
+The XML files of a folder are transformed once, then the workbook is built in each mode: time to append and format the sheets,
+save time and peak memory (tracemalloc) are reported, and both workbooks are checked to hold the same values.
+With -s N, each sheet is added N times to emulate a larger export.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\bench_workbook_modes.py -i ".\\inputSEP\\Types&Classifications" -s 10
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from openpyxl import load_workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from extract_xml_transformer import XMLTransformer, rows_from_strings
+from extract_excel_processor import ExcelFileProcessor
+
+def transform_folder(input_folder):
+    datasets = []
+    for file in sorted(os.listdir(input_folder), key=lambda file: os.path.splitext(file)[0] + '.csv'):
+        if file.endswith('.xml'):
+            transformer = XMLTransformer(os.path.join(input_folder, file), input_folder)
+            if transformer.transform(write_csv=False) and transformer.extracted_strings:
+                datasets.append((os.path.splitext(file)[0], list(transformer.extracted_strings)))
+    return datasets
+
+def build_workbook(datasets, output_folder, write_only, scale, trace=False):
+    # Returns (append time, save time, peak memory, workbook path) of one workbook build
+    # Peak memory is only traced on request: tracemalloc slows down allocations, so timings come from another build
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    processor = ExcelFileProcessor(output_folder, output_folder, write_only=write_only)
+    for copy in range(scale):
+        for sheet_name, extracted_strings in datasets:
+            # Copies get a numbered prefix so that the 31 characters sheet titles stay unique
+            name = sheet_name if copy == 0 else f"{copy}_{sheet_name}"
+            processor._append_rows_to_sheet(name, rows_from_strings(extracted_strings))
+            processor.sheet_names.append(name)
+    appended = time.perf_counter()
+    processor.create_excel_with_toc()
+    saved = time.perf_counter()
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return appended - start, saved - appended, peak, processor.output_file
+
+def workbook_values(path):
+    # Loaded in the default mode: empty rows written by the write-only mode at the end of a sheet hold no cell and are not listed
+    workbook = load_workbook(path)
+    return workbook.sheetnames, {ws.title: list(ws.iter_rows(values_only=True)) for ws in workbook.worksheets}
+
+def run():
+    default_input = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'inputSEP', 'Types&Classifications'))
+    parser = argparse.ArgumentParser(description="Benchmark the default workbook mode against the write-only mode.")
+    parser.add_argument('-i', '--input', type=str, default=default_input, help="Folder of XML files (default: inputSEP/Types&Classifications)")
+    parser.add_argument('-s', '--scale', type=int, default=1, help="Number of times each sheet is added (default: 1)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    datasets = transform_folder(args.input)
+    lines = sum(len(extracted_strings) for _, extracted_strings in datasets) * args.scale
+    with tempfile.TemporaryDirectory() as temp_folder:
+        results = {}
+        for write_only in (False, True):
+            output_folder = os.path.join(temp_folder, 'write_only' if write_only else 'default')
+            os.makedirs(output_folder)
+            append_time, save_time, _, output_file = build_workbook(datasets, output_folder, write_only, args.scale)
+            peak = build_workbook(datasets, output_folder, write_only, args.scale, trace=True)[2]
+            results[write_only] = (append_time, save_time, peak, output_file)
+        if workbook_values(results[False][3]) != workbook_values(results[True][3]):
+            print("ERROR: default and write-only workbooks hold different values")
+            sys.exit(1)
+
+    print(f"Folder: {args.input}")
+    print(f"Sheets: {len(datasets) * args.scale}, rows: {lines}")
+    print(f"{'Mode':12} {'append (ms)':>12} {'save (ms)':>10} {'peak (MB)':>10}")
+    for write_only, label in ((False, 'default'), (True, 'write-only')):
+        append_time, save_time, peak, _ = results[write_only]
+        print(f"{label:12} {append_time * 1000:12.1f} {save_time * 1000:10.1f} {peak / 1048576:10.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+File: check_samples.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Regression check of `datamodel_check.py` on a clean sample tree (inputSEP by default): every reference of the sample resolves,
+so the check must report no dangling reference and exit with status 0. It is run as a command, in tree and streaming mode, in-process and
+with a process pool, and with a parsed model cache (cold then warm). Exits with status 1 when a run reports findings or another status.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\check_samples.py -i .\\inputSEP
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+CHECK_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datamodel_check.py')
+# Run name -> extra arguments of datamodel_check.py (the cache runs share one cache folder, the second one reads it)
+RUNS = {
+    'tree': [],
+    'stream': ['--stream'],
+    'tree --jobs 2': ['--jobs', '2'],
+    'stream --jobs 2': ['--stream', '--jobs', '2'],
+    'cold cache': ['--jobs', '2'],
+    'warm cache': ['--jobs', '2'],
+}
+
+def check_sample(sample_dir):
+    # List of (run, exit status, findings by check) of one sample tree
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for run, arguments in RUNS.items():
+            report_file = os.path.join(temp_dir, 'report.json')
+            environment = dict(os.environ)
+            environment.pop('WT_MODEL_CACHE', None)
+            if run.endswith('cache'):
+                environment['WT_MODEL_CACHE'] = os.path.join(temp_dir, 'model_cache')
+            completed = subprocess.run([sys.executable, CHECK_SCRIPT, '-i', sample_dir, '-o', report_file] + arguments,
+                                       env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            summary = {}
+            if os.path.exists(report_file):
+                with open(report_file, encoding='utf-8') as file:
+                    summary = {check: count for check, count in json.load(file)['summary'].items() if count}
+                os.remove(report_file)
+            results.append((run, completed.returncode, summary))
+    return results
+
+def run():
+    parser = argparse.ArgumentParser(description="Check that datamodel_check.py reports no dangling reference on clean sample trees.")
+    parser.add_argument('-i', '--input_dirs', nargs='+', default=['inputSEP'], help='Sample trees whose references all resolve (default: inputSEP)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    failures = 0
+    for sample_dir in args.input_dirs:
+        for run, status, summary in check_sample(sample_dir):
+            passed = status == 0 and not summary
+            failures += not passed
+            details = ', '.join(f"{count} {check}" for check, count in summary.items()) or 'no finding'
+            logging.info(f"{'OK  ' if passed else 'FAIL'} {sample_dir} ({run}): exit status {status}, {details}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    run()
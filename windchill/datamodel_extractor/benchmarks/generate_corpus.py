@@ -0,0 +1,123 @@
+"""
+File: generate_corpus.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Synthetic corpus generator for the datamodel extractor benchmarks (see `bench_extractor.py`).
+It copies a sample folder (input or inputSEP) and scales each XML file by a factor, keeping the Windchill load file layout:
+- Types: each attribute definition is repeated (more attributes per type)
+- Classification: the whole tree is repeated, each copy being hung under the root of an earlier copy (more types, deeper tree)
+- Enum: each enum member is repeated (more members per enumeration)
+- Lifecycle: each lifecycle template is repeated
+- OIR: each TypeBasedRule is repeated
+Copies are renamed with a '_S<n>' suffix. Files of unknown kind are copied as is.
+
+Example:
+python .\\windchill\\datamodel_extractor\\benchmarks\\generate_corpus.py -i .\\input -o .\\corpus_x10 -s 10
+"""
+
+import argparse
+import logging
+import os
+import re
+import shutil
+import sys
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import extract_xml_transformer  # registers the file kinds
+from xml_normalizer import HANDLER_NORMALIZER
+from xml_file_kinds import classify_tree
+
+# Block repeated for each file kind, and the element holding the name given a '_S<n>' suffix in each copy
+SCALED_BLOCKS = {
+    'Types': (re.compile(r'<csvBeginAttributeDefView\b.*?<csvEndAttributeDefView\b[^>]*/>', re.S), 'csvname'),
+    'Classification': (re.compile(r'<csvBeginTypeDefView\b.*?<csvEndTypeDefView\b[^>]*/>', re.S), 'csvname'),
+    'Enum': (re.compile(r'<csvBeginEnumMemberView\b.*?<csvEndEnumMemberView\b[^>]*/>', re.S), 'csvname'),
+    'Lifecycle': (re.compile(r'<csvLifeCycleTemplateBegin\b.*?<csvLifeCycleTemplateEnd\b[^>]*(?:/>|>\s*</csvLifeCycleTemplateEnd>)', re.S), 'csvname'),
+    'OIR': (re.compile(r'<TypeBasedRule\b.*?</TypeBasedRule>', re.S), 'ruleName'),
+}
+PARENT_PATTERN = re.compile(r'<csvtypeParent>(.*?)</csvtypeParent>|<csvtypeParent/>')
+
+def file_kind_of(file_path):
+    # Kind of a Windchill XML file as worked out by XMLTransformer, None when unknown
+    decision = classify_tree(etree.fromstring(HANDLER_NORMALIZER.normalize_file(file_path)))
+    return decision.kind if decision else None
+
+def rename_block(block, name_tag, suffix):
+    # Suffix the first name of the block (the unit name, not the names of its property values)
+    return re.sub(f'<{name_tag}>(.*?)</{name_tag}>', lambda match: f'<{name_tag}>{match.group(1)}{suffix}</{name_tag}>', block, count=1)
+
+def scale_blocks(xml_content, kind, scale):
+    # Each block is followed by its scale - 1 renamed copies
+    pattern, name_tag = SCALED_BLOCKS[kind]
+    return pattern.sub(lambda match: match.group() + ''.join('\n   ' + rename_block(match.group(), name_tag, f'_S{copy}') for copy in range(1, scale)), xml_content)
+
+def scale_classification(xml_content, scale):
+    # The tree is repeated after the last type: nodes and parents of copy n get the '_S<n>' suffix, and the roots of copy n
+    # (parent not defined in the file) are hung under the same root in copy (n - 1) // 2, so the tree gets log2(scale) levels deeper
+    pattern, name_tag = SCALED_BLOCKS['Classification']
+    blocks = list(pattern.finditer(xml_content))
+    if not blocks or scale < 2:
+        return xml_content
+    names = {re.search(f'<{name_tag}>(.*?)</{name_tag}>', block.group()).group(1) for block in blocks}
+    copies = []
+    for copy in range(1, scale):
+        suffix = f'_S{copy}'
+        parent_suffix = f'_S{(copy - 1) // 2}' if copy > 2 else ''
+        for block in blocks:
+            text = rename_block(block.group(), name_tag, suffix)
+            parent = PARENT_PATTERN.search(text)
+            if parent and parent.group(1) and parent.group(1) in names:
+                text = text[:parent.start()] + f'<csvtypeParent>{parent.group(1)}{suffix}</csvtypeParent>' + text[parent.end():]
+            elif parent:
+                # Root of the copy: its parent is the matching root of an earlier copy
+                root = re.search(f'<{name_tag}>(.*?){suffix}</{name_tag}>', text).group(1)
+                text = text[:parent.start()] + f'<csvtypeParent>{root}{parent_suffix}</csvtypeParent>' + text[parent.end():]
+            copies.append('\n   ' + text)
+    end = blocks[-1].end()
+    return xml_content[:end] + ''.join(copies) + xml_content[end:]
+
+def scale_file(input_file, output_file, scale):
+    # Write the scaled copy of one XML file, returns its kind
+    kind = file_kind_of(input_file)
+    if kind not in SCALED_BLOCKS or scale < 2:
+        shutil.copyfile(input_file, output_file)
+        return kind
+    with open(input_file, 'r', encoding='utf-8') as file:
+        xml_content = file.read()
+    if kind == 'Classification':
+        xml_content = scale_classification(xml_content, scale)
+    else:
+        xml_content = scale_blocks(xml_content, kind, scale)
+    with open(output_file, 'w', encoding='utf-8') as file:
+        file.write(xml_content)
+    return kind
+
+def generate_corpus(input_folder, output_folder, scale):
+    # Scaled copy of a sample folder, same sub-folders and file names. Returns {relative path: kind} of the XML files
+    kinds = {}
+    for dirpath, _, filenames in os.walk(input_folder):
+        target = os.path.join(output_folder, os.path.relpath(dirpath, input_folder))
+        os.makedirs(target, exist_ok=True)
+        for filename in sorted(filenames):
+            if filename.endswith('.xml'):
+                relative_path = os.path.relpath(os.path.join(dirpath, filename), input_folder)
+                kinds[relative_path] = scale_file(os.path.join(dirpath, filename), os.path.join(target, filename), scale)
+    return kinds
+
+def run():
+    parser = argparse.ArgumentParser(description="Generate a scaled copy of a Windchill XML sample folder for the extractor benchmarks.")
+    parser.add_argument('-i', '--input', type=str, required=True, help="Sample folder (input or inputSEP)")
+    parser.add_argument('-o', '--output', type=str, required=True, help="Output folder of the scaled corpus")
+    parser.add_argument('-s', '--scale', type=int, default=10, help="Scale factor of each file (default: 10)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    kinds = generate_corpus(args.input, args.output, args.scale)
+    for kind in sorted(set(kinds.values()), key=str):
+        files = [path for path, file_kind in kinds.items() if file_kind == kind]
+        size = sum(os.path.getsize(os.path.join(args.output, path)) for path in files)
+        print(f"{str(kind):15} {len(files):5} files {size / 1048576:10.1f} MB")
+
+if __name__ == "__main__":
+    run()
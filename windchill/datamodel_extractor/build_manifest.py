@@ -0,0 +1,143 @@
+"""
+File: build_manifest.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Incremental build manifest of `extract_excel_processor.py`, stored in each output folder.
+The manifest records the extractor version and, for each input XML file, its SHA-256 content hash and the number of extracted lines.
+The extracted strings of each file are cached next to it, so a workbook is only rebuilt when one of its inputs was added, removed or changed,
+and only the changed files are transformed again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+MANIFEST_FILE = '.extract_manifest.json'
+CACHE_FOLDER = '.extract_cache'
+MANIFEST_FORMAT = 1
+# Modules whose code produces the extracted strings: editing one of them gives another extractor version, so every cached file is transformed again
+EXTRACTOR_MODULES = ['extract_xml_transformer.py', 'datamodel_records.py', 'xml_normalizer.py', 'xml_file_kinds.py', 'enum_index.py', 'value_rules.py', 'value_rules.json', 'build_manifest.py']
+
+_extractor_version = None
+
+def file_digest(file_path):
+    # SHA-256 of the file content, read by blocks
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def extractor_version():
+    # Manifest format and hash of the extractor modules, computed once per process
+    global _extractor_version
+    if _extractor_version is None:
+        digest = hashlib.sha256()
+        folder = os.path.dirname(os.path.abspath(__file__))
+        for module in EXTRACTOR_MODULES:
+            with open(os.path.join(folder, module), 'rb') as file:
+                digest.update(file.read())
+        _extractor_version = f"{MANIFEST_FORMAT}-{digest.hexdigest()[:16]}"
+    return _extractor_version
+
+class BuildManifest:
+    def __init__(self, output_folder, keep_csv=False, force=False, enum_fingerprint=None):
+        self.output_folder = output_folder
+        self.manifest_file = os.path.join(output_folder, MANIFEST_FILE)
+        self.cache_folder = os.path.join(output_folder, CACHE_FOLDER)
+        self.keep_csv = keep_csv
+        self.enum_fingerprint = enum_fingerprint  # EnumIndex.fingerprint() when enum members are resolved, None otherwise
+        self.workbook = None  # workbook written by the last build, None when no sheet was extracted
+        self.entries = {}  # xml file name -> {'hash': sha256, 'lines': number of extracted strings}
+        self.hashes = {}  # xml file name -> sha256 of the current input, filled by changed_files
+        self.loaded = False  # True when the manifest of a previous build was read
+        if not force:
+            self._load()
+
+    def _load(self):
+        # A missing, unreadable or outdated manifest gives no entry: every file is transformed
+        if not os.path.exists(self.manifest_file):
+            return
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.info(f"   Build manifest ignored, it cannot be read: {self.manifest_file} ({type(e).__name__}: {e})")
+            return
+        if manifest.get('version') != extractor_version():
+            logging.info(f"   Build manifest ignored, written by another extractor version: {manifest.get('version')}")
+            return
+        if manifest.get('keep_csv') != self.keep_csv:
+            logging.info(f"   Build manifest ignored, written with keep_csv={manifest.get('keep_csv')}")
+            return
+        if manifest.get('enum_index') != self.enum_fingerprint:
+            logging.info(f"   Build manifest ignored, written with another enum index: {manifest.get('enum_index')}")
+            return
+        self.workbook = manifest.get('workbook')
+        self.entries = manifest.get('files', {})
+        self.loaded = True
+
+    def changed_files(self, input_folder, xml_files):
+        # Files added or changed since the last build, in the order of xml_files
+        changed = []
+        for file in xml_files:
+            self.hashes[file] = file_digest(os.path.join(input_folder, file))
+            entry = self.entries.get(file)
+            if entry is None or entry['hash'] != self.hashes[file] or not os.path.exists(self._cache_file(file)):
+                changed.append(file)
+        return changed
+
+    def is_up_to_date(self, xml_files, changed, output_file):
+        # The workbook is kept when no input was added, removed or changed and the outputs of the last build are still there
+        if not self.loaded or changed or set(xml_files) != set(self.entries):
+            return False
+        if self.workbook is not None and not os.path.exists(os.path.join(self.output_folder, self.workbook)):
+            return False
+        if self.workbook is None and any(entry['lines'] for entry in self.entries.values()):
+            return False
+        if self.keep_csv:
+            for file, entry in self.entries.items():
+                if entry['lines'] and not os.path.exists(os.path.join(self.output_folder, os.path.splitext(file)[0] + '.csv')):
+                    return False
+        return self.workbook is None or self.workbook == os.path.basename(output_file)
+
+    def _cache_file(self, file):
+        return os.path.join(self.cache_folder, file + '.json')
+
+    def cached_strings(self, file):
+        # Extracted strings of an unchanged file, None when they are not cached
+        if file not in self.entries:
+            return None
+        try:
+            with open(self._cache_file(file), 'r', encoding='utf-8') as cache:
+                extracted_strings = json.load(cache)
+        except (OSError, ValueError):
+            return None
+        if len(extracted_strings) != self.entries[file]['lines']:
+            return None
+        return extracted_strings
+
+    def record(self, file, extracted_strings):
+        # Cache the extracted strings of a transformed file; files that failed are not recorded, so they are transformed again next time
+        os.makedirs(self.cache_folder, exist_ok=True)
+        with open(self._cache_file(file), 'w', encoding='utf-8') as cache:
+            json.dump(extracted_strings, cache, ensure_ascii=False)
+        self.entries[file] = {'hash': self.hashes[file], 'lines': len(extracted_strings)}
+
+    def save(self, xml_files, output_file):
+        # Write the manifest of this build, drop the entries and caches of files no longer in the input folder
+        for file in list(self.entries):
+            if file not in xml_files:
+                del self.entries[file]
+                if os.path.exists(self._cache_file(file)):
+                    os.remove(self._cache_file(file))
+        self.workbook = os.path.basename(output_file) if os.path.exists(output_file) else None
+        manifest = {'version': extractor_version(), 'keep_csv': self.keep_csv, 'enum_index': self.enum_fingerprint, 'workbook': self.workbook, 'files': self.entries}
+        with open(self.manifest_file, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+
+    def remove(self):
+        # Forget the last build (used when the workbook could not be saved)
+        if os.path.exists(self.manifest_file):
+            os.remove(self.manifest_file)
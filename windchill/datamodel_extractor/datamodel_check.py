@@ -0,0 +1,199 @@
+"""
+File: datamodel_check.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Cross-reference check of a Windchill export tree, to be run before loading it (LoadFileSet_* runs).
+Every XML file of the tree is transformed once by `XMLTransformer` (through `datamodel_store.py`, in a process pool with --jobs), the enum members
+come with their selectable flag (`enum_index.py`) and every type definition is listed, also a type without attributes or not instantiable.
+Types, Classification nodes, global enumerations and lifecycle templates are then indexed by name in dicts and sets, and every reference
+is resolved with one hash lookup:
+- attribute EnumeratedValues -> global enumeration ('GlobalEnum', or 'GlobalEnum: a|b' for an override through csvmaster)
+- members of an overridden enumeration -> members of its global enumeration, which must be selectable there
+- OIR lifecycle (lc.id) -> lifecycle template, OIR object type -> type of the tree (out of the box wt.* and com.ptc.* types are not checked)
+- Classification node -> parent node
+The dangling references are written as a report and the script exits with status 1, so a load can be stopped before it starts.
+
+Example:
+python .\\windchill\\datamodel_extractor\\datamodel_check.py -i .\\inputSEP -o .\\output\\check.txt --jobs 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from fnmatch import fnmatchcase
+from datamodel_store import DataModelStore, extract_tree
+
+# Check -> description, in report order
+CHECKS = {
+    'missing_enumeration': 'Global enumeration not found',
+    'missing_member': 'Overridden member not found in its global enumeration',
+    'unselectable_member': 'Overridden member not selectable in its global enumeration',
+    'empty_override': 'Overridden enumeration without selectable member',
+    'missing_lifecycle': 'OIR lifecycle template not found',
+    'missing_type': 'OIR object type not found',
+    'missing_parent': 'Classification parent node not found',
+    'duplicate_definition': 'Enumeration, lifecycle template or type defined more than once',
+}
+REPORT_FIELDS = ['check', 'source', 'owner', 'item', 'reference', 'file']
+OOTB_PACKAGES = ('wt.', 'com.ptc.')  # packages of the out of the box types, not checked
+
+class ReferenceIndex(DataModelStore):
+    # Table rows of the tree (no database is written), with the EnumeratedValues column as extracted
+    def __init__(self):
+        super().__init__(None)
+        self.enum_bindings = []  # (type_id, attribute, EnumeratedValues)
+
+    def _add_attribute(self, type_id, position, columns, default_length=False):
+        super()._add_attribute(type_id, position, columns, default_length)
+        if len(columns) > 13 and columns[13]:
+            self.enum_bindings.append((type_id, columns[0], columns[13]))
+
+def check_references(index, ignore=None):
+    # Resolve every reference of the tree with dict and set lookups, returns the findings as REPORT_FIELDS dicts
+    tables = index.tables
+    ignore = ignore or []
+    findings = []
+
+    def report(check, source, owner, item, reference, file):
+        if not any(fnmatchcase(reference, pattern) for pattern in ignore):
+            findings.append(dict(zip(REPORT_FIELDS, (check, source, owner, item, reference, file))))
+
+    files = {file_id: path for file_id, path, *_ in tables['files']}
+    types = {}  # type_id -> (source, name, file)
+    type_names = {'Types': {}, 'Classification': {}}  # source -> name -> file of its first definition
+    for type_id, file_id, source, name, *_ in tables['types']:
+        types[type_id] = (source, name, files[file_id])
+        if name in type_names[source]:
+            report('duplicate_definition', source, name, '', name, files[file_id])
+        else:
+            type_names[source][name] = files[file_id]
+
+    # Global enumerations: name -> {member name: selectable}, from their first definition
+    enums = {}
+    enum_members = {}  # enum_id -> members dict of the enumeration
+    for enum_id, file_id, name, _ in tables['enums']:
+        if name in enums:
+            report('duplicate_definition', 'Enum', name, '', name, files[file_id])
+            continue
+        enums[name] = enum_members[enum_id] = {}
+    for enum_id, _, name, _, _, selectable in tables['enum_members']:
+        if enum_id in enum_members:
+            enum_members[enum_id][name] = selectable == 'true'
+
+    # Attribute -> global enumeration, and members of an overridden enumeration -> members of its global enumeration
+    for type_id, attribute, value in index.enum_bindings:
+        source, type_name, file = types[type_id]
+        name, override, members = value.partition(':')
+        name = name.strip()
+        master = enums.get(name)
+        if master is None:
+            report('missing_enumeration', source, type_name, attribute, name, file)
+            continue
+        if not override:
+            continue
+        members = [member for member in members.strip().split('|') if member]
+        if not members:
+            report('empty_override', source, type_name, attribute, name, file)
+        for member in members:
+            selectable = master.get(member)
+            if selectable is None:
+                report('missing_member', source, type_name, attribute, f"{name}: {member}", file)
+            elif not selectable:
+                report('unselectable_member', source, type_name, attribute, f"{name}: {member}", file)
+
+    # Classification node -> parent node (the root has no parent)
+    for type_id, file_id, source, name, _, _, parent, *_ in tables['types']:
+        if source == 'Classification' and parent and parent not in type_names['Classification']:
+            report('missing_parent', source, name, '', parent, files[file_id])
+
+    lifecycles = set()
+    for _, file_id, name in tables['lifecycles']:
+        if name in lifecycles:
+            report('duplicate_definition', 'Lifecycle', name, '', name, files[file_id])
+        lifecycles.add(name)
+
+    # OIR -> lifecycle template and type; out of the box object types (wt.part.WTPart, ...) are not defined in an export
+    rules = {rule_id: (name, files[file_id]) for rule_id, file_id, name in tables['oir_rules']}
+    for rule_id, obj_type, _, lifecycle, _, _ in tables['oir_values']:
+        rule, file = rules[rule_id]
+        if lifecycle and lifecycle not in lifecycles:
+            report('missing_lifecycle', 'OIR', rule, obj_type, lifecycle, file)
+        if obj_type and obj_type not in type_names['Types'] and not obj_type.startswith(OOTB_PACKAGES):
+            report('missing_type', 'OIR', rule, obj_type, obj_type, file)
+
+    order = {check: position for position, check in enumerate(CHECKS)}
+    findings.sort(key=lambda finding: order[finding['check']])
+    return findings
+
+def check_tree(root_input_dir, jobs=1, stream=False, ignore=None):
+    # (findings, {entity: count}) of one export tree, in a single extraction pass
+    index = ReferenceIndex()
+    file_count = extract_tree(index, root_input_dir, jobs, stream)
+    counts = {'files': file_count, 'types': len(index.tables['types']), 'enum references': len(index.enum_bindings),
+              'enums': len(index.tables['enums']), 'lifecycles': len(index.tables['lifecycles']), 'oir values': len(index.tables['oir_values'])}
+    return check_references(index, ignore), counts
+
+def write_report(output_file, root_input_dir, findings, summary):
+    # JSON when the file ends with .json, otherwise one '~' separated row per finding with a header row
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    if output_file.lower().endswith('.json'):
+        with open(output_file, 'w', encoding='utf-8') as file:
+            json.dump({'input': root_input_dir, 'summary': summary, 'findings': findings}, file, indent=2, ensure_ascii=False)
+    else:
+        with open(output_file, 'w', encoding='utf-8') as file:
+            file.write('~'.join(REPORT_FIELDS) + '\n')
+            for finding in findings:
+                file.write('~'.join(finding[field] for field in REPORT_FIELDS) + '\n')
+
+def run():
+    parser = argparse.ArgumentParser(description="Check the cross-references of a Windchill XML export tree (enumerations, lifecycles, types).")
+    parser.add_argument('-i', '--input_dir', required=True, help='Root input directory containing XML files (Types, Enum, Classification, Lifecycle, OIR).')
+    parser.add_argument('-o', '--output', help="Optional: report file, JSON when it ends with .json, '~' separated text otherwise (default: summary logged only)")
+    parser.add_argument('--ignore', nargs='+', metavar='NAME', help='Optional: referenced names not reported, * as a wildcard (e.g. out of the box lifecycle templates: Basic "Default*")')
+    parser.add_argument('--jobs', type=int, default=1, help='Optional: number of worker processes transforming the XML files (default: 1)')
+    parser.add_argument('--stream', action='store_true', help='Optional: stream XML files with iterparse (bounded memory for large exports)')
+    args = parser.parse_args()
+    try:
+        start = time.perf_counter()
+        findings, counts = check_tree(args.input_dir, args.jobs, args.stream, args.ignore)
+        summary = {check: 0 for check in CHECKS}
+        for finding in findings:
+            summary[finding['check']] += 1
+        if args.output:
+            write_report(args.output, args.input_dir, findings, summary)
+        message = f"******  Data model check of {args.input_dir}: {len(findings)} dangling references ({time.perf_counter() - start:.3f} s) ******"
+        stars = '*' * len(message)
+        logging.info(stars)
+        logging.info(message)
+        logging.info(stars)
+        logging.info('   ' + ', '.join(f"{count} {entity}" for entity, count in counts.items()))
+        for check, count in summary.items():
+            if count:
+                logging.info(f"   {check:<22} {count:6}  {CHECKS[check]}")
+        for finding in findings[:20]:
+            logging.info(f"   {finding['check']}: {finding['source']} {finding['owner']} {finding['item']} -> {finding['reference']}")
+        if len(findings) > 20:
+            logging.info(f"   ... {len(findings) - 20} more" + (f", see {args.output}" if args.output else ''))
+    except Exception as e:
+        message = f"******************  Data model check failed: ******************"
+        length = len(message)
+        stars = '*' * length
+        marks = '!' * length
+        logging.info(stars)
+        logging.info(marks)
+        logging.info(message)
+        exception_type = type(e).__name__
+        logging.info(f"{exception_type}: {e}")
+        logging.exception("Exception: ")
+        logging.info(marks)
+        logging.info(stars)
+        sys.exit(2)
+    # Status 1 with dangling references: a load script can stop before loading the tree
+    sys.exit(1 if findings else 0)
+
+if __name__ == "__main__":
+    run()
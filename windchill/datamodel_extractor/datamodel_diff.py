@@ -0,0 +1,228 @@
+"""
+File: datamodel_diff.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Data model diff between two Windchill export trees (e.g. input against inputSEP, or one release against the next).
+Both trees are extracted with `XMLTransformer` (through `datamodel_store.py`), then every type, attribute, constraint, enumeration, enum member,
+lifecycle phase and OIR rule gets a stable key (type name, attribute name, enum name, member name, ...) and a record of its other fields.
+The two trees are compared with hash joins: the records of the old tree are indexed by key in a dict, and each record of the new tree is looked up once,
+so the diff is linear in the number of records. Additions, removals and changed fields are written as a delta workbook (.xlsx) or JSON.
+
+Example:
+python .\\windchill\\datamodel_extractor\\datamodel_diff.py -a .\\input -b .\\inputSEP -o .\\output\\delta.xlsx --map CUSTOM=POWER custom=power
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from datamodel_store import DataModelStore, extract_tree
+
+# Compared entities: (key columns, field columns). Keys do not depend on the file or folder holding the entity,
+# positions (member or phase order) are not compared
+ENTITIES = {
+    'types': (('source', 'type'), ('display', 'display_fr', 'parent', 'family', 'depth', 'instantiable', 'description', 'description_fr')),
+    'attributes': (('source', 'type', 'attribute'), ('display', 'display_fr', 'iba', 'required', 'datatype', 'unit', 'length', 'single', 'upper_case',
+                                                     'regular_expr', 'default_value', 'legal_values', 'enumeration', 'enumeration_members')),
+    'constraints': (('source', 'type', 'attribute', 'constraint'), ('value',)),
+    'enums': (('enumeration',), ('display',)),
+    'enum_members': (('enumeration', 'member'), ('display', 'display_fr', 'selectable')),
+    'lifecycles': (('lifecycle',), ()),
+    'phases': (('lifecycle', 'state'), ('phase',)),
+    'oir_rules': (('rule', 'obj_type'), ('folder', 'lifecycle', 'versioning', 'numbering')),
+}
+STATUSES = ('added', 'removed', 'changed')
+
+class Renamer:
+    # Text replacements applied to the old tree (e.g. CUSTOM=POWER), so two sites with other prefixes are compared on the same keys
+    def __init__(self, mappings):
+        self.mappings = [mapping.split('=', 1) for mapping in mappings or []]
+        self.renamed = {}  # each distinct value is renamed once
+
+    def __call__(self, value):
+        if not self.mappings or not isinstance(value, str):
+            return value
+        renamed = self.renamed.get(value)
+        if renamed is None:
+            renamed = value
+            for old, new in self.mappings:
+                renamed = renamed.replace(old, new)
+            self.renamed[value] = renamed
+        return renamed
+
+def entity_records(store, rename=None):
+    # {entity: {key: fields}} from the table rows of a DataModelStore; a key found twice keeps its first record
+    rename = rename or (lambda value: value)
+    tables = store.tables
+    records = {entity: {} for entity in ENTITIES}
+    duplicates = {entity: 0 for entity in ENTITIES}
+
+    def add(entity, key, fields):
+        key = tuple(rename(value) for value in key)
+        if key in records[entity]:
+            duplicates[entity] += 1
+            return
+        records[entity][key] = tuple('' if value is None else str(rename(value)) for value in fields)
+
+    types = {}
+    for type_id, _, source, name, *fields in tables['types']:
+        types[type_id] = (source, name)
+        add('types', (source, name), fields)
+    for type_id, _, name, *fields in tables['attributes']:
+        add('attributes', types[type_id] + (name,), fields)
+    for type_id, attribute, kind, value in tables['constraints']:
+        add('constraints', types[type_id] + (attribute, kind), (value,))
+    enums = {}
+    for enum_id, _, name, display in tables['enums']:
+        enums[enum_id] = name
+        add('enums', (name,), (display,))
+    for enum_id, _, name, display, display_fr, selectable in tables['enum_members']:
+        add('enum_members', (enums[enum_id], name), (display, display_fr, selectable))
+    lifecycles = {}
+    for lifecycle_id, _, name in tables['lifecycles']:
+        lifecycles[lifecycle_id] = name
+        add('lifecycles', (name,), ())
+    for lifecycle_id, _, state, name in tables['phases']:
+        add('phases', (lifecycles[lifecycle_id], state), (name,))
+    rules = {rule_id: name for rule_id, _, name in tables['oir_rules']}
+    for rule_id, obj_type, *fields in tables['oir_values']:
+        add('oir_rules', (rules[rule_id], obj_type), fields)
+    for entity, count in duplicates.items():
+        if count:
+            logging.info(f"   {entity}: {count} records with an existing key ignored (first definition kept)")
+    return records
+
+def diff_records(old_records, new_records):
+    # Hash join of two {key: fields} dicts: returns [(status, key, old fields, new fields)], removed records first then in new tree order
+    changes = [('removed', key, fields, None) for key, fields in old_records.items() if key not in new_records]
+    for key, fields in new_records.items():
+        old_fields = old_records.get(key)
+        if old_fields is None:
+            changes.append(('added', key, None, fields))
+        elif old_fields != fields:
+            changes.append(('changed', key, old_fields, fields))
+    return changes
+
+def load_tree(root_input_dir, jobs=1, stream=False, rename=None):
+    store = DataModelStore(None)
+    file_count = extract_tree(store, root_input_dir, jobs, stream)
+    logging.info(f"   {root_input_dir}: {file_count} XML files extracted")
+    return entity_records(store, rename)
+
+def diff_trees(old_dir, new_dir, jobs=1, stream=False, mappings=None):
+    # {entity: [(status, key, old fields, new fields)]} and {entity: {status: count, 'unchanged': count}}
+    old_records = load_tree(old_dir, jobs, stream, Renamer(mappings))
+    new_records = load_tree(new_dir, jobs, stream)
+    changes = {}
+    summary = {}
+    for entity in ENTITIES:
+        changes[entity] = diff_records(old_records[entity], new_records[entity])
+        counts = {status: 0 for status in STATUSES}
+        for change in changes[entity]:
+            counts[change[0]] += 1
+        counts['unchanged'] = len(new_records[entity]) - counts['added'] - counts['changed']
+        summary[entity] = counts
+    return changes, summary
+
+def change_values(old_fields, new_fields):
+    # Field values of one change: the record for an addition or removal, 'old => new' for the changed fields only
+    if old_fields is None:
+        return list(new_fields)
+    if new_fields is None:
+        return list(old_fields)
+    return [f"{old} => {new}" if old != new else '' for old, new in zip(old_fields, new_fields)]
+
+def write_json(output_file, old_dir, new_dir, mappings, changes, summary):
+    report = {'old': old_dir, 'new': new_dir, 'map': mappings or [], 'summary': summary, 'changes': {}}
+    for entity, entity_changes in changes.items():
+        key_columns, field_columns = ENTITIES[entity]
+        report['changes'][entity] = []
+        for status, key, old_fields, new_fields in entity_changes:
+            change = {'status': status, 'key': dict(zip(key_columns, key))}
+            if status == 'changed':
+                change['fields'] = {column: [old, new] for column, old, new in zip(field_columns, old_fields, new_fields) if old != new}
+            else:
+                change['fields'] = dict(zip(field_columns, old_fields if status == 'removed' else new_fields))
+            report['changes'][entity].append(change)
+    with open(output_file, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+
+def write_workbook(output_file, old_dir, new_dir, mappings, changes, summary):
+    # Write-only workbook: a Summary sheet, then one sheet per entity with changes (status, key columns, field columns)
+    wb = Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    def write_sheet(title, header, rows):
+        ws = wb.create_sheet(title)
+        widths = [len(column) for column in header]
+        for row in rows:
+            for index, value in enumerate(row):
+                widths[index] = max(widths[index], len(str(value)))
+        for index, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(index)].width = min(width + 2, 60)
+        header_cells = []
+        for column in header:
+            cell = WriteOnlyCell(ws, value=column)
+            cell.font = bold
+            header_cells.append(cell)
+        ws.append(header_cells)
+        for row in rows:
+            ws.append(row)
+
+    summary_rows = [[entity] + [counts[status] for status in STATUSES + ('unchanged',)] for entity, counts in summary.items()]
+    summary_rows += [[], ['old', old_dir], ['new', new_dir], ['map', ' '.join(mappings or [])]]
+    write_sheet('Summary', ['entity', 'added', 'removed', 'changed', 'unchanged'], summary_rows)
+    for entity, entity_changes in changes.items():
+        if entity_changes:
+            key_columns, field_columns = ENTITIES[entity]
+            rows = [[status] + list(key) + change_values(old_fields, new_fields) for status, key, old_fields, new_fields in entity_changes]
+            write_sheet(entity, ['status'] + list(key_columns) + list(field_columns), rows)
+    wb.save(output_file)
+
+def run():
+    parser = argparse.ArgumentParser(description="Diff the data model of two Windchill XML export trees.")
+    parser.add_argument('-a', '--old_dir', required=True, help='Root input directory of the old (reference) export')
+    parser.add_argument('-b', '--new_dir', required=True, help='Root input directory of the new export')
+    parser.add_argument('-o', '--output', required=True, help='Delta file: workbook (.xlsx) or JSON (any other extension)')
+    parser.add_argument('--map', nargs='+', metavar='OLD=NEW', help='Optional: text replacements applied to the old export before the comparison (e.g. CUSTOM=POWER)')
+    parser.add_argument('--jobs', type=int, default=1, help='Optional: number of worker processes transforming the XML files (default: 1)')
+    parser.add_argument('--stream', action='store_true', help='Optional: stream XML files with iterparse (bounded memory for large exports)')
+    args = parser.parse_args()
+    try:
+        start = time.perf_counter()
+        changes, summary = diff_trees(args.old_dir, args.new_dir, args.jobs, args.stream, args.map)
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        if args.output.lower().endswith('.xlsx'):
+            write_workbook(args.output, args.old_dir, args.new_dir, args.map, changes, summary)
+        else:
+            write_json(args.output, args.old_dir, args.new_dir, args.map, changes, summary)
+        message = f"******  Data model diff written: {args.output} ({time.perf_counter() - start:.3f} s) ******"
+        stars = '*' * len(message)
+        logging.info(stars)
+        logging.info(message)
+        logging.info(stars)
+        logging.info(f"   {'Entity':<15} {'Added':>8} {'Removed':>8} {'Changed':>8} {'Unchanged':>10}")
+        for entity, counts in summary.items():
+            logging.info(f"   {entity:<15} {counts['added']:8} {counts['removed']:8} {counts['changed']:8} {counts['unchanged']:10}")
+    except Exception as e:
+        message = f"******************  Data model diff failed: ******************"
+        length = len(message)
+        stars = '*' * length
+        marks = '!' * length
+        logging.info(stars)
+        logging.info(marks)
+        logging.info(message)
+        exception_type = type(e).__name__
+        logging.info(f"{exception_type}: {e}")
+        logging.exception("Exception: ")
+        logging.info(marks)
+        logging.info(stars)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,107 @@
+"""
+File: datamodel_query.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Query CLI of the SQLite data model store written by `datamodel_store.py`: common lookups answered from the indexes,
+without regenerating or opening any workbook. Values may use '*' as a wildcard.
+
+Example:
+python .\\windchill\\datamodel_extractor\\datamodel_query.py -d .\\output\\datamodel.db --attribute CUSTOMCagecode
+python .\\windchill\\datamodel_extractor\\datamodel_query.py -d .\\output\\datamodel.db --enum CUSTOMCagecodes
+python .\\windchill\\datamodel_extractor\\datamodel_query.py -d .\\output\\datamodel.db --sql "SELECT kind, COUNT(*) FROM files GROUP BY kind"
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+# Lookup name -> (description, SQL with one ':value' parameter compared with the operator in {op})
+QUERIES = {
+    'attribute': ("Types using attribute",
+                  "SELECT t.source, t.name AS type, a.name AS attribute, a.datatype, a.required, a.enumeration, f.path FROM attributes a "
+                  "JOIN types t ON t.type_id = a.type_id JOIN files f ON f.file_id = t.file_id WHERE a.name {op} :value ORDER BY t.source, t.name"),
+    'enum': ("Attributes bound to enumeration",
+             "SELECT t.source, t.name AS type, a.name AS attribute, a.enumeration, a.enumeration_members FROM attributes a "
+             "JOIN types t ON t.type_id = a.type_id WHERE a.enumeration {op} :value ORDER BY t.source, t.name, a.name"),
+    'enum_members': ("Members of enumeration",
+                     "SELECT e.name AS enumeration, m.position, m.name AS member, m.display, m.display_fr, m.selectable FROM enums e "
+                     "JOIN enum_members m ON m.enum_id = e.enum_id WHERE e.name {op} :value ORDER BY e.name, m.position"),
+    'member': ("Enumerations holding member",
+               "SELECT e.name AS enumeration, e.display AS enumeration_display, m.name AS member, m.display, m.selectable FROM enum_members m "
+               "JOIN enums e ON e.enum_id = m.enum_id WHERE m.name {op} :value ORDER BY e.name"),
+    'type': ("Attributes of type",
+             "SELECT t.source, t.name AS type, t.parent, a.name AS attribute, a.display, a.datatype, a.required, a.legal_values, a.enumeration FROM types t "
+             "JOIN attributes a ON a.type_id = t.type_id WHERE t.name {op} :value ORDER BY t.source, t.name, a.position"),
+    'constraint': ("Attributes with constraint",
+                   "SELECT t.source, t.name AS type, c.attribute, c.kind, c.value FROM constraints c "
+                   "JOIN types t ON t.type_id = c.type_id WHERE c.kind {op} :value ORDER BY t.name, c.attribute"),
+    'lifecycle': ("Phases of lifecycle",
+                  "SELECT l.name AS lifecycle, p.position, p.state, p.name AS phase FROM lifecycles l "
+                  "JOIN phases p ON p.lifecycle_id = l.lifecycle_id WHERE l.name {op} :value ORDER BY l.name, p.position"),
+    'state': ("Lifecycles using state",
+              "SELECT l.name AS lifecycle, p.state, p.name AS phase FROM phases p "
+              "JOIN lifecycles l ON l.lifecycle_id = p.lifecycle_id WHERE p.state {op} :value ORDER BY l.name"),
+    'obj_type': ("OIR rules of object type",
+                 "SELECT r.name AS rule, v.obj_type, v.folder, v.lifecycle, v.versioning, v.numbering FROM oir_values v "
+                 "JOIN oir_rules r ON r.rule_id = v.rule_id WHERE v.obj_type {op} :value ORDER BY r.name"),
+}
+
+def run_query(connection, lookup, value):
+    # '*' in the value gives a LIKE pattern, otherwise an exact (indexed) match
+    description, sql = QUERIES[lookup]
+    if '*' in value:
+        sql = sql.format(op='LIKE')
+        value = value.replace('%', r'\%').replace('_', r'\_').replace('*', '%')
+        sql = sql.replace(':value', ":value ESCAPE '\\'")
+    else:
+        sql = sql.format(op='=')
+    cursor = connection.execute(sql, {'value': value})
+    return [column[0] for column in cursor.description], cursor.fetchall()
+
+def print_table(columns, rows):
+    widths = [len(column) for column in columns]
+    for row in rows:
+        for index, value in enumerate(row):
+            widths[index] = max(widths[index], len('' if value is None else str(value)))
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    print('  '.join('-' * width for width in widths))
+    for row in rows:
+        print('  '.join(('' if value is None else str(value)).ljust(width) for value, width in zip(row, widths)))
+
+def run():
+    parser = argparse.ArgumentParser(description="Query the SQLite data model store written by datamodel_store.py.")
+    parser.add_argument('-d', '--database', required=True, help='SQLite database file written by datamodel_store.py')
+    for lookup, (description, _) in QUERIES.items():
+        parser.add_argument(f'--{lookup}', type=str, help=f'{description} (\'*\' wildcard allowed)')
+    parser.add_argument('--sql', type=str, help='Any read-only SQL statement')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(f'file:{args.database}?mode=ro', uri=True)
+    try:
+        lookups = [(lookup, getattr(args, lookup)) for lookup in QUERIES if getattr(args, lookup) is not None]
+        if args.sql:
+            lookups.append(('sql', args.sql))
+        if not lookups:
+            parser.error('one lookup option or --sql is required')
+        for lookup, value in lookups:
+            start = time.perf_counter()
+            if lookup == 'sql':
+                cursor = connection.execute(value)
+                columns, rows = [column[0] for column in cursor.description or ()], cursor.fetchall()
+                description = 'SQL'
+            else:
+                columns, rows = run_query(connection, lookup, value)
+                description = QUERIES[lookup][0]
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{description}: {value}")
+            print_table(columns, rows)
+            print(f"{len(rows)} rows in {elapsed:.1f} ms\n")
+    except sqlite3.Error as e:
+        print(f"{type(e).__name__}: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    run()
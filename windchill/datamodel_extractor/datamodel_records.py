@@ -0,0 +1,191 @@
+"""
+File: datamodel_records.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Records used by `extract_xml_transformer.py` to build Classification output without '~' string churn.
+An attribute definition is a slotted record, and each classification node shares the attribute set inherited from its parent:
+a new set is only created (copy-on-write) when the node defines or overrides attributes. '~' rows are built at output time.
+ClassificationHierarchy resolves depth, family and attributes of all nodes whatever their order in the file.
+"""
+
+import logging
+from operator import attrgetter
+
+# Attribute columns of the Types and Classification csv files, from attributeName to EnumeratedValues
+ATTRIBUTE_FIELDS = ('name', 'display', 'displayFR', 'iba', 'required', 'datatype', 'unit', 'length', 'single', 'upperCase',
+                    'regularExpr', 'defaultValue', 'list_value', 'enum_members')
+# Merge rule for overridden attributes: 'Yes' wins for boolean columns, the first non-empty value wins for the others
+BOOLEAN_FIELDS = ('required', 'single', 'upperCase')
+MERGED_FIELDS = tuple(field for field in ATTRIBUTE_FIELDS[1:] if field not in BOOLEAN_FIELDS)
+get_attribute_fields = attrgetter(*ATTRIBUTE_FIELDS)
+
+class AttributeDefinition:
+    # Never modified once created: records are shared between a parent and its children
+    # default_length: length is the String default of the extractor, not read from a StringLengthConstraint (not a column)
+    __slots__ = ATTRIBUTE_FIELDS + ('default_length', '_row')
+
+    def __init__(self, name, display, displayFR, iba, required, datatype, unit, length, single, upperCase,
+                 regularExpr, defaultValue, list_value, enum_members, default_length=False):
+        self.name = name
+        self.display = display
+        self.displayFR = displayFR
+        self.iba = iba
+        self.required = required
+        self.datatype = datatype
+        self.unit = unit
+        self.length = length
+        self.single = single
+        self.upperCase = upperCase
+        self.regularExpr = regularExpr
+        self.defaultValue = defaultValue
+        self.list_value = list_value
+        self.enum_members = enum_members
+        self.default_length = default_length
+        self._row = None
+
+    def row(self):
+        # '~' joined attribute columns, built once on first output and reused by every node sharing the record
+        if self._row is None:
+            self._row = '~'.join(get_attribute_fields(self))
+        return self._row
+
+    def merged_with(self, override):
+        # New record for an attribute redefined lower in the hierarchy; self is left untouched
+        merged = AttributeDefinition.__new__(AttributeDefinition)
+        merged.name = self.name
+        for field in BOOLEAN_FIELDS:
+            value = getattr(self, field)
+            setattr(merged, field, "Yes" if value == "Yes" or getattr(override, field) == "Yes" else value)
+        for field in MERGED_FIELDS:
+            setattr(merged, field, getattr(self, field) or getattr(override, field))
+        merged.default_length = self.default_length if self.length else override.default_length
+        merged._row = None
+        return merged
+
+class AttributeSet:
+    # Attributes of one classification node (own and inherited), keyed by attribute name
+    __slots__ = ('attributes', 'names')
+
+    def __init__(self, attributes=None, names=None):
+        self.attributes = attributes if attributes is not None else {}
+        self.names = names if names is not None else sorted(self.attributes)  # attribute names in output order
+
+    def derive(self, own_attributes):
+        # Attribute set of a child node: the parent set itself when the child defines nothing,
+        # otherwise a copy where only the defined or overridden attributes are replaced
+        if not own_attributes:
+            return self
+        attributes = dict(self.attributes)
+        new_names = []
+        for attribute in own_attributes:
+            inherited = attributes.get(attribute.name)
+            if inherited is None:
+                new_names.append(attribute.name)
+                attributes[attribute.name] = attribute
+            else:
+                attributes[attribute.name] = inherited.merged_with(attribute)
+        names = sorted(self.names + new_names) if new_names else self.names
+        return AttributeSet(attributes, names)
+
+    def __iter__(self):
+        attributes = self.attributes
+        return (attributes[name] for name in self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+EMPTY_ATTRIBUTE_SET = AttributeSet()
+
+class ClassificationNode:
+    # One csvBeginTypeDefView of a Classification file; depth, family and attributes are resolved once all nodes are read
+    __slots__ = ('typeObject', 'parentType', 'instantiable', 'displayType', 'displayTypeFR', 'descriptionType', 'descriptionTypeFR',
+                 'own_attributes', 'depth', 'family', 'attributes')
+
+    def __init__(self, typeObject, parentType, instantiable, displayType, displayTypeFR, descriptionType, descriptionTypeFR, own_attributes):
+        self.typeObject = typeObject
+        self.parentType = parentType
+        self.instantiable = instantiable
+        self.displayType = displayType
+        self.displayTypeFR = displayTypeFR
+        self.descriptionType = descriptionType
+        self.descriptionTypeFR = descriptionTypeFR
+        self.own_attributes = own_attributes
+        self.depth = 0
+        self.family = "ROOT"
+        self.attributes = EMPTY_ATTRIBUTE_SET
+
+    def rows(self, extra_column=None):
+        # Type line followed by one line per attribute, sorted by attribute name
+        # extra_column: optional function giving one more column for each attribute (resolved enum members)
+        prefix = '~'.join([self.family, str(self.depth), self.typeObject, self.parentType, self.instantiable,
+                           self.displayType, self.displayTypeFR, self.descriptionType, self.descriptionTypeFR])
+        if extra_column is None:
+            yield prefix + '~' * len(ATTRIBUTE_FIELDS)
+            prefix += '~'
+            for attribute in self.attributes:
+                yield prefix + attribute.row()
+            return
+        yield prefix + '~' * (len(ATTRIBUTE_FIELDS) + 1)
+        prefix += '~'
+        for attribute in self.attributes:
+            yield prefix + attribute.row() + '~' + extra_column(attribute)
+
+class ClassificationHierarchy:
+    # Parent index of the classification nodes, built in one pass; depth, family and attributes are resolved once per node
+    # (memoized), so parents may come after their children, e.g. in merged or concatenated exports
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self.by_type = {}
+        for node in self.nodes:
+            if node.typeObject in self.by_type:
+                logging.warning(f"   Classification node {node.typeObject} is defined more than once, its last definition is used as parent")
+            self.by_type[node.typeObject] = node
+        self.resolved = set()  # id() of resolved nodes
+        self.detached = set()  # id() of nodes whose parent is ignored to break a cycle
+
+    def parent(self, node):
+        if not node.parentType or id(node) in self.detached:
+            return None
+        return self.by_type.get(node.parentType)
+
+    def resolve(self, node):
+        # Walk up until a resolved ancestor (or the top of the hierarchy), then resolve the chain top-down:
+        # each node is walked at most once, so resolving all nodes is O(n)
+        chain = []
+        on_chain = set()
+        current = node
+        while current is not None and id(current) not in self.resolved:
+            if id(current) in on_chain:
+                logging.warning(f"   Classification node {chain[-1].typeObject} is its own ancestor, its parent {chain[-1].parentType} is ignored")
+                self.detached.add(id(chain[-1]))
+                break
+            chain.append(current)
+            on_chain.add(id(current))
+            current = self.parent(current)
+        parent = current if current is not None and id(current) in self.resolved else None
+        for current in reversed(chain):
+            if parent is not None:
+                current.depth = parent.depth + 1
+                inherited_family = parent.family
+                inherited = parent.attributes
+            else:
+                # No parent in the file: a parent name still counts as one level, as a hierarchy root has none
+                current.depth = 1 if current.parentType and id(current) not in self.detached else 0
+                inherited_family = "ROOT"
+                inherited = EMPTY_ATTRIBUTE_SET
+            # Objects at depth 2 are the family heads, their descendants belong to their family
+            if current.depth == 2:
+                current.family = current.typeObject
+            elif current.depth > 2:
+                current.family = inherited_family
+            else:
+                current.family = "ROOT"
+            current.attributes = inherited.derive(current.own_attributes)
+            self.resolved.add(id(current))
+            parent = current
+        return node
+
+    def resolve_all(self):
+        for node in self.nodes:
+            self.resolve(node)
+        return self.nodes
@@ -0,0 +1,285 @@
+"""
+File: datamodel_store.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. SQLite backend of the extractor: all XML files of an input tree are transformed in a single run and their rows are
+bulk inserted into one indexed database (types, attributes, constraints, enums, enum members, lifecycles, phases, OIR rules and values),
+to be queried with `datamodel_query.py` instead of opening the workbooks.
+Tables are filled from the rows extracted by `XMLTransformer` (same content as the workbooks), except the enums and enum members: they come from
+the enum definitions of `enum_index.py`, which hold every member with its selectable flag (the workbooks only list the selectable ones). A type
+without attribute rows is also listed, from the type definitions kept by the transformer. Constraints are derived from the attribute columns
+(required, single, upperCase, length, regularExpr, legalValues, EnumeratedValues); the default length given by the extractor to a String attribute
+without StringLengthConstraint is not a constraint. The database is written to a temporary file, then replaces the previous one.
+
+Example:
+python .\\windchill\\datamodel_extractor\\datamodel_store.py -i .\\input -d .\\output\\datamodel.db --jobs 4
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from extract_xml_transformer import XMLTransformer, rows_from_strings
+from enum_index import cached_enum_definitions
+
+SCHEMA = """
+CREATE TABLE files (file_id INTEGER PRIMARY KEY, path TEXT, folder TEXT, kind TEXT, line_count INTEGER);
+CREATE TABLE types (type_id INTEGER PRIMARY KEY, file_id INTEGER, source TEXT, name TEXT, display TEXT, display_fr TEXT, parent TEXT,
+                    family TEXT, depth INTEGER, instantiable TEXT, description TEXT, description_fr TEXT);
+CREATE TABLE attributes (type_id INTEGER, position INTEGER, name TEXT, display TEXT, display_fr TEXT, iba TEXT, required TEXT, datatype TEXT,
+                         unit TEXT, length TEXT, single TEXT, upper_case TEXT, regular_expr TEXT, default_value TEXT, legal_values TEXT,
+                         enumeration TEXT, enumeration_members TEXT);
+CREATE TABLE constraints (type_id INTEGER, attribute TEXT, kind TEXT, value TEXT);
+CREATE TABLE enums (enum_id INTEGER PRIMARY KEY, file_id INTEGER, name TEXT, display TEXT);
+CREATE TABLE enum_members (enum_id INTEGER, position INTEGER, name TEXT, display TEXT, display_fr TEXT, selectable TEXT);
+CREATE TABLE lifecycles (lifecycle_id INTEGER PRIMARY KEY, file_id INTEGER, name TEXT);
+CREATE TABLE phases (lifecycle_id INTEGER, position INTEGER, state TEXT, name TEXT);
+CREATE TABLE oir_rules (rule_id INTEGER PRIMARY KEY, file_id INTEGER, name TEXT);
+CREATE TABLE oir_values (rule_id INTEGER, obj_type TEXT, folder TEXT, lifecycle TEXT, versioning TEXT, numbering TEXT);
+"""
+# Created once the rows are inserted, faster than maintaining them during the bulk inserts
+INDEXES = """
+CREATE INDEX types_name ON types (name);
+CREATE INDEX attributes_type ON attributes (type_id);
+CREATE INDEX attributes_name ON attributes (name);
+CREATE INDEX attributes_enumeration ON attributes (enumeration);
+CREATE INDEX constraints_attribute ON constraints (attribute, kind);
+CREATE INDEX enums_name ON enums (name);
+CREATE INDEX enum_members_enum ON enum_members (enum_id);
+CREATE INDEX enum_members_name ON enum_members (name);
+CREATE INDEX lifecycles_name ON lifecycles (name);
+CREATE INDEX phases_lifecycle ON phases (lifecycle_id);
+CREATE INDEX phases_state ON phases (state);
+CREATE INDEX oir_values_rule ON oir_values (rule_id);
+CREATE INDEX oir_values_obj_type ON oir_values (obj_type);
+"""
+TABLE_COLUMNS = {
+    'files': 5, 'types': 12, 'attributes': 17, 'constraints': 4, 'enums': 4, 'enum_members': 6,
+    'lifecycles': 3, 'phases': 4, 'oir_rules': 3, 'oir_values': 6,
+}
+# Attribute columns turned into constraint rows: (column index in the 14 attribute columns, constraint kind)
+FLAG_CONSTRAINTS = [(4, 'required'), (8, 'single'), (9, 'upperCase')]
+VALUE_CONSTRAINTS = [(7, 'length'), (10, 'regularExpr'), (12, 'legalValues')]
+
+def extract_file(file_path, stream=False):
+    # Transform one XML file, in a worker process with --jobs: returns (path, kind, extracted strings, definitions, default lengths).
+    # An enum file also gives its EnumDefinition records, non selectable members included, a Types file the
+    # (name, display, instantiable) of every type, the ones without attribute rows included.
+    # Default lengths: (type, attribute) of the String attributes whose length column is the extractor default (no length constraint)
+    transformer = XMLTransformer(file_path, os.path.dirname(file_path), stream=stream)
+    if not transformer.transform(write_csv=False):
+        return file_path, None, [], [], set()
+    if transformer.file_kind == 'Enum':
+        definitions = cached_enum_definitions(file_path)
+    elif transformer.file_kind == 'Types':
+        definitions = transformer.type_definitions
+    else:
+        definitions = []
+    return file_path, transformer.file_kind, transformer.extracted_strings, definitions, transformer.default_lengths
+
+def row_blocks(extracted_strings):
+    # Rows grouped by block: units are separated by an empty row ('<EMPTY_ROW>')
+    block = []
+    for row in rows_from_strings(extracted_strings):
+        if row:
+            block.append(row)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+def split_enumeration(value):
+    # EnumeratedValues column: 'GlobalEnum' or 'GlobalEnum: member1|member2' for an overridden global enumeration
+    name, _, members = value.partition(': ')
+    return name, members
+
+class DataModelStore:
+    def __init__(self, database_file):
+        self.database_file = database_file
+        self.tables = {table: [] for table in TABLE_COLUMNS}  # rows waiting for the bulk insert
+        self.next_ids = {table: 1 for table in ('files', 'types', 'enums', 'lifecycles', 'oir_rules')}
+
+    def _new_id(self, table):
+        new_id = self.next_ids[table]
+        self.next_ids[table] += 1
+        return new_id
+
+    def add_file(self, file_path, kind, extracted_strings, definitions=(), default_lengths=()):
+        # Turn the rows of one transformed file into table rows, by file kind (definitions of the enums or types of the file)
+        file_id = self._new_id('files')
+        self.tables['files'].append((file_id, file_path, os.path.dirname(file_path), kind, len(extracted_strings)))
+        if kind == 'Types':
+            self._add_types(file_id, extracted_strings, definitions, default_lengths)
+        elif kind == 'Classification':
+            self._add_classification(file_id, extracted_strings, default_lengths)
+        elif kind == 'Enum':
+            self._add_enums(file_id, definitions)
+        elif kind == 'Lifecycle':
+            self._add_lifecycles(file_id, extracted_strings)
+        elif kind == 'OIR':
+            self._add_oir_rules(file_id, extracted_strings)
+
+    def _add_attribute(self, type_id, position, columns, default_length=False):
+        # columns: the 14 attribute columns of TYPE_HEADER; no length constraint when the length is the String default of the extractor
+        columns = tuple(columns) + ('',) * (14 - len(columns))
+        enumeration, enumeration_members = split_enumeration(columns[13])
+        self.tables['attributes'].append((type_id, position) + columns[:13] + (enumeration, enumeration_members))
+        name = columns[0]
+        for index, kind in FLAG_CONSTRAINTS:
+            if columns[index] == 'Yes':
+                self.tables['constraints'].append((type_id, name, kind, ''))
+        for index, kind in VALUE_CONSTRAINTS:
+            if columns[index] and not (kind == 'length' and default_length):
+                self.tables['constraints'].append((type_id, name, kind, columns[index]))
+        if enumeration:
+            self.tables['constraints'].append((type_id, name, 'enumeration', enumeration))
+
+    def _add_types(self, file_id, extracted_strings, definitions, default_lengths=()):
+        # Block: type name, type display name, header, one row per attribute (none for a type not instantiable).
+        # One block per definition, unless the rows of a file holding a single type without attribute were dropped
+        blocks = list(row_blocks(extracted_strings))
+        if len(blocks) != len(definitions):
+            blocks = [None] * len(definitions)
+        for (name, display, instantiable), block in zip(definitions, blocks):
+            type_id = self._new_id('types')
+            type_name = name
+            if block is not None:
+                name = block[0][0]
+                display = block[1][0] if len(block) > 1 else ''
+            instantiable = 'Yes' if instantiable.lower() == 'true' else 'No'
+            self.tables['types'].append((type_id, file_id, 'Types', name, display, '', '', '', None, instantiable, '', ''))
+            for position, row in enumerate(block[3:] if block is not None else ()):
+                self._add_attribute(type_id, position, row, (type_name, row[0]) in default_lengths)
+
+    def _add_classification(self, file_id, extracted_strings, default_lengths=()):
+        # Header, then for each node its type line (no attribute name) followed by its attribute rows, inherited ones included
+        type_id = type_name = None
+        position = 0
+        for row in rows_from_strings(extracted_strings[1:]):
+            if len(row) < 9:
+                continue
+            family, depth, name, parent, instantiable, display, display_fr, description, description_fr = row[:9]
+            attribute = row[9:]
+            if not attribute or not attribute[0]:
+                type_id = self._new_id('types')
+                type_name = name
+                position = 0
+                self.tables['types'].append((type_id, file_id, 'Classification', name, display, display_fr, parent, family,
+                                             int(depth) if depth.lstrip('-').isdigit() else None, instantiable, description, description_fr))
+            elif type_id is not None:
+                self._add_attribute(type_id, position, attribute, (type_name, attribute[0]) in default_lengths)
+                position += 1
+
+    def _add_enums(self, file_id, definitions):
+        # One row per EnumDefinition, then every member in file order, selectable or not
+        for definition in definitions:
+            enum_id = self._new_id('enums')
+            self.tables['enums'].append((enum_id, file_id, definition.name, definition.display))
+            for position, member in enumerate(definition.members):
+                self.tables['enum_members'].append((enum_id, position, member.name, member.display, member.displayFR,
+                                                    'true' if member.selectable else 'false'))
+
+    def _add_lifecycles(self, file_id, extracted_strings):
+        # Block: lifecycle template name, header, one row per phase (state, name)
+        for block in row_blocks(extracted_strings):
+            lifecycle_id = self._new_id('lifecycles')
+            self.tables['lifecycles'].append((lifecycle_id, file_id, block[0][0]))
+            for position, row in enumerate(block[2:]):
+                row = tuple(row) + ('',) * (2 - len(row))
+                self.tables['phases'].append((lifecycle_id, position, row[0], row[1]))
+
+    def _add_oir_rules(self, file_id, extracted_strings):
+        # Block: rule name, header, one row per AttributeValues (objType, folder, lifecycle, versioning, numbering)
+        for block in row_blocks(extracted_strings):
+            rule_id = self._new_id('oir_rules')
+            self.tables['oir_rules'].append((rule_id, file_id, block[0][0]))
+            for row in block[2:]:
+                row = tuple(row) + ('',) * (5 - len(row))
+                self.tables['oir_values'].append((rule_id,) + row[:5])
+
+    def write(self):
+        # Bulk insert every table in one transaction into a new database, then replace the previous one
+        temp_file = self.database_file + '.tmp'
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        connection = sqlite3.connect(temp_file)
+        try:
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+            connection.executescript(SCHEMA)
+            with connection:
+                for table, rows in self.tables.items():
+                    placeholders = ', '.join('?' * TABLE_COLUMNS[table])
+                    connection.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows)
+            connection.executescript(INDEXES)
+            connection.execute('ANALYZE')
+        finally:
+            connection.close()
+        os.replace(temp_file, self.database_file)
+        return {table: len(rows) for table, rows in self.tables.items()}
+
+def list_xml_files(root_input_dir):
+    # All XML files of the input tree, in a stable order
+    xml_files = []
+    for dirpath, dirs, filenames in os.walk(root_input_dir):
+        dirs.sort()
+        xml_files.extend(os.path.join(dirpath, filename) for filename in sorted(filenames) if filename.endswith('.xml'))
+    return xml_files
+
+def extract_tree(store, root_input_dir, jobs=1, stream=False):
+    # Transform every XML file of the tree once and add its rows to the store, returns the number of XML files
+    xml_files = list_xml_files(root_input_dir)
+    if jobs > 1 and len(xml_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for extracted in executor.map(extract_file, xml_files, [stream] * len(xml_files)):
+                store.add_file(*extracted)
+    else:
+        for file_path in xml_files:
+            store.add_file(*extract_file(file_path, stream))
+    return len(xml_files)
+
+def build_store(root_input_dir, database_file, jobs=1, stream=False):
+    # Transform every XML file of the tree once and write the database, returns the row count of each table
+    start = time.perf_counter()
+    store = DataModelStore(database_file)
+    file_count = extract_tree(store, root_input_dir, jobs, stream)
+    counts = store.write()
+    message = f"******  Data model store written: {database_file} ({file_count} XML files, {time.perf_counter() - start:.3f} s) ******"
+    stars = '*' * len(message)
+    logging.info(stars)
+    logging.info(message)
+    logging.info(stars)
+    for table, count in counts.items():
+        logging.info(f"   {table:<15} {count:8} rows")
+    return counts
+
+def run():
+    parser = argparse.ArgumentParser(description="Write all Windchill XML files of an input tree into one indexed SQLite data model store.")
+    parser.add_argument('-i', '--input_dir', required=True, help='Root input directory containing XML files (Types, Enum, Classification, Lifecycle, OIR).')
+    parser.add_argument('-d', '--database', required=True, help='SQLite database file to write (replaced if it exists).')
+    parser.add_argument('--jobs', type=int, default=1, help='Optional: number of worker processes transforming the XML files (default: 1)')
+    parser.add_argument('--stream', action='store_true', help='Optional: stream XML files with iterparse (bounded memory for large exports)')
+    args = parser.parse_args()
+    try:
+        if os.path.dirname(args.database):
+            os.makedirs(os.path.dirname(args.database), exist_ok=True)
+        build_store(args.input_dir, args.database, args.jobs, args.stream)
+    except Exception as e:
+        message = f"******************  Data model store failed: ******************"
+        length = len(message)
+        stars = '*' * length
+        marks = '!' * length
+        logging.info(stars)
+        logging.info(marks)
+        logging.info(message)
+        exception_type = type(e).__name__
+        logging.info(f"{exception_type}: {e}")
+        logging.exception("Exception: ")
+        logging.info(marks)
+        logging.info(stars)
+
+if __name__ == "__main__":
+    run()
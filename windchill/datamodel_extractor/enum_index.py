@@ -0,0 +1,165 @@
+"""
+File: enum_index.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Global enumeration index used to resolve the EnumeratedValues column of Types and Classification rows.
+The index is built from the Enum XML files of one or more folders (name -> members with display names, FR labels and selectable flag).
+It is loaded on the first lookup and shared by every transform of a run, so each enum file is parsed once per run and not once per reference.
+With the parsed model cache enabled (`parsed_model_cache.py`), the definitions of each enum file are read from the cache while the file is unchanged.
+"""
+
+import hashlib
+import logging
+import os
+from lxml import etree
+from xml_normalizer import HANDLER_NORMALIZER
+from xml_file_kinds import classify_tree
+from extract_xml_transformer import XPATHS, EMPTY_PROPERTY, property_index
+from build_manifest import extractor_version
+from parsed_model_cache import model_cache
+
+class EnumMember:
+    __slots__ = ('name', 'display', 'displayFR', 'selectable')
+
+    def __init__(self, name, display, displayFR, selectable):
+        self.name = name
+        self.display = display
+        self.displayFR = displayFR
+        self.selectable = selectable
+
+class EnumDefinition:
+    __slots__ = ('name', 'display', 'file', 'members')
+
+    def __init__(self, name, display, file, members):
+        self.name = name
+        self.display = display
+        self.file = file
+        self.members = members  # EnumMember records in file order, selectable or not
+
+    def selectable_names(self):
+        return [member.name for member in self.members if member.selectable]
+
+def enum_definition(enum_def_view, file_path):
+    # Same values as XMLTransformer.extract_enum_definition, non selectable members are kept with their flag; None without a name
+    name = XPATHS['name'](enum_def_view)
+    if not name or not name[0]:
+        return None
+    members = []
+    for enum_member in XPATHS['enum_members'](enum_def_view):
+        member_name = XPATHS['name'](enum_member)
+        properties = property_index(enum_member)
+        display, displayFR = properties.get('displayName', EMPTY_PROPERTY)
+        selectable = properties.get('selectable', EMPTY_PROPERTY)[0]
+        members.append(EnumMember(member_name[0] if member_name else '', display, displayFR, selectable.lower() == 'true'))
+    display = property_index(enum_def_view).get('displayName', EMPTY_PROPERTY)[0]
+    return EnumDefinition(name[0], display, file_path, members)
+
+def file_enum_definitions(file_path):
+    # EnumDefinition records of one XML file, none when it is not a global enumeration file (the records cached by the parsed model cache)
+    root = etree.fromstring(HANDLER_NORMALIZER.normalize_file(file_path))
+    decision = classify_tree(root)
+    if decision is None or decision.kind != 'Enum':
+        return []
+    definitions = (enum_definition(enum_def_view, file_path) for enum_def_view in XPATHS['enum_defs'](root))
+    return [definition for definition in definitions if definition is not None]
+
+def cached_enum_definitions(file_path):
+    # file_enum_definitions, from the parsed model cache while the file is unchanged
+    cache = model_cache()
+    if cache is not None:
+        return cache.load(file_path, 'enum_definitions', file_enum_definitions, extractor_version())
+    return file_enum_definitions(file_path)
+
+class EnumIndex:
+    def __init__(self, enum_folders):
+        self.enum_folders = [os.path.abspath(folder) for folder in enum_folders]
+        self.enums = None  # enum name -> EnumDefinition, loaded on the first lookup
+        self.resolved = {}  # EnumeratedValues value -> resolved member names, each value is resolved once
+        self.missing = set()  # enum names referenced but not found, logged once
+        self._fingerprint = None
+
+    def __getstate__(self):
+        # Loaded before being sent to a worker process, so the workers do not parse the enum files again
+        self.load()
+        self.fingerprint()
+        return {'enum_folders': self.enum_folders, 'enums': self.enums, 'resolved': self.resolved, 'missing': self.missing, '_fingerprint': self._fingerprint}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def xml_files(self):
+        # XML files of the enum folders (not their subdirectories), in sorted order
+        xml_files = []
+        for folder in self.enum_folders:
+            if os.path.isdir(folder):
+                xml_files.extend(os.path.join(folder, file) for file in sorted(os.listdir(folder)) if file.endswith('.xml'))
+            else:
+                logging.info(f"   Enum folder not found: {folder}")
+        return xml_files
+
+    def load(self):
+        # Parse each XML file of the enum folders once; files that are not global enumerations are skipped
+        if self.enums is not None:
+            return self
+        self.enums = {}
+        for file_path in self.xml_files():
+            try:
+                definitions = cached_enum_definitions(file_path)
+            except etree.XMLSyntaxError as e:
+                logging.info(f"   Enum index: file skipped, it cannot be parsed: {file_path} ({e})")
+                continue
+            for definition in definitions:
+                if definition.name in self.enums:
+                    logging.warning(f"   Enum index: enumeration {definition.name} defined again in {file_path}, the last definition is used")
+                self.enums[definition.name] = definition
+        logging.info(f"   Enum index loaded: {len(self.enums)} enumerations from {', '.join(self.enum_folders)}")
+        return self
+
+    def get(self, name):
+        # EnumDefinition of a global enumeration, None when it is not in the enum folders
+        return self.load().enums.get(name)
+
+    def resolved_members(self, enumerated_value):
+        # Member names of an EnumeratedValues column: 'GlobalEnum' gives its selectable members from the index,
+        # 'GlobalEnum: a|b' (overridden global enum) keeps the members listed in the type definition
+        if not enumerated_value:
+            return ''
+        resolved = self.resolved.get(enumerated_value)
+        if resolved is None:
+            name, separator, members = enumerated_value.partition(': ')
+            if separator:
+                resolved = members
+            else:
+                definition = self.get(name)
+                if definition is None:
+                    if name not in self.missing:
+                        self.missing.add(name)
+                        logging.info(f"   Enum index: enumeration {name} not found in {', '.join(self.enum_folders)}")
+                    resolved = ''
+                else:
+                    resolved = '|'.join(definition.selectable_names())
+            self.resolved[enumerated_value] = resolved
+        return resolved
+
+    def fingerprint(self):
+        # Hash of the enum folders and enum file contents, stored in the build manifest: a changed enum file rebuilds the workbooks using it
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for file_path in self.xml_files():
+                digest.update(os.path.basename(file_path).encode('utf-8'))
+                with open(file_path, 'rb') as file:
+                    digest.update(hashlib.sha256(file.read()).digest())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+# One index per set of enum folders and per process, shared by all the transforms of a run
+_shared_indexes = {}
+
+def shared_enum_index(enum_folders):
+    # None when no enum folder is given (EnumeratedValues is not resolved)
+    if not enum_folders:
+        return None
+    key = tuple(os.path.abspath(folder) for folder in enum_folders)
+    if key not in _shared_indexes:
+        _shared_indexes[key] = EnumIndex(enum_folders)
+    return _shared_indexes[key]
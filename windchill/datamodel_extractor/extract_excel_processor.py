@@ -8,26 +8,94 @@ Description: See README. Intended to be used to transform Windchill configuratio
 import argparse
 import os
 import logging
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, Alignment, NamedStyle
-import csv
-from extract_xml_transformer import XMLTransformer
-# import pandas as pd
-# from openpyxl.utils.dataframe import dataframe_to_rows
+from extract_xml_transformer import XMLTransformer, rows_from_strings
+from build_manifest import BuildManifest
+from enum_index import shared_enum_index
+from phase_timings import RECORDER, profile_call
+from parsed_model_cache import configure_model_cache
+
+# EnumIndex of a worker process, set once by init_worker instead of being sent with every task
+_worker_enum_index = None
+
+def init_worker(enum_index):
+    # ProcessPoolExecutor initializer: the enum index is sent loaded (EnumIndex.__getstate__) once per worker process
+    global _worker_enum_index
+    _worker_enum_index = enum_index
+
+def worker_enum_index(enum_index=None):
+    # enum_index when given, otherwise the one set by init_worker in this worker process (None in the main process)
+    return enum_index if enum_index is not None else _worker_enum_index
+
+def transform_xml_file(input_file_path, output_folder, stream=False, write_csv=False, phase_settings=None, enum_index=None, use_cache=True):
+    # Transform one XML file, in a worker process with --jobs: returns the transform status,
+    # the extracted strings (picklable, turned into rows by the workbook process), the elapsed time
+    # and the phase records of this transform (phase_settings: RECORDER.settings() of the calling process)
+    # enum_index: EnumIndex resolving EnumeratedValues, the one of init_worker in a worker process
+    # use_cache: False to parse the file whatever the parsed model cache holds
+    enum_index = worker_enum_index(enum_index)
+    if phase_settings is not None and phase_settings != RECORDER.settings():
+        RECORDER.configure(*phase_settings)
+    mark = RECORDER.mark()
+    start = time.perf_counter()
+    with RECORDER.phase('transform', input_file_path):
+        transformer = XMLTransformer(input_file_path, output_folder, stream=stream, enum_index=enum_index, use_cache=use_cache)
+        transformed = transformer.transform(write_csv=write_csv)
+    return transformed, transformer.extracted_strings, time.perf_counter() - start, RECORDER.records_since(mark)
+
+def report_phase_timings(report_file, profile_folder=None, stream=False, enum_index=None):
+    # End of a run with --timings and/or --profile: log the phase totals, write the report,
+    # then transform the hottest file again under cProfile and save its stats in profile_folder
+    # (parsed, not read from the parsed model cache: the profile shows where the transform spends its time)
+    RECORDER.log_totals()
+    if report_file:
+        RECORDER.write_report(report_file)
+    hottest = RECORDER.hottest_file('transform') if profile_folder else None
+    if hottest:
+        stats_file = os.path.join(profile_folder, os.path.splitext(os.path.basename(hottest))[0] + '.prof')
+        logging.info(f"Profiling the slowest file: {hottest}")
+        RECORDER.configure(False)
+        with tempfile.TemporaryDirectory() as output_folder:
+            profile_call(transform_xml_file, stats_file, hottest, output_folder, stream, False, None, enum_index, use_cache=False)
+
+def is_header_row(first_value, second_value):
+    # Header rows are bolded: the first cell starts with "name", "depth" or "objType" and
+    # the second cell starts with "display", "type" or "folder.id"
+    return bool(first_value and (first_value.startswith("name") or first_value.startswith("depth") or first_value.startswith("objType")) and
+                second_value and (second_value.startswith("display") or second_value.startswith("type") or second_value.startswith("folder.id")))
 
 class ExcelFileProcessor:
-    def __init__(self, input_folder, output_folder, keep_csv=False):
-        # Initialize the workbook creator with the directory of CSV files and the output file path
+    def __init__(self, input_folder, output_folder, keep_csv=False, stream=False, jobs=1, write_only=False, force=False, enum_index=None):
+        # Initialize the workbook creator with the directory of XML files and the output folder
         logging.info('-------------------------------BEGIN EXCEL PROCESSOR--------------------------------')
         self.input_folder = input_folder
         self.output_folder = output_folder
         # Define the name for the output Excel file and initialize the excel workbook
         self.output_file = os.path.join(output_folder, os.path.basename(os.path.normpath(output_folder))+'.xlsx')
-        self.keep_csv = keep_csv
-        self.wb = Workbook()
-        self.toc = self.wb.active
-        self._setup_toc()
+        self.keep_csv = keep_csv  # csv files are an optional output, rows go straight from XMLTransformer to the worksheets
+        self.stream = stream
+        self.jobs = jobs  # number of worker processes transforming the XML files, 1 to transform them in this process
+        self.sheet_names = []  # worksheets added, in TOC order
+        self.file_timings = []  # (file, status, seconds, rows) for each XML file, in sheet order
+        self.force = force  # rebuild the workbook and transform every file, whatever the build manifest says
+        self.manifest = None  # BuildManifest of the output folder, set by process_excel_file
+        self.up_to_date = False  # True when process_excel_file kept the workbook of the last build
+        self.enum_index = enum_index  # EnumIndex (enum_index.py) adding the resolved enum members to Types and Classification rows, None to skip
+        # Write-only workbook: rows are written as they are appended (no cell kept in memory), the TOC sheet is written at the end
+        self.write_only = write_only
+        if self.write_only:
+            self.wb = Workbook(write_only=True)
+            self.toc = None
+        else:
+            self.wb = Workbook()
+            self.toc = self.wb.active
+            self._setup_toc()
         message = f"******  Processing input folder: {self.input_folder} ******"
         length = len(message)
         stars = '*' * length
@@ -58,10 +126,7 @@ class ExcelFileProcessor:
         for row in ws.iter_rows():
             # Check if the row has at least two cells
             if len(row) >= 2:
-                # Check if the first cell starts with "name" or "depth" and 
-                # the second cell starts with "display" or "type"
-                if ((row[0].value and (row[0].value.startswith("name") or row[0].value.startswith("depth") or row[0].value.startswith("objType"))) and
-                    (row[1].value and (row[1].value.startswith("display") or row[1].value.startswith("type") or row[1].value.startswith("folder.id")))):
+                if is_header_row(row[0].value, row[1].value):
                     # Apply bold font to all cells in this row
                     for cell in row:
                         cell.font = Font(bold=True)
@@ -70,51 +135,32 @@ class ExcelFileProcessor:
             max_length = max(len(str(cell.value)) for cell in column_cells if cell.value) + 2
             ws.column_dimensions[column_cells[0].column_letter].width = max_length
 
-    def _add_csv_to_sheet(self, csv_file):
-        # Add each CSV file to a new sheet in the workbook
-        csv_path = os.path.join(self.output_folder, csv_file)
-        
-        # Solution 1 - Using CSV module from python
-        # Read the CSV file and add its contents to the sheet
-        try:
-            with open(csv_path, mode='r', encoding='utf-8') as f:
-                self._append_rows_to_sheet(csv_file,f)
-        except UnicodeDecodeError:
-            message = f"******  UnicodeDecodeError: file {csv_file} transcoded to latin1 instead of utf-8 ******"
-            length = len(message)
-            stars = '*' * length
-            logging.info(stars)
-            logging.info(message)
-            logging.info(stars)            
-            # If utf-8 decoding fails, try another encoding such as 'latin1'
-            with open(csv_path, mode='r', encoding='latin1') as f:
-                self._append_rows_to_sheet(csv_file,f)
-
-        # Solution 2 - Using pandas - can be used if Solution 1 has perf issue .. 
-        # try:
-        #     # df = pd.read_csv(csv_path, sep='~', encoding='utf-8-sig')
-        #     # Set keep_default_na to False to avoid treating 'None' as NaN, Specify na_values to an empty list to ensure only empty strings are treated as NaN
-        #     df = pd.read_csv(csv_path, sep='~', encoding='utf-8', keep_default_na=False, na_values=[])
-        #     for row in dataframe_to_rows(df, index=False, header=True):
-        #         ws.append(row)
-        # except UnicodeDecodeError:
-        #     try:
-        #         df = pd.read_csv(csv_path, sep='~', encoding='latin1', keep_default_na=False, na_values=[])
-        #         for row in dataframe_to_rows(df, index=False, header=True):
-        #             ws.append(row)
-        #     except Exception as e:
-        #         raise e
-        # except pd.errors.ParserError as e:
-        #     raise e   
-        
-        # Delete the CSV file if the keep_csv flag is False
-        if not self.keep_csv:
-            os.remove(csv_path)
-            logging.info(f"Deleted CSV file: {csv_path}")
+    def _append_rows_to_write_only_sheet(self, ws, rows):
+        # Write-only sheets are written row by row: the formatting of _format_worksheet is worked out from the row values instead of the cells.
+        # Column widths are written before the first row, so they are computed from the row values first
+        rows = list(rows)
+        max_columns = max((len(row) for row in rows), default=0)
+        widths = {}
+        for row in rows:
+            for index, value in enumerate(row):
+                if value and len(value) > widths.get(index, 0):
+                    widths[index] = len(value)
+        for index, width in widths.items():
+            ws.column_dimensions[get_column_letter(index + 1)].width = width + 2
+        bold = Font(bold=True)
+        for row in rows:
+            if len(row) >= 2 and is_header_row(row[0], row[1]):
+                # Bold all cells of the header row, up to the last column of the sheet
+                cells = []
+                for index in range(max_columns):
+                    cell = WriteOnlyCell(ws, value=row[index] if index < len(row) else None)
+                    cell.font = bold
+                    cells.append(cell)
+                ws.append(cells)
+            else:
+                ws.append(row)
 
-    def _append_rows_to_sheet(self, csv_file, f):
-        # Extract the base name without the file extension
-        base_name = os.path.splitext(csv_file)[0]
+    def _append_rows_to_sheet(self, base_name, rows):
         # Truncate sheet title to a maximum of 31 characters for Excel compatibility
         sheet_title = base_name[:31]
         # Check if the base name length exceeds 31 characters and log a message with hignlight
@@ -135,19 +181,18 @@ class ExcelFileProcessor:
             self.wb.remove(sheet_to_remove)
         # Create a new sheet
         ws = self.wb.create_sheet(title=sheet_title)
-        # Read from the CSV file and append rows to the sheet
-        reader = csv.reader(f, delimiter='~')
-        for row in reader:
-            # Check if the row contains only the string '<EMPTY_ROW>'
-            if row == ['<EMPTY_ROW>']:
-                # Append an empty row
-                ws.append([])
-            else:
-                # Append the original row
-                ws.append(row)
-        # Apply formatting to the worksheet
-        self._format_worksheet(ws)
-        logging.info(f"Added CSV file to new worksheet: {csv_file} --> {sheet_title} ")
+        if self.write_only:
+            with RECORDER.phase('append_rows', base_name):
+                self._append_rows_to_write_only_sheet(ws, rows)
+        else:
+            # Append the rows extracted by the transformer, an empty tuple being an empty row
+            with RECORDER.phase('append_rows', base_name):
+                for row in rows:
+                    ws.append(row)
+            # Apply formatting to the worksheet
+            with RECORDER.phase('format_worksheet', base_name):
+                self._format_worksheet(ws)
+        logging.info(f"Added rows to new worksheet: {base_name} --> {sheet_title} ")
 
     def _add_to_toc(self, sheet_title, index):
         # Add the sheet name to the TOC with a hyperlink
@@ -156,6 +201,21 @@ class ExcelFileProcessor:
         toc_cell.hyperlink = f"#{sheet_title[:31]}!A1"
         toc_cell.style = 'Hyperlink'
 
+    def _write_toc(self):
+        # Write-only workbook: the TOC sheet is written once all sheets are known, then moved first
+        self.toc = self.wb.create_sheet(title="TOC", index=0)
+        self.toc.column_dimensions[get_column_letter(1)].width = 20
+        heading_cell = WriteOnlyCell(self.toc, value="Table of Contents")
+        heading_cell.style = NamedStyle(name="heading", font=Font(bold=True), alignment=Alignment(horizontal="center"))
+        self.toc.append([heading_cell])
+        self.toc.append([])
+        for sheet_name in self.sheet_names:
+            toc_cell = WriteOnlyCell(self.toc, value=sheet_name)
+            # Truncate sheet title to a maximum of 31 characters for Excel compatibility
+            toc_cell.hyperlink = f"#{sheet_name[:31]}!A1"
+            toc_cell.style = 'Hyperlink'
+            self.toc.append([toc_cell])
+
     def _remove_existing_output_file(self):
         # Check if the output file already exists and remove it if it does
         try:
@@ -182,17 +242,20 @@ class ExcelFileProcessor:
             logging.info(stars) 
 
     def create_excel_with_toc(self):
-        # Create the workbook and save it to the output file
+        # Create the workbook and save it to the output file, returns False when it could not be saved
         self._remove_existing_output_file()
         try:
-            if list(filter(lambda f: f.endswith('.csv'), os.listdir(self.output_folder))):
-                index = 2  # Start index at 2
-                for csv_file in sorted(os.listdir(self.output_folder)):
-                    if csv_file.endswith('.csv'):
-                        self._add_csv_to_sheet(csv_file)
-                        self._add_to_toc(os.path.splitext(csv_file)[0], index)
-                        index += 1  # Only increment index if file ends with .csv
-                self.wb.save(self.output_file)
+            if self.sheet_names:
+                with RECORDER.phase('toc', self.output_file):
+                    if self.write_only:
+                        self._write_toc()
+                    else:
+                        index = 2  # Start index at 2
+                        for sheet_name in self.sheet_names:
+                            self._add_to_toc(sheet_name, index)
+                            index += 1
+                with RECORDER.phase('save', self.output_file):
+                    self.wb.save(self.output_file)
                 message = f"******  Excel file saved at {self.output_file} ******"
                 length = len(message)
                 stars = '*' * length
@@ -200,7 +263,8 @@ class ExcelFileProcessor:
                 logging.info(message)
                 logging.info(stars) 
             else:
-                logging.info('No *.csv files found for : '+self.output_file+' - File not created !')
+                logging.info('No data extracted from xml files for : '+self.output_file+' - File not created !')
+            return True
         except Exception as e:
             message = f"******  Failed to create Excel file: {self.output_file} ******"
             length = len(message)
@@ -215,16 +279,107 @@ class ExcelFileProcessor:
             logging.info('An existing file with same name may be opened or used by someone else.')
             logging.info(marks)
             logging.info(stars) 
+            return False
+
+    def list_xml_files(self):
+        # XML files of the input directory, in sheet order (same order as the csv file names)
+        xml_files = [file for file in os.listdir(self.input_folder) if file.endswith(".xml")]
+        xml_files.sort(key=lambda file: os.path.splitext(file)[0] + '.csv')
+        return xml_files
 
-    def process_xml_files(self):
-        # Iterate each file in the input directory
-        for file in os.listdir(self.input_folder):
-            # Check if the file is an XML file
-            if file.endswith(".xml"):
-                input_file_path = os.path.join(self.input_folder, file)
-                transformer = XMLTransformer(input_file_path, self.output_folder)
-                # Parse and transform to CSV file
-                transformer.transform()
+    def process_xml_files(self, changed=None):
+        # Iterate each XML file in the input directory, in sheet order
+        # With a build manifest, only the changed files are transformed, the others are added from the cached strings
+        xml_files = self.list_xml_files()
+        to_transform = xml_files if self.manifest is None or changed is None else changed
+        start = time.perf_counter()
+        futures = {}
+        executor = None
+        if self.jobs > 1 and len(to_transform) > 1:
+            # Transform the files in a process pool, then add the sheets in the same sorted order
+            executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=init_worker, initargs=(self.enum_index,))
+            futures = {file: executor.submit(transform_xml_file, os.path.join(self.input_folder, file), self.output_folder, self.stream, self.keep_csv,
+                                             RECORDER.settings())
+                       for file in to_transform}
+        try:
+            to_transform = set(to_transform)
+            for file in xml_files:
+                if file in to_transform:
+                    self._add_transformed_file(file, futures.get(file))
+                else:
+                    extracted_strings = self.manifest.cached_strings(file)
+                    if extracted_strings is None:
+                        # Cache file unreadable since changed_files checked it: transform the file after all
+                        self._add_transformed_file(file, None)
+                    else:
+                        self._add_cached_file(file, extracted_strings)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self._log_file_timings(time.perf_counter() - start)
+
+    def _add_transformed_file(self, file, future):
+        # Parse and transform (or get the worker result), the csv file is only written when kept
+        try:
+            if future is None:
+                transformed, extracted_strings, elapsed, _ = transform_xml_file(os.path.join(self.input_folder, file), self.output_folder, self.stream, self.keep_csv,
+                                                                                enum_index=self.enum_index)
+            else:
+                transformed, extracted_strings, elapsed, phase_records = future.result()
+                RECORDER.extend(phase_records)
+        except Exception as e:
+            # An error is reported for its file only, the other files are still added
+            where = 'in worker process' if future is not None else 'in process'
+            message = f"******  Transform failed {where}: {file} ******"
+            length = len(message)
+            stars = '*' * length
+            marks = '!' * length
+            logging.info(stars)
+            logging.info(marks)
+            logging.info(message)
+            exception_type = type(e).__name__
+            logging.info(f"{exception_type}: {e}")
+            logging.info(marks)
+            logging.info(stars)
+            self.file_timings.append((file, 'error', 0.0, 0))
+            return
+        if not transformed:
+            self.file_timings.append((file, 'failed', elapsed, 0))
+            return
+        if self.manifest is not None:
+            self.manifest.record(file, extracted_strings)
+        if not extracted_strings:
+            self.file_timings.append((file, 'empty', elapsed, 0))
+        else:
+            # Append the rows straight to a new worksheet
+            sheet_name = os.path.splitext(file)[0]
+            self._append_rows_to_sheet(sheet_name, rows_from_strings(extracted_strings))
+            self.sheet_names.append(sheet_name)
+            self.file_timings.append((file, 'ok', elapsed, len(extracted_strings)))
+
+    def _add_cached_file(self, file, extracted_strings):
+        # Unchanged file: the strings extracted by the last build are added as if the file was transformed
+        if extracted_strings and self.keep_csv:
+            # Same content as XMLTransformer.write_output
+            output_csv_file = os.path.join(self.output_folder, os.path.splitext(file)[0] + '.csv')
+            with open(output_csv_file, 'w', encoding='utf-8') as f:
+                for string in extracted_strings:
+                    f.write(string + '\n')
+            logging.info(f"   CSV File created from build cache (encoding utf-8): {output_csv_file}")
+        if extracted_strings:
+            sheet_name = os.path.splitext(file)[0]
+            self._append_rows_to_sheet(sheet_name, rows_from_strings(extracted_strings))
+            self.sheet_names.append(sheet_name)
+        self.file_timings.append((file, 'cached', 0.0, len(extracted_strings)))
+
+    def _log_file_timings(self, total_elapsed):
+        # Per file transform time; with --jobs, the sum of the file times is larger than the elapsed time
+        if not self.file_timings:
+            return
+        logging.info(f"Transform timings for {self.input_folder} (jobs: {self.jobs}):")
+        for file, status, seconds, lines in self.file_timings:
+            logging.info(f"   {file:<50} {status:<6} {seconds:8.3f} s {lines:8} lines")
+        logging.info(f"   {'Total (sum of files / elapsed)':<57} {sum(timing[2] for timing in self.file_timings):8.3f} s / {total_elapsed:.3f} s")
 
     def create_output_directory(self):
         try:
@@ -256,6 +411,24 @@ class ExcelFileProcessor:
             if not os.path.exists(self.output_folder):
                 self.create_output_directory()
 
+            # Compare the input files with the build manifest of the output directory, the workbook is kept when none changed
+            RECORDER.folder = self.input_folder
+            with RECORDER.phase('manifest', self.output_folder):
+                enum_fingerprint = self.enum_index.fingerprint() if self.enum_index is not None else None
+                self.manifest = BuildManifest(self.output_folder, self.keep_csv, self.force, enum_fingerprint)
+                xml_files = self.list_xml_files()
+                changed = self.manifest.changed_files(self.input_folder, xml_files)
+            if self.manifest.is_up_to_date(xml_files, changed, self.output_file):
+                message = f"******  Up to date, no input XML file changed: {self.output_folder} (use --force to rebuild) ******"
+                length = len(message)
+                stars = '*' * length
+                logging.info(stars)
+                logging.info(message)
+                logging.info(stars)
+                self.up_to_date = True
+                return
+            logging.info(f"XML files to transform: {len(changed)} of {len(xml_files)}, the others are read from the build cache.")
+
             # Iterate over all files in output directory
             logging.info("All existing *.csv files in output directory will be removed.")
             for filename in os.listdir(self.output_folder):
@@ -263,10 +436,14 @@ class ExcelFileProcessor:
                     os.remove(os.path.join(self.output_folder, filename))
 
             # Process each xml files
-            self.process_xml_files()
+            self.process_xml_files(changed)
 
-            # Create the excel workbook
-            self.create_excel_with_toc()
+            # Create the excel workbook, then record the build (a workbook that could not be saved is rebuilt next time)
+            if self.create_excel_with_toc():
+                with RECORDER.phase('manifest', self.output_folder):
+                    self.manifest.save(xml_files, self.output_file)
+            else:
+                self.manifest.remove()
         except Exception as e:
             message = f"******************  Process excel file failed: ******************"
             length = len(message)
@@ -287,10 +464,26 @@ class ExcelFileProcessor:
         parser = argparse.ArgumentParser(description="Generate CSV files from XML Files. Generate Excel workbook from CSV files with TOC.")
         parser.add_argument('-i', '--input_dir', required=True, help='Input directory containing XML files (Types, Enum, Classification).')
         parser.add_argument('-o', '--output_dir', required=True, help='Output directory for CSV and Excel files.')
-        parser.add_argument('--keep_csv', action='store_true', help='Optional: keep CSV files after processing')
+        parser.add_argument('--keep_csv', action='store_true', help='Optional: also write the CSV file of each XML file')
+        parser.add_argument('--stream', action='store_true', help='Optional: stream XML files with iterparse (bounded memory for large exports)')
+        parser.add_argument('--jobs', type=int, default=1, help='Optional: number of worker processes transforming the XML files (default: 1)')
+        parser.add_argument('--write_only', action='store_true', help='Optional: write the workbook in write-only mode (rows formatted while appended, lower memory)')
+        parser.add_argument('--force', action='store_true', help='Optional: rebuild the workbook even if no input XML file changed since the last build')
+        parser.add_argument('--timings', type=str, help='Optional: write the duration of each phase of each file to this report file (.json or .csv)')
+        parser.add_argument('--timings_memory', action='store_true', help='Optional: also record the peak memory of each phase (tracemalloc, slower)')
+        parser.add_argument('--profile', action='store_true', help='Optional: transform the slowest file again under cProfile and save its stats (.prof) in the output directory')
+        parser.add_argument('--enum_dir', nargs='+', help='Optional: folder(s) of global enumeration XML files; adds the resolved enum members of each attribute to Types and Classification rows')
+        parser.add_argument('--model_cache', type=str, help='Optional: parsed model cache folder shared with the enum scripts; an unchanged XML file is not parsed again, even with --force or another output directory (default: $WT_MODEL_CACHE)')
         args = parser.parse_args()
-        excel_processor = ExcelFileProcessor(args.input_dir, args.output_dir, args.keep_csv)
+        if args.model_cache:
+            configure_model_cache(args.model_cache)
+        if args.timings or args.profile:
+            RECORDER.configure(True, args.timings_memory)
+        enum_index = shared_enum_index(args.enum_dir)
+        excel_processor = ExcelFileProcessor(args.input_dir, args.output_dir, args.keep_csv, args.stream, args.jobs, args.write_only, args.force, enum_index)
         excel_processor.process_excel_file()
+        if args.timings or args.profile:
+            report_phase_timings(args.timings, args.output_dir if args.profile else None, args.stream, enum_index)
 
 if __name__ == "__main__":
     ExcelFileProcessor.run()
@@ -5,120 +5,168 @@ Date: November , 2023
 Description: See README. Intended to be used to transform Windchill configuration file into excel, this script is responsible for transforming one XML file into a specific structured text format. Used as stand-alone, it will create the csv file. It is also used by `extract_excel_processor.py` to create one Excel workbook.
 """
 
-from collections import OrderedDict
+import csv
+import io
 import logging
 from lxml import etree
 import argparse
 import os
+from xml_file_kinds import FILE_KINDS, register_file_kind, classify_tree, classify_stream_element
+from xml_normalizer import HANDLER_NORMALIZER
+from datamodel_records import AttributeDefinition, ClassificationNode, ClassificationHierarchy
+from phase_timings import RECORDER
+from value_rules import VALUE_RULES
+from build_manifest import extractor_version
+from parsed_model_cache import model_cache, configure_model_cache
 
 logging.basicConfig(level=logging.DEBUG, format='%(levelname)s - %(filename)s - %(message)s')
 
+# Streaming mode: Windchill load files are flat, each csvBegin* handler element is closed by a later csvEnd* sibling.
+# The tree mode normalization (xml_normalizer.py) rewrites them into real nesting; the streaming engine rebuilds the same nesting while parsing.
+# csvBegin* handler elements that stay open until their csvEnd* element
+CONTAINER_TAGS = {
+    'csvBeginTypes', 'csvBeginTypeDefView', 'csvBeginLayoutDefView', 'csvBeginGroupDefView', 'csvBeginGroupMemberView',
+    'csvBeginAttributeDefView', 'csvBeginConstraintDefView', 'csvBeginEnumDefView', 'csvBeginEnumMemberView',
+    'csvLifeCycleTemplateBegin',
+}
+# csvEnd* handler element -> csvBegin* handler element it closes
+CLOSING_TAGS = {
+    'csvEndTypes': 'csvBeginTypes',
+    'csvEndTypeDefView': 'csvBeginTypeDefView',
+    'csvEndLayoutDefView': 'csvBeginLayoutDefView',
+    'csvEndGroupDefView': 'csvBeginGroupDefView',
+    'csvEndGroupMemberView': 'csvBeginGroupMemberView',
+    'csvEndAttributeDefView': 'csvBeginAttributeDefView',
+    'csvEndConstraintDefView': 'csvBeginConstraintDefView',
+    'csvEndEnumDefView': 'csvBeginEnumDefView',
+    'csvEndEnumMemberView': 'csvBeginEnumMemberView',
+    'csvLifeCycleTemplateEnd': 'csvLifeCycleTemplateBegin',
+}
+# Handler elements removed by the tree mode normalization
+DROPPED_TAGS = {'csvPhaseTemplateEnd'}
+# Elements handed over to the extractor (then cleared) as soon as they are complete
+UNIT_TAGS = {'csvBeginTypeDefView', 'csvBeginEnumDefView', 'csvLifeCycleTemplateBegin', 'TypeBasedRule'}
+
+# Precompiled XPath expressions: compiled once at import instead of at every call
+XPATHS = {
+    'name': etree.XPath("./csvname/text()"),
+    'phase_state': etree.XPath("./csvphaseState/text()"),
+    'type_defs_lwctype': etree.XPath(".//csvBeginTypeDefView[csvattTemplate='LWCTYPE']"),
+    'type_defs_lwcstruct': etree.XPath(".//csvBeginTypeDefView[csvattTemplate='LWCSTRUCT']"),
+    'attribute_defs': etree.XPath("./csvBeginAttributeDefView"),
+    'constraint_defs': etree.XPath("./csvBeginConstraintDefView"),
+    'enum_defs': etree.XPath(".//csvBeginEnumDefView"),
+    'first_enum_def': etree.XPath("./csvBeginEnumDefView[1]"),
+    'first_enum_def_name': etree.XPath("./csvBeginEnumDefView[1]/csvname/text()"),
+    'first_enum_def_master': etree.XPath("./csvBeginEnumDefView[1]/csvmaster/text()"),
+    'enum_members': etree.XPath(".//csvBeginEnumMemberView"),
+    'lc_templates': etree.XPath(".//csvLifeCycleTemplateBegin"),
+    'phase_templates': etree.XPath(".//csvPhaseTemplateBegin"),
+    'base_rules': etree.XPath(".//TypeBasedRule"),
+    'rule_name': etree.XPath(".//ruleName/text()"),
+    'attribute_values': etree.XPath(".//AttributeValues"),
+    'obj_type': etree.XPath("./@objType"),
+    'attr_value_args': etree.XPath(".//AttrValue[@id=$id]/Arg/text()"),
+}
+
+def property_index(element):
+    # Index the csvPropertyValue children of an element once: csvname -> (csvvalue, csvlocale_fr)
+    # Same result as ./csvPropertyValue[csvname='...']/csvvalue/text() (first non-empty value wins) with a dict lookup per property
+    index = {}
+    for property_value in element.iterchildren('csvPropertyValue'):
+        name = value = locale_fr = None
+        for field in property_value:
+            tag = field.tag
+            if tag == 'csvname':
+                if name is None:
+                    name = field.text or ''
+            elif tag == 'csvvalue':
+                if value is None:
+                    value = field.text
+            elif tag == 'csvlocale_fr':
+                if locale_fr is None:
+                    locale_fr = field.text
+        if name is None:
+            continue
+        indexed = index.get(name)
+        if indexed is None:
+            index[name] = (value or '', locale_fr or '')
+        elif not indexed[0] or not indexed[1]:
+            index[name] = (indexed[0] or value or '', indexed[1] or locale_fr or '')
+    return index
+
+EMPTY_PROPERTY = ('', '')
+
+TYPE_HEADER = "name~display~displayFR~iba~required~type~unit~length~single~upperCase~regularExpr~defaultValue~legalValues~EnumeratedValues"
+CLASSIFICATION_HEADER = "Family~depth~classifType~parentClassifType~instantiable~displayClassifType~displayClassifTypeFR~descriptionType~descriptionTypeFR~attributeName~attributeDisplayName~attributeDisplayNameFR~iba~required~type~unit~length~single~upperCase~regularExpr~defaultValue~legalValues~EnumeratedValues"
+# Column appended to the Types and Classification headers when an enum index resolves EnumeratedValues (see enum_index.py)
+ENUM_MEMBERS_HEADER = "EnumeratedMembers"
+
+def rows_from_strings(extracted_strings):
+    # Rows of extracted strings as tuples, the same rows as csv.reader(delimiter='~') reading the csv file
+    # '<EMPTY_ROW>' gives an empty row
+    if any('"' in string or '\n' in string or '\r' in string for string in extracted_strings):
+        # Quoted fields or line breaks: let the csv module split them as it would read the csv file
+        rows = csv.reader(io.StringIO('\n'.join(extracted_strings) + '\n', newline=None), delimiter='~')
+        for row in rows:
+            yield () if row == ['<EMPTY_ROW>'] else tuple(row)
+        return
+    for string in extracted_strings:
+        yield () if string == '<EMPTY_ROW>' or not string else tuple(string.split('~'))
+
 class XMLTransformer:
-    def __init__(self, input_file, output_folder, debug=False):
+    def __init__(self, input_file, output_folder, debug=False, stream=False, enum_index=None, use_cache=True):
         logging.info('   -------------------------------BEGIN TRANSFORM--------------------------------------')
         self.input_file = input_file
         # Construct the output file name by replacing the .xml extension with .csv
         output_file_name = os.path.splitext(os.path.basename(input_file))[0] + '.csv'
         self.output_file = os.path.join(output_folder, output_file_name)
         self.debug = debug
+        self.stream = stream
         self.extracted_strings = [] # Initialize a list to hold the extracted strings
+        self.file_kind = None # Kind of the file (xml_file_kinds.py), set once detected
+        self.type_definitions = [] # (name, display, instantiable) of every type of a Types file, also the ones without rows
+        self.default_lengths = set() # (type, attribute) of the String attributes given the default length, without StringLengthConstraint
+        self.enum_index = enum_index # EnumIndex resolving the EnumeratedValues column of Types and Classification rows, None to keep the column as is
+        self.use_cache = use_cache # False to parse the file even when the parsed model cache holds its strings (profiling)
         if self.debug:
                     logging.getLogger().setLevel(logging.DEBUG)
 
     def __del__(self):
         logging.info('   -------------------------------END   TRANSFORM--------------------------------------')
 
-    def normalize_xml(self, xml_content):
-        # Define the replacements as a list of tuples to be executed in same order
-        replacements = [
-        # TYPES, CLASSIFICATION
-            ('</csvBeginTypes>', ''),
-            ('<csvBeginTypes handler="com.ptc.core.lwc.server.TypeDefinitionLoader.beginProcessTypes"/>', '<csvBeginTypes handler="com.ptc.core.lwc.server.TypeDefinitionLoader.beginProcessTypes">'),
-            ('</csvBeginTypeDefView>', ''),
-            ('</csvBeginLayoutDefView>', ''),
-            ('</csvBeginGroupDefView>', ''),
-            ('</csvBeginGroupMemberView>', ''),
-            ('</csvBeginAttributeDefView>', ''),
-            ('</csvBeginConstraintDefView>', ''),
-            ('</csvBeginEnumDefView>', ''),
-            ('</csvBeginEnumMemberView>', ''),
-            ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
-            ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
-            ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
-            ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
-            ('<csvEndConstraintDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessConstraintDefinition"/>', '</csvBeginConstraintDefView>'),
-            ('<csvEndAttributeDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessAttributeDefinition"/>', '</csvBeginAttributeDefView>'),
-            ('<csvEndGroupMemberView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessGroupMembership"/>', '</csvBeginGroupMemberView>'),
-            ('<csvEndGroupDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessGroupDefinition"/>', '</csvBeginGroupDefView>'),
-            ('<csvEndLayoutDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessLayoutDefinition"/>', '</csvBeginLayoutDefView>'),
-            ('<csvEndTypeDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessTypeDefinition"/>', '</csvBeginTypeDefView>'),
-            ('<csvEndTypes handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessTypes"/>', '</csvBeginTypes>'),
-        # LIFECYCLE
-            ('</csvLifeCycleTemplateBegin>', ''),
-            ('<csvPhaseTemplateEnd handler="wt.lifecycle.LoadLifeCycle.createPhaseTemplateEnd"></csvPhaseTemplateEnd>', ''),
-            ('<csvLifeCycleTemplateEnd handler="wt.lifecycle.LoadLifeCycle.createLifeCycleTemplateEnd"></csvLifeCycleTemplateEnd>', '</csvLifeCycleTemplateBegin>'),
-            ('<csvLifeCycleTemplateEnd handler="wt.lifecycle.LoadLifeCycle.createLifeCycleTemplateEnd"/>', '</csvLifeCycleTemplateBegin>'),
-        # OIR
-            ('<![CDATA[', ''),
-            (']]>', ''),
-        ]
-
-        # Perform the replacements in order
-        for old, new in replacements:
-            xml_content = xml_content.replace(old, new)
-
-        return xml_content
-
     def save_debug_output(self, content):
         debug_output_file =  os.path.splitext(self.output_file)[0] + '_normalized.xml'
         with open(debug_output_file, 'w') as f:
             f.write(content)
         logging.debug(f"   Debug output saved to {debug_output_file}")
 
-    def transform(self):
+    def transform(self, write_csv=True):
+        # Returns True when the file was transformed: rows are then available with iter_rows(), the csv file is an optional output
         try:
-            # Read the XML file content
-            with open(self.input_file, 'r', encoding='utf-8') as file:
-                xml_content = file.read()
-            # Normalize the XML content
-            normalized_xml_content = self.normalize_xml(xml_content)
-            # Save the normalized content for debugging
-            if self.debug:
-                self.save_debug_output(normalized_xml_content)
-            # Parse the normalized XML content
-            root = etree.fromstring(normalized_xml_content.encode('utf-8'))
-            begin_types = root.xpath(".//csvBeginTypes")
-            classifications = types = False
-
-            for element in begin_types:
-                if element.xpath(".//csvBeginTypeDefView[csvattTemplate='LWCTYPE']"):
-                    types = True
-                    break
-                elif element.xpath(".//csvBeginTypeDefView[csvattTemplate='LWCSTRUCT']"):
-                    classifications = True
-                    break
-            
-            if types:
-                logging.info('   Processing Types XML(encoding utf-8): ' + self.input_file)
-                self.extract_data_type(root)
-            elif classifications:
-                logging.info('   Processing Classification XML(encoding utf-8): ' + self.input_file)
-                self.extract_data_classification(root)
-            elif root.xpath(".//csvBeginEnumMemberView"):
-                logging.info('   Processing Global Enumeration XML(encoding utf-8): ' + self.input_file)
-                self.extract_data_enum(root)
-            elif root.xpath(".//csvLifeCycleTemplateBegin"):
-                logging.info('   Processing Lifecycle XML(encoding utf-8): ' + self.input_file)
-                self.extract_data_lc(root)
-            elif root.xpath(".//TypeBasedRule"):
-                logging.info('   Processing OIR XML(encoding utf-8): ' + self.input_file)
-                self.extract_data_oir(root)
+            # With the parsed model cache enabled, an unchanged file is not parsed again (the debug mode always normalizes the file)
+            cache = model_cache() if self.use_cache and not self.debug else None
+            cached = cache.get(self.input_file, self.cache_kind(), extractor_version()) if cache is not None else None
+            if cached is not None:
+                self.file_kind, extracted_strings, type_definitions, default_lengths = cached
+                self.extracted_strings = list(extracted_strings)
+                self.type_definitions = list(type_definitions)
+                self.default_lengths = set(default_lengths)
+                logging.info('   Extracted strings read from the parsed model cache: ' + self.input_file)
             else:
-                logging.info('   Unknown XML structure detected (encoding utf-8):' + self.input_file)
-                # Placeholder for future functionality
+                if self.stream:
+                    with RECORDER.phase('stream_extract', self.input_file):
+                        self.transform_stream()
+                else:
+                    self.transform_tree()
+                if cache is not None:
+                    cache.put(self.input_file, self.cache_kind(), (self.file_kind, self.extracted_strings, self.type_definitions, self.default_lengths), extractor_version())
 
             # Write the extracted strings to the output file
-            self.write_output(self.output_file)
+            if write_csv:
+                with RECORDER.phase('write_csv', self.input_file):
+                    self.write_output(self.output_file)
+            return True
         except Exception as e:
             message = f"******************  Transform xml file failed: ******************"
             length = len(message)
@@ -132,226 +180,327 @@ class XMLTransformer:
             logging.exception("   Exception:")
             logging.info("   "+marks)
             logging.info("   "+stars)
+            return False
+
+    def cache_kind(self):
+        # Record kind in the parsed model cache: the extracted strings depend on the enum index resolving EnumeratedValues
+        return 'extracted_strings' if self.enum_index is None else f'extracted_strings-{self.enum_index.fingerprint()}'
+
+    def iter_rows(self):
+        # Rows of the extracted strings as tuples, see rows_from_strings
+        return rows_from_strings(self.extracted_strings)
+
+    def transform_tree(self):
+        # Read and normalize the XML file content as bytes, through an mmap and without decoding it (the read is part of the normalize phase)
+        with RECORDER.phase('normalize', self.input_file):
+            normalized_xml_content = HANDLER_NORMALIZER.normalize_file(self.input_file)
+        # Save the normalized content for debugging
+        if self.debug:
+            self.save_debug_output(normalized_xml_content.decode('utf-8'))
+        # Parse the normalized XML content
+        with RECORDER.phase('parse', self.input_file):
+            root = etree.fromstring(normalized_xml_content)
+        with RECORDER.phase('extract', self.input_file):
+            # Work out the file kind in one pass, then run its extractor over each unit
+            decision = classify_tree(root)
+            if decision is None:
+                logging.info('   Unknown XML structure detected (encoding utf-8):' + self.input_file)
+                # Placeholder for future functionality
+                return self.extracted_strings
+            file_kind = FILE_KINDS[decision.kind]
+            self.file_kind = file_kind.kind
+            self.log_kind_decision(file_kind, decision)
+            self.call_extractor(file_kind.start)
+            for unit in root.iter(file_kind.unit_tag):
+                if file_kind.unit_template is None or unit.findtext('./csvattTemplate') == file_kind.unit_template:
+                    self.call_extractor(file_kind.extract_unit, unit)
+            if file_kind.finish:
+                self.call_extractor(file_kind.finish)
+        return self.extracted_strings
+
+    def call_extractor(self, extractor, *args):
+        # Registered extractors are XMLTransformer method names or plain functions taking the transformer
+        if isinstance(extractor, str):
+            return getattr(self, extractor)(*args)
+        return extractor(self, *args)
+
+    def log_kind_decision(self, file_kind, decision, streaming=False):
+        mode = ', streaming' if streaming else ''
+        logging.info(f'   Processing {file_kind.label} XML(encoding utf-8{mode}): ' + self.input_file)
+        logging.debug(f'   File kind {decision.kind} detected from {decision.signal} (line {decision.line})')
+
+    def expand_rule_specification(self, base_rule):
+        # OIR rules are stored as CDATA text: parse them the way the normalization exposes them in tree mode
+        for rule_spec in base_rule.iter('ruleSpecification'):
+            if len(rule_spec) == 0 and rule_spec.text and rule_spec.text.strip():
+                fragment = etree.fromstring(('<ruleSpecification>' + rule_spec.text + '</ruleSpecification>').encode('utf-8'))
+                rule_spec.text = fragment.text
+                rule_spec.extend(list(fragment))
+
+    def transform_stream(self):
+        # Same CSV content as transform_tree, built with iterparse: each unit (type, enum, lifecycle, rule)
+        # is extracted as soon as its csvEnd* element is read, then cleared, so memory stays bounded.
+        if self.debug:
+            logging.debug('   Normalized XML debug output is not available in streaming mode')
+        self.extracted_strings.clear()
+        decision, better = self.stream_pass()
+        if better is not None:
+            # A signal of a kind with a lower priority came after the decision: as in tree mode that kind wins,
+            # the file is read again and extracted as that kind from its start
+            logging.debug(f'   File kind {decision.kind} (line {decision.line}) replaced by {better.kind} (line {better.line}), file read again')
+            decision, _ = self.stream_pass(better)
+        if decision is None:
+            logging.info('   Unknown XML structure detected (encoding utf-8):' + self.input_file)
+        return self.extracted_strings
+
+    def stream_pass(self, decision=None):
+        # One iterparse pass over the file, extracting the units of the decided kind: (decision, better decision or None)
+        # decision: kind of the file when already known, otherwise worked out from the signals of the handler elements;
+        # once decided, the following elements are still checked for a lower priority signal (better decision), and the
+        # pass then only looks for signals, the caller reading the file again as the better kind
+        file_kind = None
+        better = None
+        pending = []  # units completed before the file kind is known
+        stack = []    # open csvBegin* containers
+
+        def decide(new_decision):
+            nonlocal decision, file_kind
+            decision = new_decision
+            file_kind = FILE_KINDS[decision.kind]
+            self.file_kind = file_kind.kind
+            self.log_kind_decision(file_kind, decision, streaming=True)
+            self.call_extractor(file_kind.start)
+
+        def emit(unit):
+            if file_kind is None:
+                pending.append(unit)
+                return
+            if better is None and unit.tag == file_kind.unit_tag and (file_kind.unit_template is None or unit.findtext('./csvattTemplate') == file_kind.unit_template):
+                self.call_extractor(file_kind.extract_unit, unit)
+            unit.clear()
+
+        if decision is not None:
+            decide(decision)
+        forced = decision is not None
+        top_priority = min(registered.priority for registered in FILE_KINDS.values())
+        for _, element in etree.iterparse(self.input_file, events=('end',)):
+            parent = element.getparent()
+            # Only direct children of the root are flat handler elements; nested fields are already in place
+            if parent is None or parent.getparent() is not None:
+                continue
+            tag = element.tag
+            if tag in CLOSING_TAGS:
+                parent.remove(element)
+                begin_tag = CLOSING_TAGS[tag]
+                while stack and stack[-1].tag != begin_tag:
+                    stack.pop()
+                if not stack:
+                    raise ValueError(f"{tag} without matching {begin_tag}")
+                container = stack.pop()
+                if container.tag in UNIT_TAGS and not any(open_container.tag in UNIT_TAGS for open_container in stack):
+                    container.getparent().remove(container)
+                    emit(container)
+                elif not stack:
+                    parent.remove(container)
+                    container.clear()
+                continue
+            if tag in DROPPED_TAGS:
+                parent.remove(element)
+                continue
+            if file_kind is None:
+                new_decision = classify_stream_element(element, [container.tag for container in stack])
+                if new_decision is not None:
+                    decide(new_decision)
+                    for unit in pending:
+                        emit(unit)
+                    pending.clear()
+            elif not forced and FILE_KINDS[(better or decision).kind].priority > top_priority:
+                new_decision = classify_stream_element(element, [container.tag for container in stack],
+                                                       FILE_KINDS[(better or decision).kind].priority)
+                if new_decision is not None:
+                    better = new_decision
+            if stack:
+                stack[-1].append(element)
+            if tag in CONTAINER_TAGS:
+                stack.append(element)
+            elif tag in UNIT_TAGS and not any(open_container.tag in UNIT_TAGS for open_container in stack):
+                element.getparent().remove(element)
+                emit(element)
+            elif not stack:
+                # Top level element outside any handler block (icon root, content root, ...)
+                parent.remove(element)
+
+        if file_kind is not None and better is None and file_kind.finish:
+            self.call_extractor(file_kind.finish)
+        return decision, better
 
     def extract_data_enum(self, root):
+        self.start_data_enum()
+        for enum_def_view in XPATHS['enum_defs'](root):
+            self.extract_enum_definition(enum_def_view)
+        return self.extracted_strings
+
+    def start_data_enum(self):
         # Clear the list for new data
         self.extracted_strings.clear()
-        for enum_def_view in root.xpath(".//csvBeginEnumDefView"):
-            # Extract the displayName value
-            display = enum_def_view.xpath("./csvPropertyValue[csvname='displayName']/csvvalue/text()")
-            self.extracted_strings.append(display[0])
-            # Extract the name value
-            # name = enum_def_view.findtext('./csvname') or ''
-            name = enum_def_view.xpath("./csvname/text()")[0] or ''
-            self.extracted_strings.append(name)
-            # Prepare the header line for the CSV content
-            header_line = "name~displayName~displayFR"
-            self.extracted_strings.append(header_line)
-            # Extract information for each 'csvBeginEnumMemberView'
-            for enum_member in enum_def_view.xpath(".//csvBeginEnumMemberView"):
-                member_info = self.extract_data_enum_member_info(enum_member)
-                if member_info:
-                    self.extracted_strings.append(member_info)
-            # Add an empty row after processing each enum_def_view
-            self.extracted_strings.append('<EMPTY_ROW>') 
-                   
-        return self.extracted_strings
+
+    def extract_enum_definition(self, enum_def_view):
+        # Extract the displayName value
+        display = property_index(enum_def_view).get('displayName', EMPTY_PROPERTY)[0]
+        self.extracted_strings.append(display)
+        # Extract the name value
+        # name = enum_def_view.findtext('./csvname') or ''
+        name = XPATHS['name'](enum_def_view)[0] or ''
+        self.extracted_strings.append(name)
+        # Prepare the header line for the CSV content
+        header_line = "name~displayName~displayFR"
+        self.extracted_strings.append(header_line)
+        # Extract information for each 'csvBeginEnumMemberView'
+        for enum_member in XPATHS['enum_members'](enum_def_view):
+            member_info = self.extract_data_enum_member_info(enum_member)
+            if member_info:
+                self.extracted_strings.append(member_info)
+        # Add an empty row after processing each enum_def_view
+        self.extracted_strings.append('<EMPTY_ROW>') 
 
     def extract_data_enum_member_info(self, enum_member):
-        member_name = enum_member.xpath("./csvname/text()")[0]
-        display_name = enum_member.xpath("./csvPropertyValue[csvname='displayName']/csvvalue/text()")
-        display_name = display_name[0] if display_name else '' 
-        display_fr = enum_member.xpath("./csvPropertyValue[csvname='displayName']/csvlocale_fr/text()")
-        display_fr = display_fr[0] if display_fr else '' 
-        selectable = enum_member.xpath("./csvPropertyValue[csvname='selectable'][1]/csvvalue/text()")
-        if not display_name or not selectable or selectable[0].lower() == 'false':
+        member_name = XPATHS['name'](enum_member)[0]
+        properties = property_index(enum_member)
+        display_name, display_fr = properties.get('displayName', EMPTY_PROPERTY)
+        selectable = properties.get('selectable', EMPTY_PROPERTY)[0]
+        if not display_name or not selectable or selectable.lower() == 'false':
             return None
         
         return f"{member_name}~{display_name}~{display_fr}"
 
     def extract_data_type(self, root):
-        # Clear the list for new data
-        self.extracted_strings.clear()
-        # Prepare the header line for the CSV content
-        header_line = "name~display~displayFR~iba~required~type~unit~length~single~upperCase~regularExpr~defaultValue~legalValues~EnumeratedValues"
-
+        self.start_data_type()
         # Iterate over each csvBeginTypeDefView element
-        for type_def_view in root.xpath(".//csvBeginTypeDefView[csvattTemplate='LWCTYPE']"):
-
-            # Extract the type name
-            typeName = type_def_view.xpath("./csvname/text()")[0] or ''
-            if typeName:
-                self.extracted_strings.append(typeName)
-            else:
-                self.extracted_strings.append('ERROR_EXTRACTING_TYPE_NAME')
-            # Extract the type display name
-            typeDisplayName = type_def_view.xpath("./csvPropertyValue[csvname='displayName']/csvvalue/text()")[0] or ''
-            if typeDisplayName:
-                self.extracted_strings.append(typeDisplayName)
-            else:
-                self.extracted_strings.append('ERROR_EXTRACTING_TYPE_DISPLAY_NAME')
+        for type_def_view in XPATHS['type_defs_lwctype'](root):
+            self.extract_type_definition(type_def_view)
+        self.end_data_type()
+        return self.extracted_strings
 
-            self.extracted_strings.append(header_line)
-            instantiable = type_def_view.xpath("./csvPropertyValue[csvname='instantiable']/csvvalue/text()")
-            if instantiable and instantiable[0].lower() == 'true':
-                # Iterate over each csvBeginAttributeDefView element within csvBeginTypeDefView
-                for attr_def_view in type_def_view.xpath("./csvBeginAttributeDefView"):
-                    self.extracted_strings.extend(self.extract_attribute_definitions(attr_def_view, '', '', 0, instantiable, '', '', '', '', '', mode='Types'))
+    def start_data_type(self):
+        # Clear the list for new data
+        self.extracted_strings.clear()
+        self.type_definitions = []
+        self.default_lengths = set()
 
-            # Add an empty row after processing each type_def_view
-            self.extracted_strings.append('<EMPTY_ROW>') 
+    def extract_type_definition(self, type_def_view):
+        # Prepare the header line for the CSV content
+        header_line = TYPE_HEADER
+        if self.enum_index is not None:
+            header_line += '~' + ENUM_MEMBERS_HEADER
+
+        # Extract the type name
+        typeName = XPATHS['name'](type_def_view)[0] or ''
+        if typeName:
+            self.extracted_strings.append(typeName)
+        else:
+            self.extracted_strings.append('ERROR_EXTRACTING_TYPE_NAME')
+        # Extract the type display name
+        properties = property_index(type_def_view)
+        typeDisplayName = properties.get('displayName', EMPTY_PROPERTY)[0]
+        if typeDisplayName:
+            self.extracted_strings.append(typeDisplayName)
+        else:
+            self.extracted_strings.append('ERROR_EXTRACTING_TYPE_DISPLAY_NAME')
 
+        self.extracted_strings.append(header_line)
+        instantiable = properties.get('instantiable', EMPTY_PROPERTY)[0]
+        # Kept even when end_data_type drops the rows (type without attribute): the data model store lists every type
+        self.type_definitions.append((typeName, typeDisplayName, instantiable))
+        if instantiable and instantiable.lower() == 'true':
+            # Iterate over each csvBeginAttributeDefView element within csvBeginTypeDefView
+            for attr_def_view in XPATHS['attribute_defs'](type_def_view):
+                self.extracted_strings.extend(self.extract_attribute_definitions(attr_def_view, typeName, '', 0, instantiable, '', '', '', '', '', mode='Types'))
+
+        # Add an empty row after processing each type_def_view
+        self.extracted_strings.append('<EMPTY_ROW>') 
+
+    def end_data_type(self):
         # Remove all content if no attributes found to prevent any csv file with empty value
         if len(self.extracted_strings) == 4 and self.extracted_strings[3]== '<EMPTY_ROW>' :
             self.extracted_strings.clear()
 
+    def extract_data_classification(self, root):
+        self.start_data_classification()
+        # Iterate over each csvBeginTypeDefView element
+        for type_def_view in XPATHS['type_defs_lwcstruct'](root):
+            self.extract_classification_node(type_def_view)
+        self.end_data_classification()
         return self.extracted_strings
 
-    def extract_data_classification(self, root):
+    def start_data_classification(self):
         # Clear the list for new data
         self.extracted_strings.clear()
+        self.default_lengths = set()
 
         # Prepare the header line for the CSV content
-        header_line = "Family~depth~classifType~parentClassifType~instantiable~displayClassifType~displayClassifTypeFR~descriptionType~descriptionTypeFR~attributeName~attributeDisplayName~attributeDisplayNameFR~iba~required~type~unit~length~single~upperCase~regularExpr~defaultValue~legalValues~EnumeratedValues"
-        self.extracted_strings.append(header_line)
+        if self.enum_index is not None:
+            self.extracted_strings.append(CLASSIFICATION_HEADER + '~' + ENUM_MEMBERS_HEADER)
+        else:
+            self.extracted_strings.append(CLASSIFICATION_HEADER)
+
+        # Classification nodes in file order, rows are built once all nodes are read
+        self.classification_nodes = []
+
+    def extract_classification_node(self, type_def_view):
+        typeObject = type_def_view.findtext('./csvname') or ''
+        parentType = type_def_view.findtext('./csvtypeParent') or ''
+        properties = property_index(type_def_view)
+        instantiable = properties.get('instantiable', EMPTY_PROPERTY)[0]
+        if instantiable and instantiable.lower() == 'true':
+            instantiable = 'Yes'
+        else:
+            instantiable = 'No'
+        displayType, displayTypeFR = properties.get('displayName', EMPTY_PROPERTY)
+        descriptionType, descriptionTypeFR = properties.get('description', EMPTY_PROPERTY)
 
-        # keep track of typeObject and its depth
-        type_depth_map = {}
-        type_attributes_map = {}  # Map to store the attributes of each type
+        # Extract current attributes
+        own_attributes = [self.extract_attribute_record(attr_def_view) for attr_def_view in XPATHS['attribute_defs'](type_def_view)]
 
-        # Calculate Family
-        Family = "ROOT"
-        
-        # Iterate over each csvBeginTypeDefView element
-        for type_def_view in root.xpath(".//csvBeginTypeDefView[csvattTemplate='LWCSTRUCT']"):
-            typeObject = parentType = displayType = displayTypeFR = descriptionType = descriptionTypeFR = ''
-            instantiable = 'No'
-            name = display = displayFR = iba = datatype = length = unit = defaultValue = list_value = enum_members = regularExpr = ''
-            required = single = upperCase = instantiable = ''
-
-            typeObject = type_def_view.findtext('./csvname') or ''
-            parentType = type_def_view.findtext('./csvtypeParent') or ''
-            instantiable = type_def_view.xpath("./csvPropertyValue[csvname='instantiable']/csvvalue/text()") or ''
-            if instantiable and instantiable[0].lower() == 'true':
-                instantiable = 'Yes'
-            else:
-                instantiable = 'No'
-            displayType = type_def_view.xpath("./csvPropertyValue[csvname='displayName']/csvvalue/text()")
-            displayType = displayType[0] if displayType else ''
-
-            displayTypeFR = type_def_view.xpath("./csvPropertyValue[csvname='displayName']/csvlocale_fr/text()")
-            displayTypeFR = displayTypeFR[0] if displayTypeFR else ''
-
-
-            descriptionType = type_def_view.xpath("./csvPropertyValue[csvname='description']/csvvalue/text()")
-            descriptionType = descriptionType[0] if descriptionType else ''
-
-            descriptionTypeFR = type_def_view.xpath("./csvPropertyValue[csvname='description']/csvlocale_fr/text()")
-            descriptionTypeFR = descriptionTypeFR[0] if descriptionTypeFR else ''
- 
-            # Calculate depth
-            depth = 0
-            current_parent = parentType
-            while current_parent:
-                depth += 1
-                current_parent = type_depth_map.get(current_parent, None)
-
-            if str(depth) == "2":
-                Family = typeObject
-
-            type_depth_map[typeObject] = parentType  # Map current type to its parent
-
-            # Prepare the type line
-            type_line = f"{Family}~{depth}~{typeObject}~{parentType}~{instantiable}~{displayType}~{displayTypeFR}~{descriptionType}~{descriptionTypeFR}~{name}~{display}~{displayFR}~{iba}~{required}~{datatype}~{unit}~{length}~{single}~{upperCase}~{regularExpr}~{defaultValue}~{list_value}~{enum_members}"
-
-            # Extract current attributes
-            current_attributes = []
-            for attr_def_view in type_def_view.xpath("./csvBeginAttributeDefView"):
-                current_attributes.extend(self.extract_attribute_definitions(attr_def_view, typeObject, parentType, depth, Family, instantiable, displayType, displayTypeFR, descriptionType, descriptionTypeFR, 'Classification'))
-
-            # Update and append ancestor attributes with current node's depth and other values
-            ancestor_attributes = []
-            if parentType in type_attributes_map:
-                for attr in type_attributes_map[parentType]:
-                    updated_attr = attr.split("~")
-                    # Update depth and keep current node's type, parentType, instantiable, and displayType, and displayTypeFR, and Family
-                    updated_attr[0] = Family
-                    updated_attr[1] = str(depth)
-                    updated_attr[2] = typeObject
-                    updated_attr[3] = parentType
-                    updated_attr[4] = instantiable
-                    updated_attr[5] = displayType
-                    updated_attr[6] = displayTypeFR
-                    updated_attr[7] = descriptionType
-                    updated_attr[8] = descriptionTypeFR
-                    ancestor_attributes.append("~".join(updated_attr))
-
-            # Combine the ancestor and current attributes
-            combined_attributes = ancestor_attributes + current_attributes
-            # Sort the list based on the attributeName: 10th position (index 9)
-            combined_attributes.sort(key=lambda x: x.split("~")[9])
-
-            # Remove duplicates for entire row while maintaining order - this my not be necessary at this point
-            unique_attributes = list(OrderedDict.fromkeys(combined_attributes))
-
-            # Apply merging to get unique properties definition
-            # Preserve explicit definitions when inherited properties are overridden from ancestors
-            merged_and_unique_attributes = self.merge_attributes_with_override(header_line,unique_attributes)
-            # Sort the list based on the attributeName: 10th position (index 9)
-            merged_and_unique_attributes.sort(key=lambda x: x.split("~")[9])
-
-            # Append the sorted and unique attributes, starting with the type line
-            self.extracted_strings.append(type_line)
-            #self.extracted_strings.extend(unique_attributes)
-            self.extracted_strings.extend(merged_and_unique_attributes)
-
-            # Store the current and ancestor attributes for future use
-            #type_attributes_map[typeObject] = unique_attributes
-            type_attributes_map[typeObject] = merged_and_unique_attributes
-
-        # else:
-        #     logging.info('Type non instantiable for : '+self.output_file+' - File not created !')
+        self.classification_nodes.append(ClassificationNode(typeObject, parentType, instantiable, displayType, displayTypeFR,
+                                                            descriptionType, descriptionTypeFR, own_attributes))
+
+    def end_data_classification(self):
+        # Resolve depth, Family and inherited attributes of all nodes, whatever their order in the file
+        hierarchy = ClassificationHierarchy(self.classification_nodes)
+        resolve_members = self.resolve_enum_members if self.enum_index is not None else None
+        for node in hierarchy.resolve_all():
+            # Append the type line then the attributes sorted by attributeName
+            self.extracted_strings.extend(node.rows(resolve_members))
+            self.default_lengths.update((node.typeObject, attribute.name) for attribute in node.attributes if attribute.default_length)
 
+        self.classification_nodes = []
         # remove if only header to prevent csv file with empty value
         if len(self.extracted_strings) == 1:
             self.extracted_strings.clear()
-        return self.extracted_strings
-
-    def merge_attributes_with_override(self,header_line,unique_attributes):
-        # Define which columns are boolean; indexes based on zero-based indexing after 'attributeName'
-        boolean_columns = [index for index, column_name in enumerate(header_line.split("~")) if column_name in {"required", "single", "upperCase"}]
-        
-        # Group attributes by their identifying key (first 10 columns)
-        attribute_groups = {}
-        for attribute in unique_attributes:
-            attr_parts = attribute.split("~")
-            key = tuple(attr_parts[:10])  # Key based on first 10 fields Family,depth,classifType,parentClassifType,instantiable,displayClassifType,displayClassifTypeFR,description,descriptionTypeFR,attributeName
-            if key not in attribute_groups:
-                attribute_groups[key] = []
-            attribute_groups[key].append(attr_parts)
-        
-        merged_attributes = []
-        for key, group in attribute_groups.items():
-            merged_row = group[0]  # Start with the first row in the group
-            for attr_parts in group[1:]:
-                for i, value in enumerate(attr_parts):
-                    if i >= 10:  # Only merge attributes after the 10th column
-                        if i in boolean_columns:
-                            # Apply Merge Rule for boolean values: if any "Yes" value exists among duplicates, the merged result will also be "Yes"
-                            if value == "Yes" or merged_row[i] == "Yes":
-                                merged_row[i] = "Yes"
-                        else:
-                            # Apply Merge Rule for non-boolean values: the first non-empty value encountered is kept
-                            if value:  # If the current value is non-empty, check if it should override
-                                merged_row[i] = value if merged_row[i] == "" else merged_row[i]
-            merged_attributes.append("~".join(merged_row))
-        
-        return merged_attributes
 
     def extract_attribute_definitions(self, attr_def_view, typeObject, parentType, depth, Family, instantiable, displayType, displayTypeFR, descriptionType, descriptionTypeFR, mode):
+            attributes = []
+            attribute = self.extract_attribute_record(attr_def_view)
+            if attribute.default_length:
+                self.default_lengths.add((typeObject, attribute.name))
+            # Append the extracted attributes as a new line
+            if mode == 'Classification':
+                attributes.append(f"{Family}~{depth}~{typeObject}~{parentType}~{instantiable}~{displayType}~{displayTypeFR}~{descriptionType}~{descriptionTypeFR}~{attribute.row()}")
+            elif mode == 'Types':
+                if self.enum_index is not None:
+                    attributes.append(attribute.row() + '~' + self.resolve_enum_members(attribute))
+                else:
+                    attributes.append(attribute.row())
+
+            return attributes
+
+    def resolve_enum_members(self, attribute):
+        # Member names of the global enumeration of an attribute, from the shared enum index
+        return self.enum_index.resolved_members(attribute.enum_members)
+
+    def extract_attribute_record(self, attr_def_view):
             name = display = displayFR = class_value = datatype = length = unit = defaultValue = list_value = enum_members = regularExpr = ''
             required = single = upperCase = iba = 'No'
-            attributes = []
             # Process for name, class, defaultValue, dataType and unit
             if attr_def_view.findtext('./csvIBA'):
                 iba = 'Yes'
@@ -359,58 +508,25 @@ class XMLTransformer:
 
             # Process for required, single, upperCase, length, unit
 
-            display = attr_def_view.xpath("./csvPropertyValue[csvname='displayName']/csvvalue/text()")
-            display = display[0] if display else ''
-
-            displayFR = attr_def_view.xpath("./csvPropertyValue[csvname='displayName']/csvlocale_fr/text()")
-            displayFR = displayFR[0] if displayFR else ''
+            display, displayFR = property_index(attr_def_view).get('displayName', EMPTY_PROPERTY)
 
-            class_value = attr_def_view.findtext('./csvattDefClass') or ''
-            class_value = class_value.replace('com.ptc.core.lwc.server.', '')
-
-            defaultValue = attr_def_view.findtext('./csvdefaults') or ''
-            defaultValue = defaultValue.replace('DATA|java.lang.String|', '')
-            defaultValue = defaultValue.replace('DATA|java.lang.long|', '')
-            defaultValue = defaultValue.replace('DATA|java.lang.Boolean|', '')
-
-            datatype = attr_def_view.findtext('./csvdatatype') or ''
-            datatype = datatype.replace('java.lang.', '')
-            datatype = datatype.replace('java.sql.', '')
-            datatype = datatype.replace('wt.units.', '')
-            datatype = datatype.replace('com.ptc.core.meta.common.', '')
-
-            unit = attr_def_view.findtext('./csvQoM') or ''
+            # Raw values are cleaned with the rules of value_rules.json (memoized per distinct raw value)
+            class_value = VALUE_RULES['attDefClass'](attr_def_view.findtext('./csvattDefClass') or '')
+            defaultValue = VALUE_RULES['defaultValue'](attr_def_view.findtext('./csvdefaults') or '')
+            datatype = VALUE_RULES['datatype'](attr_def_view.findtext('./csvdatatype') or '')
             # Add displayed unit - maybe be different from database units - TBC
-            unit = unit.replace('Electrical Capacitance', 'Electrical Capacitance (F)')
-            unit = unit.replace('Electrical Current', 'Electrical Current (A)')
-            unit = unit.replace('Mass', 'Mass (Kg)')
-            unit = unit.replace('Temperature', 'Temperature (degC)')
-            unit = unit.replace('Luminous Flux', 'Luminous Flux (lm)')
-            unit = unit.replace('Electrical Potential', 'Electrical Potential (V)')
-            unit = unit.replace('Frequency', 'Frequency (Hz)')
-            unit = unit.replace('Electrical Inductance', 'Electrical Inductance (H)')
-            unit = unit.replace('Luminous Intensity', 'Luminous Intensity (cd)')
-            unit = unit.replace('Pressure', 'Pressure (kPa)')
-            unit = unit.replace('Length', 'Length (mm)')
-            unit = unit.replace('Power', 'Power (W)')
-            unit = unit.replace('Electrical Resistance', 'Electrical Resistance (ohm)')
-            unit = unit.replace('Area', 'Area (m**2)')
-            unit = unit.replace('Time', 'Time (s)')
+            unit = VALUE_RULES['unit'](attr_def_view.findtext('./csvQoM') or '')
 
             # Process constraints within the attribute
-            for constraint_def_view in attr_def_view.xpath("./csvBeginConstraintDefView"):
+            for constraint_def_view in XPATHS['constraint_defs'](attr_def_view):
                 rule_classname = constraint_def_view.findtext('csvruleClassname')
                 if 'ValueRequiredConstraint' in rule_classname:
                     required = 'Yes'
                 if 'StringLengthConstraint' in rule_classname:
-                    length = constraint_def_view.findtext('csvruleData') or ''
-                    length = length.replace('DATA|com.ptc.core.meta.common.AnalogSet|[DATA|java.lang.Long|', '')
-                    length = length.replace(r' \, DATA|java.lang.Long|', '-')
-                    length = length.replace(']', '')
+                    length = VALUE_RULES['length'](constraint_def_view.findtext('csvruleData') or '')
 
                 if 'RegularExpressionConstraint' in rule_classname:
-                    regularExpr = constraint_def_view.findtext('csvruleData') or ''
-                    regularExpr = regularExpr.replace('DATA|com.ptc.core.meta.common.RegularExpressionSet|DATA|java.lang.Boolean|false , DATA|java.lang.String|', '')
+                    regularExpr = VALUE_RULES['regularExpr'](constraint_def_view.findtext('csvruleData') or '')
                 if 'SingleValuedConstraint' in rule_classname:
                     single = 'Yes'
                 if 'UpperCaseConstraint' in rule_classname:
@@ -421,11 +537,10 @@ class XMLTransformer:
                     if list_value:
                         # classification node value that is set as a constraint
                         # list_value = list_value + ': ' + (constraint_def_view.findtext('csvruleData') or '')
-                        list_value = constraint_def_view.findtext('csvruleData') or ''
-                        list_value = list_value.replace('DATA|com.ptc.core.meta.common.DiscreteSet|DATA|java.lang.Boolean|false , DATA|java.lang.String|com.ptc.core.lwc.common.dynamicEnum.provider.ClassificationEnumerationInfoProvider|ns=com.ptc.csm.default_clf_namespace:nn=', '')
+                        list_value = VALUE_RULES['classificationValue'](constraint_def_view.findtext('csvruleData') or '')
                     else:
                         # Try to get csvname value
-                        enum_def = constraint_def_view.xpath("./csvBeginEnumDefView[1]/csvname/text()")
+                        enum_def = XPATHS['first_enum_def_name'](constraint_def_view)
                         if enum_def and enum_def[0]:
                             enum_members = enum_def[0] # Name of Global Enum without values being overriden
                         else:
@@ -433,90 +548,95 @@ class XMLTransformer:
                             list_value = constraint_def_view.findtext('csvruleData') or ''
                             if list_value:
                                 #list_value = 'LVL: ' + list_value
-                                list_value = list_value.replace('DATA|com.ptc.core.meta.common.DiscreteSet|DATA|java.lang.Boolean|false , ', '')
-                                list_value = list_value.replace('DATA|java.lang.String|', '')
-                                list_value = list_value.replace('DATA|java.lang.Long|', '')
-                                list_value = list_value.replace(' , ', '|')
+                                list_value = VALUE_RULES['legalValues'](list_value)
                             else:
                                 # Fallback to csvmaster for overriden Global Enums
-                                csvmaster_value = constraint_def_view.xpath("./csvBeginEnumDefView[1]/csvmaster/text()")
+                                csvmaster_value = XPATHS['first_enum_def_master'](constraint_def_view)
                                 if csvmaster_value:
                                     enum_members = csvmaster_value[0] # Name of Global Enum with values being overriden
                                     enum_members = enum_members + ': ' + self.extract_data_type_member_names(constraint_def_view) # List of values with selectable=yes
 
             # Replace length with default value for String if empty (information not available in XML)
-            if length == '' and datatype == 'String':
+            default_length = length == '' and datatype == 'String'
+            if default_length:
                 length = '500'
             elif length.startswith('0-'):
                 length = length.replace('0-', '', 1) # Update format of value 
 
-            # Append the extracted attributes as a new line
-            if mode == 'Classification':
-                attributes.append(f"{Family}~{depth}~{typeObject}~{parentType}~{instantiable}~{displayType}~{displayTypeFR}~{descriptionType}~{descriptionTypeFR}~{name}~{display}~{displayFR}~{iba}~{required}~{datatype}~{unit}~{length}~{single}~{upperCase}~{regularExpr}~{defaultValue}~{list_value}~{enum_members}")
-            elif mode == 'Types':
-                attributes.append(f"{name}~{display}~{displayFR}~{iba}~{required}~{datatype}~{unit}~{length}~{single}~{upperCase}~{regularExpr}~{defaultValue}~{list_value}~{enum_members}")
-
-            return attributes
+            return AttributeDefinition(name, display, displayFR, iba, required, datatype, unit, length, single, upperCase,
+                                       regularExpr, defaultValue, list_value, enum_members, default_length)
 
     def extract_data_type_member_names(self, constraint_def_view):
         member_names = []
         # Start from the constraint definition view and iterate through following elements
-        for enum_def_view in constraint_def_view.xpath("./csvBeginEnumDefView[1]"):
-            for enum_member in enum_def_view.xpath(".//csvBeginEnumMemberView"):
-                member_name = enum_member.xpath("./csvname/text()")[0]
-                selectable = enum_member.xpath("./csvPropertyValue[csvname='selectable'][1]/csvvalue/text()")
-                if member_name and selectable[0].lower() == 'true':
+        for enum_def_view in XPATHS['first_enum_def'](constraint_def_view):
+            for enum_member in XPATHS['enum_members'](enum_def_view):
+                member_name = XPATHS['name'](enum_member)[0]
+                selectable = property_index(enum_member).get('selectable', EMPTY_PROPERTY)[0]
+                if member_name and selectable.lower() == 'true':
                     member_names.append(member_name)
         return '|'.join(member_names)
 
     def extract_data_lc(self, root):
+        self.start_data_lc()
+        for lc_template in XPATHS['lc_templates'](root):
+            self.extract_lc_template(lc_template)
+        return self.extracted_strings
+
+    def start_data_lc(self):
         # Clear the list for new data
         self.extracted_strings.clear()
-        for lc_template in root.xpath(".//csvLifeCycleTemplateBegin"):
-            # Extract the displayName value
-            display = lc_template.xpath("./csvname/text()")[0] or ''
-            self.extracted_strings.append(display)
-            # Prepare the header line for the CSV content
-            header_line = "name~displayName"
-            self.extracted_strings.append(header_line)
-            # Extract information for each 'csvPhaseTemplateBegin'
-            for phase in lc_template.xpath(".//csvPhaseTemplateBegin"):
-                phase_name = phase.xpath("./csvname/text()")
-                phase_name = phase_name[0] if phase_name else ''
-                phase_state = phase.xpath("./csvphaseState/text()")
-                phase_state = phase_state[0] if phase_state else ''
-                self.extracted_strings.append(f"{phase_state}~{phase_name}")
-            # Add an empty row after processing each lc_template
-            self.extracted_strings.append('<EMPTY_ROW>') 
-                   
-        return self.extracted_strings
+
+    def extract_lc_template(self, lc_template):
+        # Extract the displayName value
+        display = XPATHS['name'](lc_template)[0] or ''
+        self.extracted_strings.append(display)
+        # Prepare the header line for the CSV content
+        header_line = "name~displayName"
+        self.extracted_strings.append(header_line)
+        # Extract information for each 'csvPhaseTemplateBegin'
+        for phase in XPATHS['phase_templates'](lc_template):
+            phase_name = XPATHS['name'](phase)
+            phase_name = phase_name[0] if phase_name else ''
+            phase_state = XPATHS['phase_state'](phase)
+            phase_state = phase_state[0] if phase_state else ''
+            self.extracted_strings.append(f"{phase_state}~{phase_name}")
+        # Add an empty row after processing each lc_template
+        self.extracted_strings.append('<EMPTY_ROW>') 
 
     def extract_data_oir(self, root):
+        self.start_data_oir()
+        for base_rule in XPATHS['base_rules'](root):
+            self.extract_oir_rule(base_rule)
+        return self.extracted_strings
+
+    def start_data_oir(self):
         # Clear the list for new data
         self.extracted_strings.clear()
-        for base_rule in root.xpath(".//TypeBasedRule"):
-            # Extract the displayName value
-            rule_name = base_rule.xpath(".//ruleName/text()")[0] or ''
-            self.extracted_strings.append(rule_name)
-            # Prepare the header line for the CSV content
-            header_line = "objType~folder.id~lc.id~versioning~numbering"
-            self.extracted_strings.append(header_line)
-            # Extract information for each 'AttributeValues'
-            for attr_values in base_rule.xpath(".//AttributeValues"):
-                obj_type = attr_values.xpath("./@objType")[0] or ''
-                folder_id = attr_values.xpath('.//AttrValue[@id="folder.id"]/Arg/text()')
-                folder_id = folder_id[0] if folder_id else ''
-                lc_id = attr_values.xpath('.//AttrValue[@id="lifeCycle.id"]/Arg/text()')
-                lc_id = lc_id[0] if lc_id else ''
-                versioning = attr_values.xpath('.//AttrValue[@id="MBA|versionInfo"]/Arg/text()')
-                versioning = versioning[0] if versioning else ''
-                args_numbering = attr_values.xpath('.//AttrValue[@id="number"]/Arg/text()')
-                numbering = ''.join(args_numbering) if args_numbering else ''
-                self.extracted_strings.append(f"{obj_type}~{folder_id}~{lc_id}~{versioning}~{numbering}")
-            # Add an empty row after processing each base_rule
-            self.extracted_strings.append('<EMPTY_ROW>') 
-                   
-        return self.extracted_strings
+
+    def extract_oir_rule(self, base_rule):
+        # Streaming mode only: rule specifications are still CDATA text
+        self.expand_rule_specification(base_rule)
+        # Extract the displayName value
+        rule_name = XPATHS['rule_name'](base_rule)[0] or ''
+        self.extracted_strings.append(rule_name)
+        # Prepare the header line for the CSV content
+        header_line = "objType~folder.id~lc.id~versioning~numbering"
+        self.extracted_strings.append(header_line)
+        # Extract information for each 'AttributeValues'
+        for attr_values in XPATHS['attribute_values'](base_rule):
+            obj_type = XPATHS['obj_type'](attr_values)[0] or ''
+            folder_id = XPATHS['attr_value_args'](attr_values, id="folder.id")
+            folder_id = folder_id[0] if folder_id else ''
+            lc_id = XPATHS['attr_value_args'](attr_values, id="lifeCycle.id")
+            lc_id = lc_id[0] if lc_id else ''
+            versioning = XPATHS['attr_value_args'](attr_values, id="MBA|versionInfo")
+            versioning = versioning[0] if versioning else ''
+            args_numbering = XPATHS['attr_value_args'](attr_values, id="number")
+            numbering = ''.join(args_numbering) if args_numbering else ''
+            self.extracted_strings.append(f"{obj_type}~{folder_id}~{lc_id}~{versioning}~{numbering}")
+        # Add an empty row after processing each base_rule
+        self.extracted_strings.append('<EMPTY_ROW>') 
 
     def write_output(self,output_csv_file):
         if self.extracted_strings:
@@ -528,16 +648,41 @@ class XMLTransformer:
         else:
             logging.info(f"   CSV File not created, no data found for {self.input_file}")
 
+# File kinds handled by XMLTransformer, in detection order. New kinds plug in with register_file_kind.
+register_file_kind('Types', 'Types', 10, 'csvBeginTypeDefView', 'csvBeginTypeDefView', 'start_data_type', 'extract_type_definition', 'end_data_type',
+                   signal_template='LWCTYPE', signal_container='csvBeginTypes', unit_template='LWCTYPE')
+register_file_kind('Classification', 'Classification', 20, 'csvBeginTypeDefView', 'csvBeginTypeDefView', 'start_data_classification', 'extract_classification_node', 'end_data_classification',
+                   signal_template='LWCSTRUCT', signal_container='csvBeginTypes', unit_template='LWCSTRUCT')
+register_file_kind('Enum', 'Global Enumeration', 30, 'csvBeginEnumMemberView', 'csvBeginEnumDefView', 'start_data_enum', 'extract_enum_definition')
+register_file_kind('Lifecycle', 'Lifecycle', 40, 'csvLifeCycleTemplateBegin', 'csvLifeCycleTemplateBegin', 'start_data_lc', 'extract_lc_template')
+register_file_kind('OIR', 'OIR', 50, 'TypeBasedRule', 'TypeBasedRule', 'start_data_oir', 'extract_oir_rule')
+
 def run():
     parser = argparse.ArgumentParser(description="Transform an XML file to a text file based on specific rules.")
     parser.add_argument('-i', '--input', type=str, required=True, help="Input XML file path")
     parser.add_argument('-o', '--output', type=str, required=True, help="Output folder")
     parser.add_argument('--debug', action='store_true', help="Enable debug mode to output the normalized XML file")
+    parser.add_argument('--stream', action='store_true', help="Optional: stream the XML file with iterparse (bounded memory for large exports)")
+    parser.add_argument('--timings', type=str, help="Optional: write the duration of each phase to this report file (.json or .csv)")
+    parser.add_argument('--timings_memory', action='store_true', help="Optional: also record the peak memory of each phase (tracemalloc, slower)")
+    parser.add_argument('--enum_dir', nargs='+', help="Optional: folder(s) of global enumeration XML files; adds the resolved enum members of each attribute to Types and Classification rows")
+    parser.add_argument('--model_cache', type=str, help="Optional: parsed model cache folder shared with the enum scripts; an unchanged XML file is not parsed again (default: $WT_MODEL_CACHE)")
     args = parser.parse_args()
 
     try:
-        transformer = XMLTransformer(args.input, args.output, args.debug)
+        if args.model_cache:
+            configure_model_cache(args.model_cache)
+        if args.timings:
+            RECORDER.configure(True, args.timings_memory)
+        enum_index = None
+        if args.enum_dir:
+            from enum_index import EnumIndex  # enum_index imports this module
+            enum_index = EnumIndex(args.enum_dir)
+        transformer = XMLTransformer(args.input, args.output, args.debug, args.stream, enum_index)
         transformer.transform()
+        if args.timings:
+            RECORDER.log_totals()
+            RECORDER.write_report(args.timings)
     except Exception as e:
         message = f"******************  An error occurred while transforming {args.input}: ******************"
         length = len(message)
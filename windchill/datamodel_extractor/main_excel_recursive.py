@@ -8,37 +8,173 @@ Description: See README. Intended to be used to transform Windchill configuratio
 import os
 import argparse
 import logging
-from extract_excel_processor import ExcelFileProcessor
+import time
+from concurrent.futures import ProcessPoolExecutor
+from extract_excel_processor import ExcelFileProcessor, report_phase_timings, init_worker, worker_enum_index
+from enum_index import EnumIndex, shared_enum_index
+from phase_timings import RECORDER
+from parsed_model_cache import configure_model_cache
+
+def find_xml_directories(root_input_dir):
+    # Directories holding at least one XML file: the root first, then its subdirectories in the order they were processed one by one
+    directories = [root_input_dir]
+    for root, dirs, _ in os.walk(root_input_dir):
+        for dir in dirs:
+            directories.append(os.path.join(root, dir))
+    return [directory for directory in directories if any(file.endswith(".xml") for file in os.listdir(directory))]
+
+def snapshot_xml_files(root_input_dir):
+    # {XML file path: (mtime_ns, size)} of the input tree, compared between two polls of the watch mode
+    snapshot = {}
+    for root, _, files in os.walk(root_input_dir):
+        for file in files:
+            if file.endswith(".xml"):
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # removed since the directory was listed
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def split_worker_budget(jobs, directory_count):
+    # One global budget of worker processes: directories are built in parallel first, the workers left are shared by the files of each directory
+    # Returns (number of directories built at once, number of file workers of each directory)
+    directory_workers = max(1, min(jobs, directory_count))
+    return directory_workers, max(1, jobs // directory_workers)
+
+def build_directory_workbook(input_dir, output_dir, keep_csv=False, stream=False, jobs=1, write_only=False, force=False, phase_settings=None, enum_index=None):
+    # Build the workbook of one directory, in a worker process when directories are built in parallel
+    # Returns (input directory, status, XML file count, CSV lines, seconds) and the phase records of this workbook
+    # (lines of the extracted strings: block name and header lines included, not only the data rows)
+    enum_index = worker_enum_index(enum_index)
+    if phase_settings is not None and phase_settings != RECORDER.settings():
+        RECORDER.configure(*phase_settings)
+    mark = RECORDER.mark()
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    processor = ExcelFileProcessor(input_dir, output_dir, keep_csv, stream, jobs, write_only, force, enum_index)
+    with RECORDER.phase('workbook', input_dir):
+        processor.process_excel_file()
+    xml_files = processor.list_xml_files()
+    if processor.up_to_date:
+        status = 'up to date'
+        lines = sum(entry['lines'] for entry in processor.manifest.entries.values())
+    else:
+        status = 'built' if os.path.exists(processor.output_file) else 'no data'
+        lines = sum(timing[3] for timing in processor.file_timings)
+    return (input_dir, status, len(xml_files), lines, time.perf_counter() - start), RECORDER.records_since(mark)
 
 class RecursiveExcelFileCreator:
-    def __init__(self, root_input_dir, root_output_dir, keep_csv=False):
+    def __init__(self, root_input_dir, root_output_dir, keep_csv=False, stream=False, jobs=1, write_only=False, force=False, enum_dirs=None):
         self.root_input_dir = root_input_dir
         self.root_output_dir = root_output_dir
         self.keep_csv = keep_csv
+        self.stream = stream
+        self.jobs = jobs
+        self.write_only = write_only
+        self.force = force
+        self.enum_dirs = [os.path.abspath(enum_dir) for enum_dir in enum_dirs or []]
+        self.enum_index = shared_enum_index(enum_dirs)  # one enum index for the whole tree, loaded on the first enum reference
+        self.summaries = []  # (input directory, status, XML file count, CSV lines, seconds) of each workbook, in directory order
         logging.info('   ------------------------------BEGIN RECURSIVE LOOP----------------------------------')
 
     def __del__(self):
         logging.info('   ------------------------------END   RECURSIVE LOOP---------------------------------')
 
-    def process_directory(self, input_dir, output_dir):
-        # Ensure output directory exists
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-
-        # Process the files in the current directory
-        processor = ExcelFileProcessor(input_dir, output_dir, self.keep_csv)
-        processor.process_excel_file()
+    def process_directory(self, input_dir, output_dir, jobs=None):
+        # Process the files in one directory, in this process
+        summary, _ = build_directory_workbook(input_dir, output_dir, self.keep_csv, self.stream, self.jobs if jobs is None else jobs, self.write_only, self.force,
+                                              enum_index=self.enum_index)
+        return summary
 
     def process_all_subdirectories(self):
-        # Process files directly in the root input directory first
-        self.process_directory(self.root_input_dir, self.root_output_dir)
+        # Find the directories holding XML files first (root directory first), directories without XML file get no processor and no workbook
+        start = time.perf_counter()
+        directories = find_xml_directories(self.root_input_dir)
+        directory_workers, file_jobs = split_worker_budget(self.jobs, len(directories))
+        logging.info(f"   Directories with XML files: {len(directories)}, built {directory_workers} at a time with {file_jobs} file worker(s) each (jobs: {self.jobs})")
+        output_dirs = [os.path.join(self.root_output_dir, os.path.relpath(input_dir, self.root_input_dir)) for input_dir in directories]
+        if directory_workers > 1:
+            # Workbooks are built in a process pool, the summary keeps the directory order
+            with ProcessPoolExecutor(max_workers=directory_workers, initializer=init_worker, initargs=(self.enum_index,)) as executor:
+                futures = [executor.submit(build_directory_workbook, input_dir, output_dir, self.keep_csv, self.stream, file_jobs, self.write_only, self.force,
+                                           RECORDER.settings())
+                           for input_dir, output_dir in zip(directories, output_dirs)]
+                for input_dir, future in zip(directories, futures):
+                    try:
+                        summary, phase_records = future.result()
+                        self.summaries.append(summary)
+                        RECORDER.extend(phase_records)
+                    except Exception as e:
+                        # A directory failing in a worker is reported in the summary, the other workbooks are still built
+                        logging.info(f"   Workbook failed in worker process for {input_dir}: {type(e).__name__}: {e}")
+                        self.summaries.append((input_dir, 'error', 0, 0, 0.0))
+        else:
+            for input_dir, output_dir in zip(directories, output_dirs):
+                self.summaries.append(self.process_directory(input_dir, output_dir, file_jobs))
+        self._log_summary(time.perf_counter() - start)
+
+    def watch(self, interval=0.5):
+        # Build every workbook (incrementally), then poll the input tree: once a change has stayed the same for one interval
+        # (editors often save in several writes), only the workbooks of the directories holding changed XML files are rebuilt,
+        # and in these directories only the changed files are transformed again (build manifest). Stopped with Ctrl+C.
+        self.process_all_subdirectories()
+        snapshot = snapshot_xml_files(self.root_input_dir)
+        pending = None  # snapshot of a change waiting to settle
+        logging.info(f"   Watching {self.root_input_dir} for XML file changes every {interval} s (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(interval)
+                current = snapshot_xml_files(self.root_input_dir)
+                if current == snapshot:
+                    pending = None
+                elif current != pending:
+                    pending = current
+                else:
+                    self.rebuild_changed(snapshot, current)
+                    snapshot = current
+                    pending = None
+        except KeyboardInterrupt:
+            logging.info(f"   Watch of {self.root_input_dir} stopped")
+
+    def rebuild_changed(self, previous, current):
+        # Rebuild the workbooks of the directories holding added, changed or removed XML files, and log the turnaround time
+        start = time.perf_counter()
+        changed = sorted(path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path))
+        changed_dirs = {os.path.dirname(path) for path in changed}
+        if self.enum_dirs and any(os.path.abspath(directory) in self.enum_dirs for directory in changed_dirs):
+            # An enumeration changed: new enum index, the Types and Classification workbooks resolving it are rebuilt too
+            self.enum_index = EnumIndex(self.enum_dirs)
+            changed_dirs = set(find_xml_directories(self.root_input_dir)) | changed_dirs
+        for file in changed:
+            logging.info(f"   {'Removed' if file not in current else 'Changed'}: {file}")
+        self.summaries = []
+        for input_dir in [directory for directory in find_xml_directories(self.root_input_dir) if directory in changed_dirs]:
+            output_dir = os.path.join(self.root_output_dir, os.path.relpath(input_dir, self.root_input_dir))
+            self.summaries.append(self.process_directory(input_dir, output_dir))
+        for input_dir in sorted(changed_dirs - {summary[0] for summary in self.summaries}):
+            logging.info(f"   No XML file left in {input_dir}, its workbook is not updated")
+        elapsed = time.perf_counter() - start
+        self._log_summary(elapsed)
+        # Turnaround from the last save seen (mtime of the newest changed file) to the refreshed workbooks
+        saved = max((current[path][0] for path in changed if path in current), default=None)
+        since_save = f", {time.time() - saved / 1e9:.3f} s after the last save" if saved is not None else ''
+        message = f"******  Change processed: {len(changed)} XML file(s), {len(self.summaries)} workbook(s) refreshed in {elapsed:.3f} s{since_save} ******"
+        stars = '*' * len(message)
+        logging.info(stars)
+        logging.info(message)
+        logging.info(stars)
 
-        # Now process files in all subdirectories
-        for root, dirs, _ in os.walk(self.root_input_dir):
-            for dir in dirs:
-                input_subdir = os.path.join(root, dir)
-                output_subdir = os.path.join(self.root_output_dir, os.path.relpath(input_subdir, self.root_input_dir))
-                self.process_directory(input_subdir, output_subdir)
+    def _log_summary(self, total_elapsed):
+        # Wall time, XML file count and CSV lines of each workbook; with parallel directories, the sum of the times is larger than the elapsed time
+        logging.info(f"Workbook summary for {self.root_input_dir} (jobs: {self.jobs}):")
+        logging.info(f"   {'Directory':<50} {'Status':<10} {'Files':>6} {'Lines':>9} {'Time':>10}")
+        for input_dir, status, file_count, lines, seconds in self.summaries:
+            directory = os.path.relpath(input_dir, self.root_input_dir)
+            logging.info(f"   {directory:<50} {status:<10} {file_count:6} {lines:9} {seconds:8.3f} s")
+        logging.info(f"   {'Total (sum of workbooks / elapsed)':<61} {sum(summary[2] for summary in self.summaries):6} "
+                     f"{sum(summary[3] for summary in self.summaries):9} {sum(summary[4] for summary in self.summaries):8.3f} s / {total_elapsed:.3f} s")
 
     @staticmethod
     def run():
@@ -47,11 +183,31 @@ class RecursiveExcelFileCreator:
             parser.add_argument('-i', '--input_dir', required=True, help='Root input directories containing XML files (Types, Enum, Classification).')
             parser.add_argument('-o', '--output_dir', required=True, help='Root output directory for Excel files.')
             parser.add_argument('--keep_csv', action='store_true', help='Optional: keep CSV files after processing')
+            parser.add_argument('--stream', action='store_true', help='Optional: stream XML files with iterparse (bounded memory for large exports)')
+            parser.add_argument('--jobs', type=int, default=1, help='Optional: global number of worker processes, shared by the directories built in parallel and the XML files of each directory (default: 1)')
+            parser.add_argument('--write_only', action='store_true', help='Optional: write the workbooks in write-only mode (rows formatted while appended, lower memory)')
+            parser.add_argument('--force', action='store_true', help='Optional: rebuild every workbook even if no input XML file changed since the last build')
+            parser.add_argument('--timings', type=str, help='Optional: write the duration of each phase of each file to this report file (.json or .csv)')
+            parser.add_argument('--timings_memory', action='store_true', help='Optional: also record the peak memory of each phase (tracemalloc, slower)')
+            parser.add_argument('--profile', action='store_true', help='Optional: transform the slowest file again under cProfile and save its stats (.prof) in the root output directory')
+            parser.add_argument('--watch', action='store_true', help='Optional: after the build, keep polling the input tree and rebuild only the workbooks of the directories whose XML files changed (Ctrl+C to stop)')
+            parser.add_argument('--watch_interval', type=float, default=0.5, help='Optional: seconds between two polls of the watch mode; a change is processed once it stayed the same for one interval (default: 0.5)')
+            parser.add_argument('--enum_dir', nargs='+', help='Optional: folder(s) of global enumeration XML files (e.g. the Enums folder of the input tree); adds the resolved enum members of each attribute to Types and Classification rows')
+            parser.add_argument('--model_cache', type=str, help='Optional: parsed model cache folder shared with the enum scripts; an unchanged XML file is not parsed again, even with --force or another output directory (default: $WT_MODEL_CACHE)')
 
             args = parser.parse_args()
 
-            recursive_creator = RecursiveExcelFileCreator(args.input_dir, args.output_dir, args.keep_csv)
-            recursive_creator.process_all_subdirectories()
+            if args.model_cache:
+                configure_model_cache(args.model_cache)
+            if args.timings or args.profile:
+                RECORDER.configure(True, args.timings_memory)
+            recursive_creator = RecursiveExcelFileCreator(args.input_dir, args.output_dir, args.keep_csv, args.stream, args.jobs, args.write_only, args.force, args.enum_dir)
+            if args.watch:
+                recursive_creator.watch(args.watch_interval)
+            else:
+                recursive_creator.process_all_subdirectories()
+            if args.timings or args.profile:
+                report_phase_timings(args.timings, args.output_dir if args.profile else None, args.stream, recursive_creator.enum_index)
         except Exception as e:
             message = f"******************  Process recursively excel files failed: ******************"
             length = len(message)
@@ -0,0 +1,227 @@
+"""
+File: parsed_model_cache.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Parsed model cache shared by the extractor (`extract_xml_transformer.py`, `enum_index.py`) and the enum scripts (`windchill/enums`).
+The records extracted from an XML file (extracted strings of a transform, enum definitions, enum members) are pickled in a cache folder, one entry per
+file and record kind, so a file read by several tools or runs is only normalized and parsed once.
+- An entry is valid while the file has the same path, size and modification time; when only the modification time changed, the SHA-256 content
+  hash decides. An entry also records the version of the code that built it, another version is a miss.
+- Each hit touches the entry file, so its modification time gives the LRU order: once the cache is over its size cap, the least recently used
+  entries are removed. The size of the cache is summed once, then kept as a running total of the entries written and removed: the folder is only
+  scanned again when the total goes over the cap, and the least recently used entries are then removed down to 90% of the cap. There is no shared index file, so parallel worker processes can use the same cache folder
+  (the entries written by the other processes are counted at the next scan).
+- The cache is off unless the WT_MODEL_CACHE environment variable names its folder (size cap in MB: WT_MODEL_CACHE_MB), or a script enables it
+  with its --model_cache option. Entries are pickles: only point it to a folder you trust.
+
+Example:
+python .\\windchill\\datamodel_extractor\\parsed_model_cache.py -c .\\model_cache --stats
+python .\\windchill\\datamodel_extractor\\parsed_model_cache.py -c .\\model_cache --invalidate .\\inputSEP\\Enums\\POWERColor.xml
+python .\\windchill\\datamodel_extractor\\parsed_model_cache.py -c .\\model_cache --clear
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+CACHE_ENV = 'WT_MODEL_CACHE'
+CACHE_SIZE_ENV = 'WT_MODEL_CACHE_MB'
+DEFAULT_MAX_MB = 256
+ENTRY_SUFFIX = '.pkl'
+EVICT_TO = 0.9  # a full cache is evicted down to this share of its cap, so it is not scanned again on the next write
+
+_source_versions = {}
+
+def source_version(*file_paths):
+    # Hash of source files, computed once per process: the version of the code building the cached records
+    key = tuple(os.path.abspath(file_path) for file_path in file_paths)
+    if key not in _source_versions:
+        digest = hashlib.sha256()
+        for file_path in key:
+            with open(file_path, 'rb') as file:
+                digest.update(file.read())
+        _source_versions[key] = digest.hexdigest()[:16]
+    return _source_versions[key]
+
+def content_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ParsedModelCache:
+    def __init__(self, cache_folder, max_mb=DEFAULT_MAX_MB):
+        self.cache_folder = os.path.abspath(cache_folder)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = None  # running total of the entry sizes, summed on the first write
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def _entry_file(self, file_path, kind):
+        key = hashlib.sha1(f"{os.path.abspath(file_path)}\n{kind}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_folder, key + ENTRY_SUFFIX)
+
+    def get(self, file_path, kind, version=''):
+        # Cached records of a file, None on a miss
+        entry_file = self._entry_file(file_path, kind)
+        try:
+            stat = os.stat(file_path)
+            with open(entry_file, 'rb') as file:
+                entry = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+        if entry.get('version') != version or entry.get('size') != stat.st_size:
+            self.misses += 1
+            return None
+        if entry.get('mtime_ns') != stat.st_mtime_ns:
+            # Touched, copied or checked out again: same records when the content did not change
+            if entry.get('hash') != content_hash(file_path):
+                self.misses += 1
+                return None
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._write_entry(entry_file, entry)
+        else:
+            os.utime(entry_file)  # most recently used
+        self.hits += 1
+        return entry['records']
+
+    def put(self, file_path, kind, records, version=''):
+        # Cache the records of a file, then evict the least recently used entries over the size cap
+        stat = os.stat(file_path)
+        entry = {'path': os.path.abspath(file_path), 'kind': kind, 'version': version, 'size': stat.st_size,
+                 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash(file_path), 'records': records}
+        self._write_entry(self._entry_file(file_path, kind), entry)
+        if self.total_bytes > self.max_bytes:
+            self.evict(self.max_bytes * EVICT_TO)
+
+    def load(self, file_path, kind, build, version=''):
+        # Cached records of a file, or build(file_path) cached for the next call
+        records = self.get(file_path, kind, version)
+        if records is None:
+            records = build(file_path)
+            self.put(file_path, kind, records, version)
+        return records
+
+    def _write_entry(self, entry_file, entry):
+        # Written to a temporary file then renamed, so a reader never sees a partial entry; the running total gets the size difference
+        if self.total_bytes is None:
+            self.total_bytes = sum(size for _, size, _ in self.entries())
+        handle, temp_file = tempfile.mkstemp(dir=self.cache_folder, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+            try:
+                replaced = os.stat(entry_file).st_size
+            except OSError:
+                replaced = 0
+            os.replace(temp_file, entry_file)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        self.total_bytes += size - replaced
+
+    def entries(self):
+        # (entry file, size, last use) of each entry, least recently used first
+        entries = []
+        for entry in os.scandir(self.cache_folder):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def evict(self, target_bytes=None):
+        # Remove the least recently used entries until the cache is under target_bytes (default: its size cap), returns the number removed
+        target_bytes = self.max_bytes if target_bytes is None else target_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for entry_file, size, _ in entries:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(entry_file)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.total_bytes = total
+        return removed
+
+    def invalidate(self, file_path=None):
+        # Remove the entries of one XML file (all record kinds), or every entry; returns the number removed
+        removed = 0
+        target = os.path.abspath(file_path) if file_path else None
+        for entry_file, size, _ in self.entries():
+            if target is not None:
+                try:
+                    with open(entry_file, 'rb') as file:
+                        if pickle.load(file).get('path') != target:
+                            continue
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                    pass  # unreadable entry: removed as well
+            try:
+                os.remove(entry_file)
+                removed += 1
+                if self.total_bytes is not None:
+                    self.total_bytes -= size
+            except OSError:
+                pass
+        return removed
+
+    def log_stats(self):
+        entries = self.entries()
+        logging.info(f"   Parsed model cache {self.cache_folder}: {len(entries)} entries, {sum(size for _, size, _ in entries) / 1048576:.1f} MB "
+                     f"(cap {self.max_bytes / 1048576:.0f} MB), {self.hits} hits, {self.misses} misses")
+
+_model_cache = None
+
+def configure_model_cache(cache_folder, max_mb=None):
+    # Enable the cache for this process and, through the environment, for the worker processes it starts
+    global _model_cache
+    max_mb = max_mb if max_mb is not None else float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_MAX_MB))
+    os.environ[CACHE_ENV] = os.path.abspath(cache_folder)
+    os.environ[CACHE_SIZE_ENV] = str(max_mb)
+    _model_cache = ParsedModelCache(cache_folder, max_mb)
+    return _model_cache
+
+def model_cache():
+    # Cache of this process, None when it is not enabled
+    global _model_cache
+    if _model_cache is None and os.environ.get(CACHE_ENV):
+        _model_cache = ParsedModelCache(os.environ[CACHE_ENV], float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_MAX_MB)))
+    return _model_cache
+
+def run():
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the parsed model cache.")
+    parser.add_argument('-c', '--cache_dir', default=os.environ.get(CACHE_ENV), help=f'Cache folder (default: ${CACHE_ENV})')
+    parser.add_argument('--stats', action='store_true', help='Log the number and size of the entries')
+    parser.add_argument('--invalidate', nargs='+', metavar='XML_FILE', help='Remove the entries of these XML files')
+    parser.add_argument('--clear', action='store_true', help='Remove every entry')
+    parser.add_argument('--max_mb', type=float, help='Evict the least recently used entries over this size')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(filename)s - %(message)s')
+    if not args.cache_dir:
+        parser.error(f'no cache folder: use --cache_dir or set {CACHE_ENV}')
+    cache = ParsedModelCache(args.cache_dir, args.max_mb if args.max_mb is not None else DEFAULT_MAX_MB)
+    if args.clear:
+        logging.info(f"   {cache.invalidate()} entries removed")
+    for file_path in args.invalidate or []:
+        logging.info(f"   {file_path}: {cache.invalidate(file_path)} entries removed")
+    if args.max_mb is not None:
+        logging.info(f"   {cache.evict()} entries evicted")
+    cache.log_stats()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,146 @@
+"""
+File: phase_timings.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Per phase instrumentation of the extractor: normalize, parse, extract, write_csv (`extract_xml_transformer.py`),
+append_rows, format_worksheet, save (`extract_excel_processor.py`) and workbook (`main_excel_recursive.py`).
+Each phase records its duration and, with memory tracing, its peak of Python allocations (tracemalloc), for each file.
+The recorder is disabled by default: a phase then costs one call returning a shared no-op context.
+Records are written as a JSON or CSV report, and the hottest file can be profiled again with cProfile.
+"""
+
+import cProfile
+import csv
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+REPORT_FIELDS = ['folder', 'file', 'phase', 'seconds', 'peak_kb']
+_NO_PHASE = nullcontext()
+
+class _Phase:
+    def __init__(self, recorder, name, file):
+        self.recorder = recorder
+        self.name = name
+        self.file = file
+
+    def __enter__(self):
+        recorder = self.recorder
+        if recorder.memory:
+            # The peak of the enclosing phase is kept aside before the peak is reset for this one
+            if recorder.stack:
+                recorder.stack[-1] = max(recorder.stack[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            recorder.stack.append(0)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.perf_counter() - self.start
+        recorder = self.recorder
+        peak_kb = None
+        if recorder.memory:
+            peak = max(recorder.stack.pop(), tracemalloc.get_traced_memory()[1])
+            if recorder.stack:
+                recorder.stack[-1] = max(recorder.stack[-1], peak)
+            peak_kb = round(peak / 1024, 1)
+        recorder.records.append({'folder': recorder.folder, 'file': self.file, 'phase': self.name, 'seconds': round(seconds, 6), 'peak_kb': peak_kb})
+        return False
+
+class PhaseRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.folder = ''  # input folder of the workbook being built, written in each record
+        self.records = []
+        self.stack = []  # running peaks of the open phases (memory tracing)
+
+    def configure(self, enabled=True, memory=False, folder=''):
+        # Memory tracing slows down every allocation, so it is only started on request
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.folder = folder
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def settings(self):
+        # Handed to worker processes, see extract_excel_processor.transform_xml_file
+        return self.enabled, self.memory, self.folder
+
+    def phase(self, name, file=''):
+        # Context manager timing one phase of one file
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name, file)
+
+    def mark(self):
+        return len(self.records)
+
+    def records_since(self, mark):
+        return self.records[mark:]
+
+    def extend(self, records):
+        # Records of a worker process
+        self.records.extend(records)
+
+    def totals(self):
+        # {phase: (count, seconds, max peak_kb)} in order of first appearance
+        totals = {}
+        for record in self.records:
+            count, seconds, peak = totals.get(record['phase'], (0, 0.0, None))
+            if record['peak_kb'] is not None:
+                peak = record['peak_kb'] if peak is None else max(peak, record['peak_kb'])
+            totals[record['phase']] = (count + 1, seconds + record['seconds'], peak)
+        return totals
+
+    def log_totals(self):
+        if not self.records:
+            return
+        logging.info("Phase timings (nested phases are included in their enclosing phase):")
+        for phase, (count, seconds, peak) in self.totals().items():
+            peak_text = '' if peak is None else f" {peak / 1024:10.1f} MB peak"
+            logging.info(f"   {phase:<20} {count:6} x {seconds:10.3f} s{peak_text}")
+
+    def hottest_file(self, phase='transform'):
+        # File with the longest duration for a phase, None when the phase was not recorded
+        durations = {}
+        for record in self.records:
+            if record['phase'] == phase:
+                durations[record['file']] = durations.get(record['file'], 0.0) + record['seconds']
+        return max(durations, key=durations.get) if durations else None
+
+    def write_report(self, report_file):
+        # JSON (list of records) or CSV report, chosen by the file extension
+        if os.path.dirname(report_file):
+            os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        if report_file.lower().endswith('.csv'):
+            with open(report_file, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=REPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.records)
+        else:
+            with open(report_file, 'w', encoding='utf-8') as file:
+                json.dump({'phases': self.records, 'totals': {phase: {'count': count, 'seconds': round(seconds, 6), 'peak_kb': peak}
+                                                              for phase, (count, seconds, peak) in self.totals().items()}}, file, indent=2)
+        logging.info(f"Phase timings report written to {report_file}")
+
+def profile_call(function, stats_file, *args, **kwargs):
+    # Run function under cProfile, save the stats (pstats format, see python -m pstats) and log the 20 most expensive calls
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(stats_file)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(20)
+        logging.info(f"cProfile stats saved to {stats_file}:\n{stream.getvalue()}")
+
+# Shared by the extractor modules of this process
+RECORDER = PhaseRecorder()
@@ -0,0 +1,60 @@
+"""
+File: value_rules.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Table driven normalization of the raw values read by `extract_xml_transformer.py` (datatype, unit, default value,
+length, regular expression and discrete set constraint data). The rules are declared in `value_rules.json` and can be edited without code change.
+They are compiled once at import: 'exact' rules into a dict, 'replace' rules into one regular expression per field applied in a single pass
+(the longest text first, a replacement is never rewritten by another rule). Results are memoized per distinct raw value.
+"""
+
+import json
+import os
+import re
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'value_rules.json')
+
+class ValueRule:
+    # Normalization of one field: call it with the raw value
+    __slots__ = ('field', 'exact', 'replacements', 'pattern', 'results')
+
+    def __init__(self, field, exact=None, replace=None):
+        self.field = field
+        self.exact = dict(exact or {})
+        self.replacements = {}
+        for text, replacement in replace or []:
+            if not text:
+                raise ValueError(f"Value rule '{field}': empty text to replace")
+            self.replacements.setdefault(text, replacement)
+        texts = sorted(self.replacements, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(map(re.escape, texts))) if texts else None
+        self.results = {}  # raw value -> normalized value
+
+    def _replace(self, match):
+        return self.replacements[match.group()]
+
+    def __call__(self, value):
+        result = self.results.get(value)
+        if result is None:
+            result = self.exact.get(value)
+            if result is None:
+                result = self.pattern.sub(self._replace, value) if self.pattern is not None and value else value
+            self.results[value] = result
+        return result
+
+def load_value_rules(rules_file=RULES_FILE):
+    # {field: ValueRule}; keys starting with '_' are comments
+    with open(rules_file, 'r', encoding='utf-8') as file:
+        table = json.load(file)
+    rules = {}
+    for field, rule in table.items():
+        if field.startswith('_'):
+            continue
+        unknown = set(rule) - {'exact', 'replace'} - {key for key in rule if key.startswith('_')}
+        if unknown:
+            raise ValueError(f"Value rule '{field}' in {rules_file}: unknown keys {sorted(unknown)}")
+        rules[field] = ValueRule(field, rule.get('exact'), rule.get('replace'))
+    return rules
+
+# Loaded once per process, used for every attribute
+VALUE_RULES = load_value_rules()
@@ -0,0 +1,87 @@
+"""
+File: xml_file_kinds.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Registry of the Windchill XML file kinds (Types, Classification, Enum, Lifecycle, OIR) handled by `extract_xml_transformer.py`.
+Each kind declares the handler element that identifies it (signal) and the extractor methods to run. The file kind is worked out in one pass over the
+normalized tree, or from the handler elements of the stream, by the same priority rule, and the decision reports which signal triggered it.
+"""
+
+from collections import namedtuple
+
+# kind: dispatch key, label: name used in the 'Processing <label> XML' log
+# priority: when a tree holds signals of several kinds, the lowest priority wins
+# signal_tag, signal_template, signal_container: element identifying the kind, its csvattTemplate value and the handler element it must be nested in
+# unit_tag, unit_template: elements handed to the extractor one at a time
+# start, extract_unit, finish: XMLTransformer method names, or callables taking (transformer) / (transformer, unit)
+FileKind = namedtuple('FileKind', ['kind', 'label', 'priority', 'signal_tag', 'signal_template', 'signal_container',
+                                   'unit_tag', 'unit_template', 'start', 'extract_unit', 'finish'])
+
+# kind: FileKind.kind, signal: description of the matching signal, line: source line of the element that triggered the decision
+KindDecision = namedtuple('KindDecision', ['kind', 'signal', 'line'])
+
+FILE_KINDS = {}
+_KINDS_BY_SIGNAL_TAG = {}  # signal tag -> file kinds in priority order, rebuilt when a kind is registered
+
+def register_file_kind(kind, label, priority, signal_tag, unit_tag, start, extract_unit, finish=None,
+                       signal_template=None, signal_container=None, unit_template=None):
+    file_kind = FileKind(kind, label, priority, signal_tag, signal_template, signal_container,
+                         unit_tag, unit_template, start, extract_unit, finish)
+    FILE_KINDS[kind] = file_kind
+    _KINDS_BY_SIGNAL_TAG.clear()
+    for registered in sorted(FILE_KINDS.values(), key=lambda registered: registered.priority):
+        _KINDS_BY_SIGNAL_TAG.setdefault(registered.signal_tag, []).append(registered)
+    return file_kind
+
+def describe_signal(file_kind):
+    signal = file_kind.signal_tag
+    if file_kind.signal_template:
+        signal += f"[csvattTemplate='{file_kind.signal_template}']"
+    if file_kind.signal_container:
+        signal = f"{file_kind.signal_container}//{signal}"
+    return signal
+
+def _kinds_by_signal_tag():
+    return _KINDS_BY_SIGNAL_TAG
+
+def _matches_template(file_kind, element):
+    return file_kind.signal_template is None or element.findtext('./csvattTemplate') == file_kind.signal_template
+
+def classify_tree(root):
+    # One pass over the signal elements of the normalized tree: the lowest priority signal found wins,
+    # and the scan stops as soon as no other kind can beat it
+    kinds_by_tag = _kinds_by_signal_tag()
+    if not kinds_by_tag:
+        return None
+    top_priority = min(file_kind.priority for file_kind in FILE_KINDS.values())
+    best = best_element = None
+    for element in root.iter(*kinds_by_tag):
+        for file_kind in kinds_by_tag[element.tag]:
+            if best is not None and file_kind.priority >= best.priority:
+                break
+            if not _matches_template(file_kind, element):
+                continue
+            if file_kind.signal_container and next(element.iterancestors(file_kind.signal_container), None) is None:
+                continue
+            best, best_element = file_kind, element
+            break
+        if best is not None and best.priority == top_priority:
+            break
+    if best is None:
+        return None
+    return KindDecision(best.kind, describe_signal(best), best_element.sourceline)
+
+def classify_stream_element(element, containers, below=None):
+    # Streaming mode: decision given by one handler element, None when it carries no signal
+    # containers: tags of the csvBegin* handler elements still open around the element
+    # below: priority of the kind already decided; only a kind with a lower priority is looked for, so that, as in classify_tree,
+    # the lowest priority signal of the file wins (the caller extracts the file again when a later element changes the decision)
+    for file_kind in _kinds_by_signal_tag().get(element.tag, ()):
+        if below is not None and file_kind.priority >= below:
+            break
+        if not _matches_template(file_kind, element):
+            continue
+        if file_kind.signal_container and file_kind.signal_container not in containers:
+            continue
+        return KindDecision(file_kind.kind, describe_signal(file_kind), element.sourceline)
+    return None
@@ -0,0 +1,98 @@
+"""
+File: xml_normalizer.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: See README. Normalization of Windchill load files shared by `extract_xml_transformer.py`, `enum_index.py` and the benchmarks.
+Windchill load files are flat: each csvBegin* handler element is closed by a later csvEnd* sibling. The handler tags are rewritten into real
+nesting in a single scan (one compiled regex and a lookup dict) instead of one full copy of the document per str.replace. The regex is a
+prefix tree of the handler tags (multi-pattern automaton), so each position of the document is checked against all tags at once.
+The bytes mode works on an mmap of the file, without decoding it, and its result can be handed to etree.fromstring as is.
+"""
+
+import mmap
+import re
+
+# Replacements as executed in order by the previous normalize_xml: the single scan gives the same result,
+# as no replacement produces text matched by a later one
+HANDLER_REPLACEMENTS = [
+# TYPES, CLASSIFICATION
+    ('</csvBeginTypes>', ''),
+    ('<csvBeginTypes handler="com.ptc.core.lwc.server.TypeDefinitionLoader.beginProcessTypes"/>', '<csvBeginTypes handler="com.ptc.core.lwc.server.TypeDefinitionLoader.beginProcessTypes">'),
+    ('</csvBeginTypeDefView>', ''),
+    ('</csvBeginLayoutDefView>', ''),
+    ('</csvBeginGroupDefView>', ''),
+    ('</csvBeginGroupMemberView>', ''),
+    ('</csvBeginAttributeDefView>', ''),
+    ('</csvBeginConstraintDefView>', ''),
+    ('</csvBeginEnumDefView>', ''),
+    ('</csvBeginEnumMemberView>', ''),
+    ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
+    ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
+    ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
+    ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
+    ('<csvEndConstraintDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessConstraintDefinition"/>', '</csvBeginConstraintDefView>'),
+    ('<csvEndAttributeDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessAttributeDefinition"/>', '</csvBeginAttributeDefView>'),
+    ('<csvEndGroupMemberView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessGroupMembership"/>', '</csvBeginGroupMemberView>'),
+    ('<csvEndGroupDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessGroupDefinition"/>', '</csvBeginGroupDefView>'),
+    ('<csvEndLayoutDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessLayoutDefinition"/>', '</csvBeginLayoutDefView>'),
+    ('<csvEndTypeDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessTypeDefinition"/>', '</csvBeginTypeDefView>'),
+    ('<csvEndTypes handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessTypes"/>', '</csvBeginTypes>'),
+# LIFECYCLE
+    ('</csvLifeCycleTemplateBegin>', ''),
+    ('<csvPhaseTemplateEnd handler="wt.lifecycle.LoadLifeCycle.createPhaseTemplateEnd"></csvPhaseTemplateEnd>', ''),
+    ('<csvLifeCycleTemplateEnd handler="wt.lifecycle.LoadLifeCycle.createLifeCycleTemplateEnd"></csvLifeCycleTemplateEnd>', '</csvLifeCycleTemplateBegin>'),
+    ('<csvLifeCycleTemplateEnd handler="wt.lifecycle.LoadLifeCycle.createLifeCycleTemplateEnd"/>', '</csvLifeCycleTemplateBegin>'),
+# OIR
+    ('<![CDATA[', ''),
+    (']]>', ''),
+]
+
+# Subset used by the enum scripts: only the enumeration handler elements are rewritten
+ENUM_HANDLER_REPLACEMENTS = [(old, new) for old, new in HANDLER_REPLACEMENTS if 'EnumDefView' in old or 'EnumMemberView' in old]
+
+def prefix_tree_pattern(words):
+    # Regex matching any of the words, factored as a prefix tree: '<csvEnd(?:Types|...)' instead of one alternative per word.
+    # A word ending where a longer one goes on is made optional, so the longest word wins
+    tree = {}
+    for word in words:
+        node = tree
+        for character in word:
+            node = node.setdefault(character, {})
+        node[None] = {}
+    def build(node):
+        branches = [re.escape(character) + build(node[character]) for character in sorted(character for character in node if character is not None)]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + pattern + ')?' if None in node else pattern
+    return build(tree)
+
+class XMLNormalizer:
+    def __init__(self, replacements):
+        self.replacements = list(replacements)
+        self.lookup = dict(self.replacements)
+        self.pattern = re.compile(prefix_tree_pattern(self.lookup))
+        self.bytes_lookup = {old.encode('utf-8'): new.encode('utf-8') for old, new in self.replacements}
+        self.bytes_pattern = re.compile(prefix_tree_pattern(self.lookup).encode('utf-8'))
+
+    def normalize(self, xml_content):
+        # str mode: same result as the chained str.replace calls, in one scan
+        lookup = self.lookup
+        return self.pattern.sub(lambda match: lookup[match.group()], xml_content)
+
+    def normalize_bytes(self, xml_bytes):
+        # bytes mode: xml_bytes may be bytes or an mmap, the handler tags are plain ASCII so no decoding is needed
+        lookup = self.bytes_lookup
+        return self.bytes_pattern.sub(lambda match: lookup[match.group()], xml_bytes)
+
+    def normalize_file(self, file_path):
+        # Normalized content of a file as bytes, read through an mmap (empty files cannot be mapped)
+        with open(file_path, 'rb') as file:
+            try:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self.normalize_bytes(mapped)
+            except ValueError:
+                return self.normalize_bytes(file.read())
+
+HANDLER_NORMALIZER = XMLNormalizer(HANDLER_REPLACEMENTS)
+ENUM_NORMALIZER = XMLNormalizer(ENUM_HANDLER_REPLACEMENTS)
@@ -0,0 +1,127 @@
+"""
+File: enum_member_reader.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Streaming reader of the members of a Windchill Enumerated Values XML file, shared by the enum scripts
+(merge_xml_enumerated_values_with_new_entries.py, merge_two_xml_enumerated_values.py, extract_xml_enumerated_values_to_csv.py).
+The flat load file is read in one pass with lxml iterparse, without normalization: the csvPropertyValue elements found between a
+csvBeginEnumMemberView and its csvEndEnumMemberView are the properties of that member. Each element is cleared once read and the elements
+already read are removed from the root, so the memory used does not grow with the number of members.
+read_enum_layout gives the parts of the file around the members (doctype, root tag, csvBeginEnumDefView header and the elements after the last
+member), used by enum_xml_writer.py to write a complete enum file.
+Each member gives a compact EnumMemberRecord: its name and a tuple of (property name, csvisDefault, csvvalue, csvlocale_fr) in file order,
+with shortcuts for displayName, FR label, selectable and sort_order. Other properties are kept as they are.
+With the parsed model cache enabled (windchill/datamodel_extractor/parsed_model_cache.py), the records of an unchanged file are read from the cache.
+"""
+
+import copy
+import os
+import sys
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datamodel_extractor'))
+from parsed_model_cache import model_cache, source_version
+
+MEMBER_TAGS = ('csvBeginEnumMemberView', 'csvPropertyValue', 'csvEndEnumMemberView')
+# Position of each child of a csvPropertyValue in its property tuple
+PROPERTY_FIELDS = {'csvname': 0, 'csvisDefault': 1, 'csvvalue': 2, 'csvlocale_fr': 3}
+
+class EnumMemberRecord:
+    __slots__ = ('name', 'properties')
+
+    def __init__(self, name, properties):
+        self.name = name
+        self.properties = properties  # ((property name, csvisDefault, csvvalue, csvlocale_fr), ...) in file order, '' for a missing or empty value
+
+    def value(self, property_name, field=2):
+        # First non empty field of a property (2: csvvalue, 1: csvisDefault, 3: csvlocale_fr), '' when not set
+        for property_value in self.properties:
+            if property_value[0] == property_name and property_value[field]:
+                return property_value[field]
+        return ''
+
+    @property
+    def displayName(self):
+        return self.value('displayName')
+
+    @property
+    def displayFR(self):
+        return self.value('displayName', 3)
+
+    @property
+    def selectable(self):
+        return self.value('selectable')
+
+    @property
+    def sort_order(self):
+        return self.value('sort_order')
+
+    def entry(self):
+        # Entry dict of the merge scripts
+        return {'name': self.name, 'displayName': self.displayName, 'selectable': self.selectable, 'sort_order': self.sort_order, 'csvlocale_fr': self.displayFR}
+
+def iter_enum_members(file_path):
+    # EnumMemberRecord of each member, in file order, in one pass and bounded memory
+    name = None
+    properties = None  # properties of the current member, None outside a member
+    for _, element in etree.iterparse(file_path, events=('end',), tag=MEMBER_TAGS, resolve_entities=False, huge_tree=True):
+        tag = element.tag
+        if tag == 'csvPropertyValue':
+            if properties is not None:
+                # One walk over the children instead of one findtext per field
+                values = ['', '', '', '']
+                for child in element:
+                    index = PROPERTY_FIELDS.get(child.tag)
+                    if index is not None and not values[index]:
+                        values[index] = child.text or ''
+                properties.append(tuple(values))
+        elif tag == 'csvBeginEnumMemberView':
+            name = element.findtext('csvname') or ''
+            properties = []
+        elif properties is not None:
+            yield EnumMemberRecord(name, tuple(properties))
+            properties = None
+        # Read elements are not needed anymore
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
+
+def read_enum_members(file_path):
+    # List of the EnumMemberRecord of a file, from the parsed model cache while the file is unchanged
+    cache = model_cache()
+    if cache is not None:
+        return cache.load(file_path, 'enum_member_records', lambda path: list(iter_enum_members(path)), source_version(__file__))
+    return list(iter_enum_members(file_path))
+
+def read_enum_layout(file_path):
+    # (doctype, root tag, head elements, tail elements) of an enum file, in one streaming pass: the top level elements and comments found
+    # before the first member (csvBeginEnumDefView and the enumeration properties) and after the last one (csvEndEnumDefView), copied
+    doctype = None
+    root_tag = None
+    head = []
+    tail = []
+    state = 'head'  # 'head' before the first member, 'member' inside a member, 'tail' after a member
+    for event, element in etree.iterparse(file_path, events=('end', 'comment'), resolve_entities=False, huge_tree=True):
+        parent = element.getparent()
+        if root_tag is None and parent is not None:
+            tree = element.getroottree()
+            doctype = tree.docinfo.doctype
+            root_tag = tree.getroot().tag
+        if parent is None or parent.getparent() is not None:
+            continue  # root end, or child of a top level element (copied with it)
+        tag = element.tag if event == 'end' else None
+        if tag == 'csvBeginEnumMemberView':
+            state = 'member'
+            tail = []
+        elif tag == 'csvEndEnumMemberView':
+            state = 'tail'
+        elif state != 'member':
+            kept = copy.deepcopy(element)
+            kept.tail = None
+            (head if state == 'head' else tail).append(kept)
+        if event == 'end':
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del parent[0]
+    return doctype, root_tag, head, tail
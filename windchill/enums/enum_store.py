@@ -0,0 +1,361 @@
+"""
+File: enum_store.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Persistent enum store: the members of the Windchill Enumerated Values are kept in a local SQLite database keyed by enumeration
+and member name, seeded once from the XML exports. New entries CSV files are then applied as indexed upserts, with the same policies as
+merge_xml_enumerated_values_with_new_entries.py (-s, -pes, -f, -sso), and only the members changed by an upsert are written to a delta load file.
+options:
+  -h, --help            show this help message and exit
+  -d DATABASE, --database DATABASE
+                        Path to the SQLite enum store (created if it does not exist).
+  -i INPUT_XML [INPUT_XML ...], --input_xml INPUT_XML [INPUT_XML ...]
+                        OPTIONAL (seed) XML Enumerated Values files or folders of XML files, each enumeration is (re)loaded in the store
+  -e ENUM_NAME, --enum_name ENUM_NAME
+                        OPTIONAL (required with -n, -r and -a) Name of the enumeration (csvname of its csvBeginEnumDefView)
+  -n NEW_ENTRIES_CSV_FILE, --new_entries_csv_file NEW_ENTRIES_CSV_FILE
+                        OPTIONAL (upsert) Path to the CSV file with new entries, header row [name~displayName~csvlocale_fr]
+  -o OUTPUT_FOLDER, --output_folder OUTPUT_FOLDER
+                        OPTIONAL (default is the current folder) Folder of the delta and complete load files
+  -s {name,displayName}, --sort_by {name,displayName}
+                        OPTIONAL (default is 'name') Sort entries by 'name' or 'displayName' to recalculate the sort order.
+  -po, --preserve_original_order
+                        OPTIONAL (if -po not used, members written per name) Write the members in the store order (original order, new ones at the end)
+  -pes, --preserve_existing_selectable_value
+                        OPTIONAL (if -pes not used, selectable value updated to true on existing entries matching new entries) Preserve the original selectable value of existing entries matching new entries
+  -f, --force_new_selectable_false
+                        OPTIONAL (if -f not used, selectable value set to true on new entries added to existing) Force selectable value at false for the new entries added to existing entries
+  -sso, --single_sort_order_value
+                        OPTIONAL (if -sso not used, sort order is recalculated) Force sort order value to be equal to same value hard-coded to 0
+  -r REVISION, --revision REVISION
+                        OPTIONAL (default is the last upsert) Write the delta load file of the members changed by this upsert
+  -a, --all_members
+                        OPTIONAL Write the complete load file of the enumeration (every member of the store)
+  --dry_run
+                        OPTIONAL Check the CSV file against the store and print the counts, nothing is saved or written
+  -l, --list
+                        OPTIONAL List the enumerations of the store with their member count and last upsert
+  -c MODEL_CACHE, --model_cache MODEL_CACHE
+                        OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again
+
+1°) Seed (-i): the members of each XML file are read by enum_member_reader.py, with the layout of the file (header, csvBeginEnumDefView,
+csvEndEnumDefView) used to write the load files. Seeding an enumeration again replaces its members and its upserts: the export is the new baseline.
+2°) Upsert (-e -n): the CSV rows are staged in a temporary table and matched with the members through the primary key (enumeration, member name)
+- duplicates within the CSV file: the first row is kept
+- existing members matching a CSV row: selectable value updated from false to true (kept with -pes), display names are kept
+- other CSV rows: added at the end of the enumeration, selectable true (false with -f)
+- sort order: recalculated by 'name' or 'displayName' like the merge script, or set to 0 with -sso; only the members whose value changes are
+  updated. The store keeps the policy its sort orders follow: with the same policy, only the members from the first added one on are read again
+Each upsert is a new revision of the enumeration: its counts are kept in the store (no log files) and the members it changed are written to
+<ENUM_NAME>_delta_<revision>.xml, a complete load file holding only these members. With a recalculated sort order, the members moved by the
+new entries are in the delta as well.
+3°) Export: -e -r writes the delta load file of a previous upsert again, -e -a the complete load file (same content as output_merged_file.xml of
+the merge script with the same CSV files and options).
+Example:
+python .\\windchill\\enums\\enum_store.py -d .\\enums.db -i .\\inputSEP\\Enums
+python .\\windchill\\enums\\enum_store.py -d .\\enums.db -e POWERTypeArticleTool -n .\\wave1\\csvInput.csv -o .\\wave1\\output
+python .\\windchill\\enums\\enum_store.py -d .\\enums.db -e POWERTypeArticleTool -a -o .\\wave1\\output
+"""
+
+import csv
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+import time
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datamodel_extractor'))
+from parsed_model_cache import configure_model_cache
+from enum_member_reader import read_enum_members, read_enum_layout
+from enum_xml_writer import write_enum_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS enums (enum_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, source_file TEXT, doctype TEXT, root_tag TEXT,
+                                  head TEXT, tail TEXT, revision INTEGER NOT NULL, next_position INTEGER NOT NULL, sort_policy TEXT);
+CREATE TABLE IF NOT EXISTS members (enum_id INTEGER NOT NULL, name TEXT NOT NULL, display TEXT, display_fr TEXT, selectable TEXT, sort_order TEXT,
+                                    position INTEGER NOT NULL, name_key TEXT, display_key TEXT, revision INTEGER NOT NULL, change TEXT,
+                                    PRIMARY KEY (enum_id, name)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS members_name_order ON members (enum_id, name_key, position, sort_order);
+CREATE INDEX IF NOT EXISTS members_display_order ON members (enum_id, display_key, position, sort_order);
+CREATE INDEX IF NOT EXISTS members_revision ON members (enum_id, revision);
+CREATE TABLE IF NOT EXISTS upserts (enum_id INTEGER NOT NULL, revision INTEGER NOT NULL, csv_file TEXT, applied TEXT, options TEXT,
+                                    new_entries INTEGER, csv_duplicates INTEGER, existing_duplicates INTEGER, added INTEGER,
+                                    selectable_updated INTEGER, sort_order_updated INTEGER, PRIMARY KEY (enum_id, revision));
+"""
+UPSERT_COUNTS = ['new_entries', 'csv_duplicates', 'existing_duplicates', 'added', 'selectable_updated', 'sort_order_updated']
+# Sort keys of the merge script (x[sort_by].lower()), stored with each member so the sort order is recalculated from an index only
+# (the order indexes hold the sort order, and the member name as the table key)
+# enums.sort_policy: 'name' or 'displayName' while the sort orders are the ranks of that key, 'single' while they are all 0, NULL once seeded
+SORT_KEYS = {'name': 'name_key', 'displayName': 'display_key'}
+
+def layout_text(elements):
+    # Head or tail elements of a layout, kept in the store as one XML string
+    wrapper = etree.Element('layout')
+    for element in elements:
+        wrapper.append(element)
+    return etree.tostring(wrapper, encoding='unicode')
+
+def layout_elements(text):
+    return list(etree.fromstring(text)) if text else []
+
+def enum_name_of(head, file_path):
+    # csvname of the csvBeginEnumDefView, file name when the header has none
+    for element in head:
+        if element.tag == 'csvBeginEnumDefView' and element.findtext('csvname'):
+            return element.findtext('csvname')
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def read_csv_entries(csv_file_path):
+    # Rows of a new entries CSV file, same format as merge_xml_enumerated_values_with_new_entries.py
+    expected_columns = ['name', 'displayName', 'csvlocale_fr']
+    with open(csv_file_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile, delimiter='~')
+        if not reader.fieldnames or not all(column in reader.fieldnames for column in expected_columns):
+            raise ValueError("CSV file format is incorrect. Expected columns: " + ", ".join(expected_columns))
+        return [{'name': row['name'], 'displayName': row['displayName'], 'csvlocale_fr': row.get('csvlocale_fr') or ''} for row in reader]
+
+def list_xml_files(inputs):
+    # XML files given directly or found in the given folders (not their subdirectories), in sorted order
+    xml_files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            xml_files.extend(os.path.join(path, file) for file in sorted(os.listdir(path)) if file.endswith('.xml'))
+        else:
+            xml_files.append(path)
+    return xml_files
+
+class EnumStore:
+    def __init__(self, database_file):
+        self.database_file = database_file
+        self.connection = sqlite3.connect(database_file)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def enum(self, enum_name):
+        # (enum_id, revision, position of the next new member, sort policy) of a seeded enumeration
+        row = self.connection.execute('SELECT enum_id, revision, next_position, sort_policy FROM enums WHERE name = ?', (enum_name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Enumeration {enum_name} is not in the store {self.database_file}, seed it first with -i")
+        return row
+
+    def seed(self, xml_file):
+        # (Re)load the members and layout of one XML Enumerated Values file, returns (enumeration name, member count), None when it has no member
+        members = read_enum_members(xml_file)
+        if not members:
+            return None
+        doctype, root_tag, head, tail = read_enum_layout(xml_file)
+        enum_name = enum_name_of(head, xml_file)
+        connection = self.connection
+        with connection:
+            row = connection.execute('SELECT enum_id FROM enums WHERE name = ?', (enum_name,)).fetchone()
+            if row is not None:
+                connection.execute('DELETE FROM members WHERE enum_id = ?', row)
+                connection.execute('DELETE FROM upserts WHERE enum_id = ?', row)
+                connection.execute('DELETE FROM enums WHERE enum_id = ?', row)
+            cursor = connection.execute('INSERT INTO enums (name, source_file, doctype, root_tag, head, tail, revision, next_position) VALUES (?, ?, ?, ?, ?, ?, 0, ?)',
+                                        (enum_name, os.path.abspath(xml_file), doctype, root_tag, layout_text(head), layout_text(tail), len(members)))
+            enum_id = cursor.lastrowid
+            # A name found twice keeps its first position and its last values, like the merge script
+            connection.executemany('INSERT INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?) '
+                                   'ON CONFLICT (enum_id, name) DO UPDATE SET display = excluded.display, display_fr = excluded.display_fr, '
+                                   'selectable = excluded.selectable, sort_order = excluded.sort_order, display_key = excluded.display_key',
+                                   ((enum_id, member.name, member.displayName, member.displayFR, member.selectable, member.sort_order, position,
+                                     member.name.lower(), member.displayName.lower(), 'seeded') for position, member in enumerate(members)))
+        return enum_name, len(members)
+
+    def upsert(self, enum_name, new_entries, sort_by='name', preserve_selectable_value=False, force_new_selectable_false=False,
+               single_sort_order_value=False, csv_file='', dry_run=False):
+        # Apply new entries to an enumeration as a new revision, returns (revision, counts); with dry_run the changes are rolled back
+        if sort_by not in SORT_KEYS:
+            raise ValueError("sort_by argument must be 'name' or 'displayName'")
+        enum_id, revision, first_position, sort_policy = self.enum(enum_name)
+        revision += 1
+        unique_entries = {}
+        for entry in new_entries:
+            unique_entries.setdefault(entry['name'], entry)
+        counts = {'new_entries': len(new_entries), 'csv_duplicates': len(new_entries) - len(unique_entries)}
+        connection = self.connection
+        connection.execute('CREATE TEMP TABLE IF NOT EXISTS new_entries (name TEXT PRIMARY KEY, display TEXT, display_fr TEXT, seq INTEGER, '
+                           'name_key TEXT, display_key TEXT) WITHOUT ROWID')
+        try:
+            connection.execute('BEGIN')
+            connection.execute('DELETE FROM new_entries')
+            connection.executemany('INSERT INTO new_entries VALUES (?, ?, ?, ?, ?, ?)',
+                                   ((entry['name'], entry['displayName'], entry['csvlocale_fr'], seq, entry['name'].lower(), entry['displayName'].lower())
+                                    for seq, entry in enumerate(unique_entries.values())))
+            # Each CSV row is looked up through the primary key, the members are never scanned
+            counts['existing_duplicates'] = connection.execute('SELECT COUNT(*) FROM new_entries n WHERE EXISTS '
+                                                               '(SELECT 1 FROM members m WHERE m.enum_id = ? AND m.name = n.name)', (enum_id,)).fetchone()[0]
+            # Existing members matching new entries: selectable value updated to true unless preserved
+            counts['selectable_updated'] = 0
+            if not preserve_selectable_value:
+                counts['selectable_updated'] = connection.execute(
+                    "UPDATE members SET selectable = 'true', revision = ?, change = 'selectable' "
+                    "WHERE enum_id = ? AND selectable = 'false' AND name IN (SELECT name FROM new_entries)", (revision, enum_id)).rowcount
+            # Brand new entries: appended after the last member, in the CSV order
+            counts['added'] = connection.execute(
+                "INSERT INTO members SELECT ?, n.name, n.display, n.display_fr, ?, ?, ? + n.seq, n.name_key, n.display_key, ?, 'added' "
+                "FROM new_entries n WHERE NOT EXISTS (SELECT 1 FROM members m WHERE m.enum_id = ? AND m.name = n.name) ORDER BY n.seq",
+                (enum_id, 'false' if force_new_selectable_false else 'true', '0' if single_sort_order_value else '', first_position, revision, enum_id)).rowcount
+            # Sort order: only the members whose value changes are updated (and written to the delta)
+            if single_sort_order_value:
+                counts['sort_order_updated'] = 0
+                if sort_policy != 'single':
+                    counts['sort_order_updated'] = connection.execute(
+                        "UPDATE members SET sort_order = '0', revision = ?, change = 'sort_order' WHERE enum_id = ? AND sort_order IS NOT '0'",
+                        (revision, enum_id)).rowcount
+                sort_policy = 'single'
+            else:
+                counts['sort_order_updated'] = self._rank_members(enum_id, revision, sort_by, sort_policy) - counts['added']
+                sort_policy = sort_by
+            options = ' '.join(option for option, used in [(f'-s {sort_by}', True), ('-pes', preserve_selectable_value),
+                                                           ('-f', force_new_selectable_false), ('-sso', single_sort_order_value)] if used)
+            connection.execute('INSERT INTO upserts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               (enum_id, revision, os.path.abspath(csv_file) if csv_file else '', datetime.datetime.now().isoformat(timespec='seconds'),
+                                options) + tuple(counts[count] for count in UPSERT_COUNTS))
+            connection.execute('UPDATE enums SET revision = ?, next_position = ?, sort_policy = ? WHERE enum_id = ?',
+                               (revision, first_position + len(unique_entries), sort_policy, enum_id))
+        except BaseException:
+            connection.rollback()
+            raise
+        if dry_run:
+            connection.rollback()
+        else:
+            connection.commit()
+        return revision, counts
+
+    def _rank_members(self, enum_id, revision, sort_by, sort_policy):
+        # Sort order recalculated as the rank of each member by sort key then position (stable sort of the merge script), returns the members updated
+        key = SORT_KEYS[sort_by]
+        connection = self.connection
+        if sort_policy == sort_by:
+            # The sort orders already are the ranks of this key: only the members from the first added member on can move,
+            # their ranks follow the sort order of the member just before it
+            start = connection.execute(f"SELECT {key}, position FROM members INDEXED BY members_revision WHERE enum_id = ? AND revision = ? AND change = 'added' "
+                                       f"ORDER BY {key}, position LIMIT 1", (enum_id, revision)).fetchone()
+            if start is None:
+                return 0
+            previous = connection.execute(f"SELECT sort_order FROM members WHERE enum_id = ? AND ({key}, position) < (?, ?) "
+                                          f"ORDER BY {key} DESC, position DESC LIMIT 1", (enum_id,) + start).fetchone()
+            first_rank = int(previous[0]) + 1 if previous else 0
+            rows = connection.execute(f"SELECT name, sort_order FROM members WHERE enum_id = ? AND ({key}, position) >= (?, ?) "
+                                      f"ORDER BY {key}, position", (enum_id,) + start).fetchall()
+        else:
+            first_rank = 0
+            rows = connection.execute(f"SELECT name, sort_order FROM members WHERE enum_id = ? ORDER BY {key}, position", (enum_id,)).fetchall()
+        changed = [(str(rank), name) for rank, (name, sort_order) in enumerate(rows, first_rank) if sort_order != str(rank)]
+        connection.executemany("UPDATE members SET sort_order = ?, change = CASE WHEN revision = ? THEN change ELSE 'sort_order' END, revision = ? "
+                               "WHERE enum_id = ? AND name = ?", ((sort_order, revision, revision, enum_id, name) for sort_order, name in changed))
+        return len(changed)
+
+    def entries(self, enum_name, revision=None, preserve_order=False):
+        # Entry dicts of the merge scripts: every member, or the members changed by one revision; per name or in the store order
+        enum_id = self.enum(enum_name)[0]
+        order = 'position' if preserve_order else 'name_key, position'
+        condition, parameters = ('enum_id = ?', (enum_id,)) if revision is None else ('enum_id = ? AND revision = ?', (enum_id, revision))
+        cursor = self.connection.execute(f'SELECT name, display, display_fr, selectable, sort_order FROM members WHERE {condition} ORDER BY {order}', parameters)
+        for name, display, display_fr, selectable, sort_order in cursor:
+            yield {'name': name, 'displayName': display, 'csvlocale_fr': display_fr, 'selectable': selectable, 'sort_order': sort_order}
+
+    def layout(self, enum_name):
+        # Layout of the seeded XML file, for enum_xml_writer.write_enum_file
+        doctype, root_tag, head, tail = self.connection.execute('SELECT doctype, root_tag, head, tail FROM enums WHERE name = ?', (enum_name,)).fetchone()
+        return doctype, root_tag, layout_elements(head), layout_elements(tail)
+
+    def write_load_file(self, enum_name, output_file, revision=None, preserve_order=False):
+        # Complete load file of the enumeration (revision None) or delta load file of one revision, returns the number of members written
+        entries = list(self.entries(enum_name, revision, preserve_order))
+        if entries or revision is None:
+            write_enum_file(output_file, self.layout(enum_name), entries)
+        return len(entries)
+
+    def list_enums(self):
+        # (name, member count, revision, last upsert date) of each enumeration
+        return self.connection.execute('SELECT e.name, (SELECT COUNT(*) FROM members m WHERE m.enum_id = e.enum_id), e.revision, '
+                                       "COALESCE((SELECT applied FROM upserts u WHERE u.enum_id = e.enum_id AND u.revision = e.revision), '') "
+                                       'FROM enums e ORDER BY e.name').fetchall()
+
+def write_delta(store, enum_name, revision, output_folder, preserve_order):
+    delta_file = os.path.join(output_folder, f'{enum_name}_delta_{revision}.xml')
+    written = store.write_load_file(enum_name, delta_file, revision, preserve_order)
+    if written:
+        print(f"{written} changed members written to {delta_file}")
+    else:
+        print(f"Revision {revision} of {enum_name} changed no member, no delta load file written")
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent SQLite store of enumerations with incremental upsert of new entries.')
+    parser.add_argument('-d', '--database', type=str, required=True, help='Path to the SQLite enum store (created if it does not exist).')
+    parser.add_argument('-i', '--input_xml', type=str, nargs='+', help="OPTIONAL (seed) XML Enumerated Values files or folders of XML files, each enumeration is (re)loaded in the store")
+    parser.add_argument('-e', '--enum_name', type=str, help="OPTIONAL (required with -n, -r and -a) Name of the enumeration (csvname of its csvBeginEnumDefView)")
+    parser.add_argument('-n', '--new_entries_csv_file', type=str, help="OPTIONAL (upsert) Path to the CSV file with new entries, header row [name~displayName~csvlocale_fr]")
+    parser.add_argument('-o', '--output_folder', type=str, default='.', help="OPTIONAL (default is the current folder) Folder of the delta and complete load files")
+    parser.add_argument('-s', '--sort_by', type=str, choices=['name', 'displayName'], default='name', help="OPTIONAL (default is 'name') Sort entries by 'name' or 'displayName' to recalculate the sort order.")
+    parser.add_argument('-po', '--preserve_original_order', action='store_true', help="OPTIONAL (if -po not used, members written per name) Write the members in the store order (original order, new ones at the end)")
+    parser.add_argument('-pes', '--preserve_existing_selectable_value', action='store_true', help="OPTIONAL (if -pes not used, selectable value updated to true on existing entries matching new entries) Preserve the original selectable value of existing entries matching new entries")
+    parser.add_argument('-f', '--force_new_selectable_false', action='store_true', help="OPTIONAL (if -f not used, selectable value set to true on new entries added to existing) Force selectable value at false for the new entries added to existing entries")
+    parser.add_argument('-sso', '--single_sort_order_value', action='store_true', help="OPTIONAL (if -sso not used, sort order is recalculated) Force sort order value to be equal to same value hard-coded to 0")
+    parser.add_argument('-r', '--revision', type=int, help="OPTIONAL (default is the last upsert) Write the delta load file of the members changed by this upsert")
+    parser.add_argument('-a', '--all_members', action='store_true', help="OPTIONAL Write the complete load file of the enumeration (every member of the store)")
+    parser.add_argument('--dry_run', action='store_true', help="OPTIONAL Check the CSV file against the store and print the counts, nothing is saved or written")
+    parser.add_argument('-l', '--list', action='store_true', help="OPTIONAL List the enumerations of the store with their member count and last upsert")
+    parser.add_argument('-c', '--model_cache', type=str, help="OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again")
+
+    args = parser.parse_args()
+    if (args.new_entries_csv_file or args.revision is not None or args.all_members) and not args.enum_name:
+        parser.error('-e/--enum_name is required with -n, -r and -a')
+    if args.model_cache:
+        configure_model_cache(args.model_cache)
+    store = EnumStore(args.database)
+    try:
+        for xml_file in list_xml_files(args.input_xml or []):
+            start = time.perf_counter()
+            try:
+                seeded = store.seed(xml_file)
+            except etree.XMLSyntaxError as e:
+                print(f"Error parsing XML file {xml_file}: {e}")
+                continue
+            if seeded is None:
+                print(f"{xml_file}: no enumeration member, skipped")
+            else:
+                print(f"{seeded[0]}: {seeded[1]} members seeded from {xml_file} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+        if args.enum_name and (args.new_entries_csv_file or args.revision is not None or args.all_members or not args.input_xml):
+            if not os.path.exists(args.output_folder) and not args.dry_run:
+                os.makedirs(args.output_folder)
+            revision = args.revision
+            if args.new_entries_csv_file:
+                start = time.perf_counter()
+                new_entries = read_csv_entries(args.new_entries_csv_file)
+                revision, counts = store.upsert(args.enum_name, new_entries, args.sort_by, args.preserve_existing_selectable_value,
+                                                args.force_new_selectable_false, args.single_sort_order_value, args.new_entries_csv_file, args.dry_run)
+                print(f"{args.enum_name} revision {revision}{' (dry run, not saved)' if args.dry_run else ''}: "
+                      + ', '.join(f'{count} {counts[count]}' for count in UPSERT_COUNTS) + f" ({(time.perf_counter() - start) * 1000:.1f} ms)")
+            elif revision is None and not args.all_members:
+                revision = store.enum(args.enum_name)[1]
+                if not revision:
+                    print(f"{args.enum_name} has no upsert yet, no delta load file written")
+            if args.all_members and not args.dry_run:
+                output_file = os.path.join(args.output_folder, f'{args.enum_name}.xml')
+                print(f"{store.write_load_file(args.enum_name, output_file, None, args.preserve_original_order)} members written to {output_file}")
+            if revision and not args.dry_run:
+                write_delta(store, args.enum_name, revision, args.output_folder, args.preserve_original_order)
+
+        if args.list:
+            print(f"{'Enumeration':<40} {'Members':>8} {'Revision':>8}  Last upsert")
+            for name, member_count, revision, applied in store.list_enums():
+                print(f"{name:<40} {member_count:>8} {revision:>8}  {applied}")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+File: enum_xml_writer.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Streaming writer of a complete Windchill Enumerated Values load file, used by the enum merge scripts
+(merge_xml_enumerated_values_with_new_entries.py, merge_two_xml_enumerated_values.py) next to their output_merged_file.txt fragment.
+The file is written with lxml etree.xmlfile: XML declaration, doctype and root of the source enum file, its csvBeginEnumDefView header and
+enumeration properties, the merged members, then the elements following the last member (csvEndEnumDefView). Each member block is built as
+small elements, serialized and dropped, so the output is never held in memory as a whole. lxml escapes every value (&, <, >, quotes).
+The member blocks have the same elements and indentation as the output_merged_file.txt fragment (format_entry_block).
+write_enum_file takes the layout itself, so enum_store.py writes its delta load files from the layout kept in the store.
+"""
+
+from lxml import etree
+from enum_member_reader import read_enum_layout
+
+MEMBER_HANDLER = 'com.ptc.core.lwc.server.BaseDefinitionLoader.'
+INDENT = '\n   '
+CHILD_INDENT = '\n      '
+
+def handler_element(tag, handler, children=()):
+    # Load file element: handler attribute, then (child tag, text) children on their own indented line
+    element = etree.Element(tag, handler=MEMBER_HANDLER + handler)
+    previous = None
+    for child_tag, text in children:
+        child = etree.SubElement(element, child_tag)
+        child.text = text
+        if previous is None:
+            element.text = CHILD_INDENT
+        else:
+            previous.tail = CHILD_INDENT
+        previous = child
+    if previous is not None:
+        previous.tail = INDENT
+    return element
+
+def member_elements(entry):
+    # Elements of one member, same content as format_entry_block: name, displayName (and FR label), selectable and sort_order
+    display_name = [('csvname', 'displayName'), ('csvisDefault', 'false'), ('csvvalue', entry.get('displayName', ''))]
+    if entry.get('csvlocale_fr', ''):
+        display_name.append(('csvlocale_fr', entry['csvlocale_fr']))
+    return [
+        handler_element('csvBeginEnumMemberView', 'beginProcessEnumMembership', [('csvname', entry['name'])]),
+        handler_element('csvPropertyValue', 'processEnumEntryPropertyValue', display_name),
+        handler_element('csvPropertyValue', 'processEnumEntryPropertyValue', [('csvname', 'selectable'), ('csvisDefault', 'false'), ('csvvalue', entry.get('selectable', 'true'))]),
+        handler_element('csvPropertyValue', 'processEnumMembershipPropertyValue', [('csvname', 'sort_order'), ('csvisDefault', 'false'), ('csvvalue', entry['sort_order'])]),
+        handler_element('csvEndEnumMemberView', 'endProcessEnumMembership'),
+    ]
+
+def write_enum_xml(output_file, source_xml_file, entries):
+    # Complete enum load file: the layout of source_xml_file around the merged entries (entry dicts of the merge scripts), written as a stream
+    write_enum_file(output_file, read_enum_layout(source_xml_file), entries)
+
+def write_enum_file(output_file, layout, entries):
+    # Enum load file from a layout (doctype, root tag, head elements, tail elements) of read_enum_layout and entry dicts
+    doctype, root_tag, head, tail = layout
+    with open(output_file, 'wb') as file:
+        with etree.xmlfile(file, encoding='UTF-8') as xf:
+            xf.write_declaration()
+            if doctype:
+                xf.write_doctype(doctype)
+            with xf.element(root_tag or 'NmLoader'):
+                for element in head:
+                    xf.write(INDENT, element)
+                for entry in entries:
+                    for element in member_elements(entry):
+                        xf.write(INDENT, element)
+                for element in tail:
+                    xf.write(INDENT, element)
+                xf.write('\n')
+        file.write(b'\n')  # final line break, after the root element
@@ -3,15 +3,18 @@ File: extract_xml_enumerated_values_to_csv.py
 Author: Raphael Leveque
 Date: February, 2024
 Description: Extracts properties of enumerated values from an XML file (Windchill Enumerated Values definition) and generates an output CSV file. Each enumerated value's properties, such as name, displayName, selectable, and sort_order, including their csvisDefault and csvvalue, are captured and written to the CSV with '~' as the delimiter.
+The members are read in one streaming pass by enum_member_reader.py, shared with the enum merge scripts; the parsed model cache
+(windchill/datamodel_extractor/parsed_model_cache.py) is used when the WT_MODEL_CACHE environment variable names its folder.
 """
 
 import csv
-import xml.etree.ElementTree as ET
 import sys
+from lxml import etree
+from enum_member_reader import read_enum_members
 
 def extract_enumerated_values_properties(xml_file_path):
     """
-    Extracts properties of enumerated values from the provided XML file.
+    Extracts properties of enumerated values from the provided XML file, read in one streaming pass by enum_member_reader.py.
     
     Parameters:
         xml_file_path (str): Path to the XML file.
@@ -20,38 +23,28 @@ def extract_enumerated_values_properties(xml_file_path):
         list of dicts: List containing dictionaries of properties for each enumerated value.
     """
     try:
-        tree = ET.parse(xml_file_path)
-    except ET.ParseError as e:
+        members = read_enum_members(xml_file_path)
+    except etree.XMLSyntaxError as e:
         print(f"Error parsing XML file: {e}")
         sys.exit(1)
-        
-    root = tree.getroot()
-    enumerated_values = []
-    current_enum = None
 
-    for elem in root.iter():
-        if elem.tag == 'csvBeginEnumMemberView':
-            current_enum = {
-                'name': elem.find('csvname').text,
-                'displayName csvisDefault': '',
-                'displayName csvvalue': '',
-                'displayName csvlocale_fr': '',
-                'selectable csvisDefault': '',
-                'selectable csvvalue': '',
-                'sort_order csvisDefault': '',
-                'sort_order csvvalue': '',
-            }
-        elif elem.tag == 'csvPropertyValue' and current_enum is not None:
-            prop_name = elem.find('csvname').text
-            csvisDefault = elem.find('csvisDefault').text if elem.find('csvisDefault') is not None else ''
-            csvvalue = elem.find('csvvalue').text if elem.find('csvvalue') is not None else ''
-            csvlocale_fr = elem.find('csvlocale_fr').text if elem.find('csvlocale_fr') is not None else ''
+    enumerated_values = []
+    for member in members:
+        current_enum = {
+            'name': member.name,
+            'displayName csvisDefault': '',
+            'displayName csvvalue': '',
+            'displayName csvlocale_fr': '',
+            'selectable csvisDefault': '',
+            'selectable csvvalue': '',
+            'sort_order csvisDefault': '',
+            'sort_order csvvalue': '',
+        }
+        for prop_name, csvisDefault, csvvalue, csvlocale_fr in member.properties:
             current_enum[f'{prop_name} csvisDefault'] = csvisDefault
             current_enum[f'{prop_name} csvvalue'] = csvvalue
             current_enum[f'{prop_name} csvlocale_fr'] = csvlocale_fr
-        elif elem.tag == 'csvEndEnumMemberView' and current_enum is not None:
-            enumerated_values.append(current_enum)
-            current_enum = None
+        enumerated_values.append(current_enum)
 
     return enumerated_values
 
@@ -0,0 +1,205 @@
+"""
+File: merge_n_xml_enumerated_values.py
+Author: Raphael Leveque
+Date: October, 2026
+Description: Merge N enumeration definitions.
+options:
+  -h, --help            show this help message and exit
+  -i INPUT_XML_FILES [INPUT_XML_FILES ...], --input_xml_files INPUT_XML_FILES [INPUT_XML_FILES ...]
+                        Paths to the input XML files, in source order (at least 2).
+  -o OUTPUT_FOLDER, --output_folder OUTPUT_FOLDER
+                        Path for the output folder.
+  -s {name,displayName}, --sort_by {name,displayName}
+                        OPTIONAL (default is 'name') Sort entries by 'name' or 'displayName'.
+  -p, --preserve_original_order
+                        OPTIONAL (if -p not used, reorder all entries per name) Preserve the original order of entries (order of the first source holding them)
+  -P FIELD=POLICY, --policy FIELD=POLICY
+                        OPTIONAL (default is 'last' for every field) Conflict policy of a field (displayName, csvlocale_fr, selectable), can be repeated:
+                        first, last, non_empty (last non empty value) or, for selectable only, or (true when one source is true)
+  -x, --write_xml
+                        OPTIONAL (if -x not used, only the output_merged_file.txt fragment is written) Also write output_merged_file.xml: complete enum load file
+  -c MODEL_CACHE, --model_cache MODEL_CACHE
+                        OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again
+1°) This script merges the enumeration definitions of K XML files (for example the CUSTOMER export, the POWER export and a migration delta), then
+outputs the merged enumeration to a new file. With two files and the default policies, the output is the same as merge_two_xml_enumerated_values.py.
+- Input XML Enumerated Values files: each contains one EnumDefView entry with occurrences of EnumMemberView members (export file of enumerated values from Windchill)
+- Output file: list of merged EnumMemberView members in a text file which can be used to replace original XML Enumerated Values
+- Output XML file (-x): output_merged_file.xml, complete enum load file (header and csvBeginEnumDefView of the first XML file, merged members,
+  csvEndEnumDefView) written as a stream by enum_xml_writer.py, with every value escaped: it can be loaded as is
+2°) Ordered merge: the members of each file are sorted once on their precomputed collation key (lower case name), then the K sorted lists are merged
+with a heap, so all the occurrences of a member come together and the merged members come out in name order. Each field of a member found in
+several files (or twice in one file) is resolved with its policy, in source order, and written once. The sort order is recalculated per 'name' or 'displayName' like merge_two_xml_enumerated_values.py.
+3°) It generates additional log files
+- conflicts.txt: one row per member and field whose values disagree across the files: name~field~policy~merged value~value of each file
+  ((absent) when the file does not hold the member); written on every run, with its header row only when the files agree
+Example:
+python .\\windchill\\enums\\merge_n_xml_enumerated_values.py -i .\\CUSTOMER\\Enums\\Color.xml .\\inputSEP\\Enums\\POWERColor.xml .\\wave1\\Color_delta.xml -o .\\wave1\\output -P displayName=non_empty -P selectable=or
+"""
+
+import argparse
+import heapq
+import os
+import sys
+from itertools import groupby
+from operator import itemgetter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datamodel_extractor'))
+from parsed_model_cache import configure_model_cache
+from enum_member_reader import read_enum_members
+from enum_xml_writer import write_enum_xml
+from merge_two_xml_enumerated_values import format_entry_block
+
+MERGED_FIELDS = ['displayName', 'csvlocale_fr', 'selectable']
+ABSENT = '(absent)'  # conflicts.txt value of a file not holding the member
+
+def last_non_empty(values):
+    non_empty = [value for value in values if value]
+    return non_empty[-1] if non_empty else values[-1]
+
+def selectable_or(values):
+    return 'true' if any(value.lower() == 'true' for value in values) else last_non_empty(values)
+
+# Conflict policies: the merged value from the values of the files holding the member, in source order
+POLICIES = {
+    'first': lambda values: values[0],
+    'last': lambda values: values[-1],
+    'non_empty': last_non_empty,
+    'or': selectable_or,
+}
+
+def parse_policies(policy_options):
+    # FIELD=POLICY options over the default 'last' policy of every field
+    policies = {field: 'last' for field in MERGED_FIELDS}
+    for option in policy_options or []:
+        field, _, policy = option.partition('=')
+        if field not in policies:
+            raise ValueError(f"Policy {option}: field must be one of {', '.join(MERGED_FIELDS)}")
+        if policy not in POLICIES or (policy == 'or' and field != 'selectable'):
+            raise ValueError(f"Policy {option}: policy must be first, last or non_empty (or: selectable only)")
+        policies[field] = policy
+    return policies
+
+def sorted_source(source_index, members):
+    # Members of one file sorted on their precomputed collation key: (lower case name, name, source, position, entry) tuples,
+    # compared as they are since (source, position) is unique
+    records = [(member.name.lower(), member.name, source_index, position, member.entry()) for position, member in enumerate(members)]
+    records.sort()
+    return records
+
+def merge_member(occurrences, policies):
+    # Merged entry of a member found several times, each field resolved with its policy in source order, and its conflicts
+    merged = dict(occurrences[0][4])
+    conflicts = []
+    for field in MERGED_FIELDS:
+        values = [occurrence[4][field] for occurrence in occurrences]
+        merged[field] = POLICIES[policies[field]](values)
+        if len(set(values)) > 1:
+            conflicts.append((merged['name'], field, merged[field], occurrences))
+    return merged, conflicts
+
+def merge_enumerations(xml_files, policies):
+    # Heap merge of the sorted files: the merged entries come out per name then first occurrence (order of merge_two_xml_enumerated_values.py),
+    # returns them with their first occurrences (source, position) and the conflicts
+    sources = [sorted_source(source_index, read_enum_members(xml_file)) for source_index, xml_file in enumerate(xml_files)]
+    entries = []
+    first_occurrences = []
+    conflicts = []
+    run_start = 0  # first member with the current lower case name: such members are ordered by first occurrence, not by name
+    run_key = None
+    for _, occurrences in groupby(heapq.merge(*sources), key=itemgetter(1)):
+        first = next(occurrences)
+        others = list(occurrences)
+        if others:
+            entry, member_conflicts = merge_member([first] + others, policies)
+            conflicts.extend(member_conflicts)
+        else:
+            entry = first[4]
+        if first[0] != run_key:
+            sort_run(entries, first_occurrences, run_start)
+            run_start = len(entries)
+            run_key = first[0]
+        entries.append(entry)
+        first_occurrences.append(first[2:4])
+    sort_run(entries, first_occurrences, run_start)
+    return entries, first_occurrences, conflicts
+
+def sort_run(entries, first_occurrences, run_start):
+    # Members from run_start on (same lower case name) ordered by first occurrence
+    if len(entries) - run_start > 1:
+        run = sorted(zip(first_occurrences[run_start:], entries[run_start:]), key=itemgetter(0))
+        first_occurrences[run_start:] = [member[0] for member in run]
+        entries[run_start:] = [member[1] for member in run]
+
+def log_conflicts(conflicts, xml_files, policies, filename):
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write('~'.join(['name', 'field', 'policy', 'merged'] + xml_files) + '\n')
+        for name, field, merged_value, occurrences in conflicts:
+            values = [ABSENT] * len(xml_files)
+            for occurrence in occurrences:
+                values[occurrence[2]] = occurrence[4][field]
+            file.write('~'.join([name, field, policies[field], merged_value] + values) + '\n')
+
+def generate_output(xml_files, output_folder, sort_by, preserve_order, policies, write_xml=False):
+    # Returns the counts of the merge: members of each file, merged members and conflicts
+    if sort_by not in ['name', 'displayName']:
+        raise ValueError("sort_by argument must be 'name' or 'displayName'")
+    entries, first_occurrences, conflicts = merge_enumerations(xml_files, policies)
+
+    # Update sort_order based on sorted position: the merged entries already are in name order
+    if sort_by == 'name':
+        sorted_entries = entries
+    else:
+        order = sorted(range(len(entries)), key=lambda index: (entries[index][sort_by].lower(), first_occurrences[index]))
+        sorted_entries = [entries[index] for index in order]
+    for index, entry in enumerate(sorted_entries):
+        entry['sort_order'] = str(index)
+
+    # If preserving order, entries of the first file in their order, then the entries of each next file not found before
+    if preserve_order:
+        order = sorted(range(len(entries)), key=lambda index: first_occurrences[index])
+        entries = [entries[index] for index in order]
+
+    # Writing to file
+    output_file_path = os.path.join(output_folder, 'output_merged_file.txt')
+    with open(output_file_path, 'w', encoding='utf-8') as file:
+        for entry in entries:
+            file.write(format_entry_block(entry) + "\n")
+
+    # Optionally, the complete enum load file around the merged entries (header of the first XML file)
+    if write_xml:
+        write_enum_xml(os.path.join(output_folder, 'output_merged_file.xml'), xml_files[0], entries)
+
+    # Always written, header only without conflict, so a previous run's conflicts are not left in the output folder
+    log_conflicts(conflicts, xml_files, policies, os.path.join(output_folder, 'conflicts.txt'))
+    return {'merged': len(entries), 'conflicts': len(conflicts), 'conflicting_members': len({conflict[0] for conflict in conflicts})}
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge N XML enumeration definitions.')
+    parser.add_argument('-i', '--input_xml_files', type=str, nargs='+', required=True, help='Paths to the input XML files, in source order (at least 2).')
+    parser.add_argument('-o', '--output_folder', type=str, required=True, help='Path for the output folder.')
+    parser.add_argument('-s', '--sort_by', type=str, choices=['name', 'displayName'], default='name', help="OPTIONAL (default is 'name') Sort entries by 'name' or 'displayName'.")
+    parser.add_argument('-p', '--preserve_original_order', action='store_true', help="OPTIONAL (if -p not used, reorder all entries per name) Preserve the original order of entries (order of the first source holding them)")
+    parser.add_argument('-P', '--policy', type=str, action='append', metavar='FIELD=POLICY', help="OPTIONAL (default is 'last' for every field) Conflict policy of a field (displayName, csvlocale_fr, selectable), can be repeated: first, last, non_empty (last non empty value) or, for selectable only, or (true when one source is true)")
+    parser.add_argument('-x', '--write_xml', action='store_true', help="OPTIONAL (if -x not used, only the output_merged_file.txt fragment is written) Also write output_merged_file.xml: complete enum load file with the header of the first XML file and the merged members")
+    parser.add_argument('-c', '--model_cache', type=str, help="OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again")
+
+    args = parser.parse_args()
+    if len(args.input_xml_files) < 2:
+        parser.error('-i/--input_xml_files needs at least 2 XML files')
+    try:
+        policies = parse_policies(args.policy)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.model_cache:
+        configure_model_cache(args.model_cache)
+    # Ensure the output folder exists
+    if not os.path.exists(args.output_folder):
+        os.makedirs(args.output_folder)
+
+    counts = generate_output(args.input_xml_files, args.output_folder, args.sort_by, args.preserve_original_order, policies, args.write_xml)
+    print(f"{counts['merged']} merged members from {len(args.input_xml_files)} files, "
+          f"{counts['conflicts']} field conflicts on {counts['conflicting_members']} members"
+          + (f" (see {os.path.join(args.output_folder, 'conflicts.txt')})" if counts['conflicts'] else ''))
+
+if __name__ == "__main__":
+    main()
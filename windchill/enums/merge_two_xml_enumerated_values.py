@@ -16,10 +16,16 @@ options:
   -p, --preserve_original_order
                         OPTIONAL (if -p not used, reorder all entries per name) Preserve the original order of entries & appending    
                         new ones at the end
+  -x, --write_xml
+                        OPTIONAL (if -x not used, only the output_merged_file.txt fragment is written) Also write output_merged_file.xml: complete enum load file
+  -c MODEL_CACHE, --model_cache MODEL_CACHE
+                        OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again
 1°) This script merges enumeration definitions from an "existing" XML file with entries from another "new" XML file, then outputs the updated merged enumeration to a new file. It supports sorting by name or displayName, and optionally preserves the original order of the "existing" XML file entries.
 - Input "existing" XML Enumerated Values file: contains one EnumDefView entry with occurrences of EnumMemberView members (export file of enumerated values from Windchill)
 - Input "new" XML Enumerated Values file: contains one EnumDefView entry with occurrences of EnumMemberView members (export file of enumerated values from Windchill) to insert into "existing" XML file
 - Output file: list of merged EnumMemberView members in a text file which can be used to replace original XML Enumerated Values
+- Output XML file (-x): output_merged_file.xml, complete enum load file (header and csvBeginEnumDefView of the "existing" XML file, merged members,
+  csvEndEnumDefView) written as a stream by enum_xml_writer.py, with every value escaped: it can be loaded as is
 2°) It generate additional log files
 - existing_entries_log_file.txt: logs input "existing" XML Enumerated Values file
 - new_entries_log_file.txt: logs input "new" XML Enumerated Values file
@@ -28,50 +34,18 @@ options:
 
 import csv
 import argparse
-from lxml import etree
 import json
 import os
+import sys
 
-def normalize_xml(xml_content):
-    replacements = [
-            ('</csvBeginEnumDefView>', ''),
-            ('</csvBeginEnumMemberView>', ''),
-            ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
-            ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
-            ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
-            ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
-    ]
-    for old, new in replacements:
-        xml_content = xml_content.replace(old, new)
-    return xml_content
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datamodel_extractor'))
+from parsed_model_cache import configure_model_cache
+from enum_member_reader import read_enum_members
+from enum_xml_writer import write_enum_xml
 
 def parse_xml(entries_file, entries_log_file):
-    with open(entries_file, 'r', encoding='utf-8') as file:
-        xml_content = file.read()
-
-    normalized_xml = normalize_xml(xml_content)
-    root = etree.fromstring(normalized_xml.encode('utf-8'))
-
-    extracted_data = []
-
-    for enum_member in root.xpath("//csvBeginEnumMemberView"):
-        name = enum_member.xpath("./csvname/text()")[0]
-        displayName = enum_member.xpath(".//csvPropertyValue[csvname='displayName']/csvvalue/text()")
-        displayName = displayName[0] if displayName else ''
-        selectable = enum_member.xpath(".//csvPropertyValue[csvname='selectable']/csvvalue/text()")
-        selectable = selectable[0] if selectable else ''
-        sort_order = enum_member.xpath(".//csvPropertyValue[csvname='sort_order']/csvvalue/text()")
-        sort_order = sort_order[0] if sort_order else ''
-        locale_fr = enum_member.xpath(".//csvPropertyValue[csvname='displayName']/csvlocale_fr/text()")
-        locale_fr = locale_fr[0] if locale_fr else ''
-
-        extracted_data.append({
-            'name': name,
-            'displayName': displayName,
-            'selectable': selectable,
-            'sort_order': sort_order,
-            'csvlocale_fr': locale_fr
-        })
+    # Members read in one streaming pass, shared with the other enum scripts (see enum_member_reader.py)
+    extracted_data = [member.entry() for member in read_enum_members(entries_file)]
 
     log_xml_entries(extracted_data,entries_log_file)
 
@@ -84,8 +58,6 @@ def log_xml_entries (entries, filename):
                 f.write(f"{entry['name']}~{entry['displayName']}~{entry['selectable']}~{entry['sort_order']}~{entry['csvlocale_fr']}\n")
             json.dump(entries, f, ensure_ascii=False, indent=4)
 
-from lxml import etree
-
 def merge_existing_new_entries_to_existing_entries(existing_entries, new_entries):
     # Convert existing entries to a dictionary for faster lookup
     #  dictionary where each key is the unique 'name' of an entry, and each value is the corresponding entry dictionary
@@ -109,7 +81,7 @@ def merge_existing_new_entries_to_existing_entries(existing_entries, new_entries
 
     return existing_entries
 
-def generate_output(existing_entries, existing_new_entries, output_folder, sort_by, preserve_order):
+def generate_output(existing_entries, existing_new_entries, output_folder, sort_by, preserve_order, source_xml_file=None):
     # Combine entries 
     combined_entries = merge_existing_new_entries_to_existing_entries(existing_entries,existing_new_entries)
 
@@ -132,6 +104,10 @@ def generate_output(existing_entries, existing_new_entries, output_folder, sort_
         for entry in combined_entries:
             file.write(format_entry_block(entry) + "\n")
 
+    # Optionally, the complete enum load file around the merged entries (header of source_xml_file)
+    if source_xml_file:
+        write_enum_xml(os.path.join(output_folder, 'output_merged_file.xml'), source_xml_file, combined_entries)
+
 def format_entry_block(entry_details):
     # Always include 'selectable' with a default of "true" if not specified
     selectable_value = entry_details.get('selectable', 'true')
@@ -174,8 +150,12 @@ def main():
     parser.add_argument('-o', '--output_folder', type=str, required=True, help='Path for the output folder.')
     parser.add_argument('-s', '--sort_by', type=str, choices=['name', 'displayName'], default='name', help="OPTIONAL (default is 'name') Sort entries by 'name' or 'displayName'.")
     parser.add_argument('-p', '--preserve_original_order', action='store_true', help="OPTIONAL (if -p not used, reorder all entries per name) Preserve the original order of entries & appending new ones at the end")
+    parser.add_argument('-x', '--write_xml', action='store_true', help="OPTIONAL (if -x not used, only the output_merged_file.txt fragment is written) Also write output_merged_file.xml: complete enum load file with the header of the existing XML file and the merged members")
+    parser.add_argument('-c', '--model_cache', type=str, help="OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again")
     
     args = parser.parse_args()
+    if args.model_cache:
+        configure_model_cache(args.model_cache)
     # Ensure the output folder exists
     output_folder = args.output_folder
     if not os.path.exists(output_folder):
@@ -185,7 +165,7 @@ def main():
     existing_entries = parse_xml(args.existing_entries_file,existing_entries_log_file)
     new_entries_log_file = os.path.join(args.output_folder, 'new_entries_log_file.txt')
     existing_new_entries = parse_xml(args.new_entries_file,new_entries_log_file)
-    generate_output(existing_entries, existing_new_entries, args.output_folder, args.sort_by, args.preserve_original_order)
+    generate_output(existing_entries, existing_new_entries, args.output_folder, args.sort_by, args.preserve_original_order, args.existing_entries_file if args.write_xml else None)
 
 if __name__ == "__main__":
     main()
@@ -23,11 +23,21 @@ options:
                         OPTIONAL (if -f not used, selectable value set to true on new entries added to existing) Force selectable value at false for the new entries added to existing entries
   -sso, --single_sort_order_value
                         OPTIONAL (if -sso not used, sort order is recalculated) Force sort order value to be equal to same value hard-coded to 0
+  -x, --write_xml
+                        OPTIONAL (if -x not used, only the output_merged_file.txt fragment is written) Also write output_merged_file.xml: complete enum load file
+  -c MODEL_CACHE, --model_cache MODEL_CACHE
+                        OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again
+  -b BATCH_MANIFEST, --batch_manifest BATCH_MANIFEST
+                        OPTIONAL (replaces -i and -n) '~' delimited manifest of the merges to run in one process
+  -j JOBS, --jobs JOBS
+                        OPTIONAL (default is 1) Number of worker processes running the merges of -b
 
 1°) This script merges enumeration definitions from an XML file with new entries from a CSV file, then outputs the updated enumeration to a new file. It supports sorting by name or displayName, and optionally preserves the original order of existing entries.
 - Input XML Enumerated Values: contains one EnumDefView entry with occurrences of EnumMemberView members (export file of enumerated values from Windchill)
 - Input CSV file: csv file with header row [name~displayName~csvlocale_fr] of new enumeration members to insert into xml file
 - Output file: list of merged EnumMemberView members in a text file which can be used to replace original XML Enumerated Values
+- Output XML file (-x): output_merged_file.xml, complete enum load file (header and csvBeginEnumDefView of the input XML file, merged members,
+  csvEndEnumDefView) written as a stream by enum_xml_writer.py, with every value escaped: it can be loaded as is
 2°) It also support management of duplicates and output additional log files
 - extracted_xml.txt: logs input xml file content into csv and json
 - extracted_new_entries.txt: logs input csv file into csv
@@ -37,6 +47,15 @@ options:
 - updated_selectable_entries.txt: logs the existing entries updated from selectable: False to True
 - preserve_selectable_values.txt: logs the existing entries with preserved selectable: False
 
+3°) Batch mode (-b): all the merges of a migration wave run in one process (the interpreter and lxml are loaded once), in parallel with -j
+- Manifest file: csv file with header row [input_xml_file~new_entries_csv_file] and optional columns output_folder, sort_by, preserve_original_order,
+  preserve_existing_selectable_value, force_new_selectable_false, single_sort_order_value (true/false, an empty value takes the command line option)
+  (write_xml: -x for this merge) Relative paths are read from the manifest folder. Each merge is written in -o\\<output_folder>, by default -o\\<XML file name>, with its usual files
+- batch_summary.txt: one row per merge in -o with its status and counts (existing, new_entries, csv_duplicates, existing_duplicates, added,
+  selectable_updated, merged) or its error; a failed merge does not stop the others, the exit code is 1 when one merge failed
+Example:
+python .\\windchill\\enums\\merge_xml_enumerated_values_with_new_entries.py -b .\\wave1\\manifest.csv -o .\\wave1\\output -j 4
+
 List ([]):
 Ordered: Maintains the order in which elements are added.
 Mutable: You can change, add, or remove items.
@@ -56,50 +75,19 @@ Key-Value pairs: Stores data as key-value pairs where each key must be unique.
 
 import csv
 import argparse
-from lxml import etree
 import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def normalize_xml(xml_content):
-    replacements = [
-            ('</csvBeginEnumDefView>', ''),
-            ('</csvBeginEnumMemberView>', ''),
-            ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
-            ('<csvEndEnumMemberView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumMembership"/>', '</csvBeginEnumMemberView>'),
-            ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.TypeDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
-            ('<csvEndEnumDefView handler="com.ptc.core.lwc.server.BaseDefinitionLoader.endProcessEnumerationDefinition"/>', '</csvBeginEnumDefView>'),
-    ]
-    for old, new in replacements:
-        xml_content = xml_content.replace(old, new)
-    return xml_content
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datamodel_extractor'))
+from parsed_model_cache import configure_model_cache
+from enum_member_reader import read_enum_members
+from enum_xml_writer import write_enum_xml
 
 def parse_xml(file_path, extracted_file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        xml_content = file.read()
-
-    normalized_xml = normalize_xml(xml_content)
-    root = etree.fromstring(normalized_xml.encode('utf-8'))
-
-    extracted_data = []
-
-    for enum_member in root.xpath("//csvBeginEnumMemberView"):
-        name = enum_member.xpath("./csvname/text()")[0]
-        displayName = enum_member.xpath(".//csvPropertyValue[csvname='displayName']/csvvalue/text()")
-        displayName = displayName[0] if displayName else ''
-        selectable = enum_member.xpath(".//csvPropertyValue[csvname='selectable']/csvvalue/text()")
-        selectable = selectable[0] if selectable else ''
-        sort_order = enum_member.xpath(".//csvPropertyValue[csvname='sort_order']/csvvalue/text()")
-        sort_order = sort_order[0] if sort_order else ''
-        locale_fr = enum_member.xpath(".//csvPropertyValue[csvname='displayName']/csvlocale_fr/text()")
-        locale_fr = locale_fr[0] if locale_fr else ''
-
-        extracted_data.append({
-            'name': name,
-            'displayName': displayName,
-            'selectable': selectable,
-            'sort_order': sort_order,
-            'csvlocale_fr': locale_fr
-        })
+    # Members read in one streaming pass, shared with the other enum scripts (see enum_member_reader.py)
+    extracted_data = [member.entry() for member in read_enum_members(file_path)]
 
     with open(extracted_file_path, 'w', encoding='utf-8') as f:
             f.write('name~displayName~selectable~sort_order~csvlocale_fr\n')  # Write header
@@ -138,7 +126,7 @@ def log_new_entries (entries, filename):
             csvlocale_fr = entry.get('csvlocale_fr', '')
             file.write(f"{entry['name']}~{entry['displayName']}~{csvlocale_fr}\n")
 
-def remove_duplicates_against_new_entries(output_folder, entries, force_new_selectable_false):
+def remove_duplicates_against_new_entries(output_folder, entries, force_new_selectable_false, counts=None):
     seen = set()
     unique_entries = []
     duplicates = [] # List of duplicates from new entries against new entries
@@ -156,9 +144,11 @@ def remove_duplicates_against_new_entries(output_folder, entries, force_new_sele
         duplicates_against_new_entries_file = os.path.join(output_folder, 'duplicated_values_in_new_entries_csv_file.txt')
         log_duplicates(duplicates, duplicates_against_new_entries_file)
 
+    if counts is not None:
+        counts['csv_duplicates'] = len(duplicates)
     return unique_entries
 
-def remove_duplicates_against_existing(output_folder, existing_entries, new_entries, preserve_selectable_value):
+def remove_duplicates_against_existing(output_folder, existing_entries, new_entries, preserve_selectable_value, counts=None):
     # Convert existing entries to a dictionary for faster lookup
     #  dictionary where each key is the unique 'name' of an entry, and each value is the corresponding entry dictionary
     existing_names = {entry['name']: entry for entry in existing_entries}
@@ -203,6 +193,10 @@ def remove_duplicates_against_existing(output_folder, existing_entries, new_entr
         duplicates_against_existing_file = os.path.join(output_folder, 'duplicated_values_new_entries_against_existing.txt')
         log_duplicates(duplicates, duplicates_against_existing_file)
 
+    if counts is not None:
+        counts['existing_duplicates'] = len(duplicates)
+        counts['selectable_updated'] = len(updated_entries)
+        counts['added'] = len(unique_new_entries)
     # Return list of new entries not found in existing entries, list of duplicated entries between existing and new, list of existing entries with eventually existing selectable updated to true
     return unique_new_entries, list(existing_names.values())
 
@@ -212,12 +206,15 @@ def log_duplicates(duplicates, filename):
             file.write(f"{duplicate['name']}\n")  # Logging only the name for simplicity
             file.write(json.dumps(duplicate, ensure_ascii=False) + "\n")
 
-def generate_output(existing_entries, new_entries, output_folder, sort_by, preserve_order,  preserve_selectable_value, force_new_selectable_false, single_sort_order_value):
+def generate_output(existing_entries, new_entries, output_folder, sort_by, preserve_order,  preserve_selectable_value, force_new_selectable_false, single_sort_order_value, source_xml_file=None):
+    # Returns the counts of the merge: existing and new entries, duplicates, added entries, selectable values updated, merged entries
+    counts = {'existing': len(existing_entries), 'new_entries': len(new_entries)}
+
     # Step 1: Remove duplicates within new_entries
-    new_entries = remove_duplicates_against_new_entries(output_folder, new_entries, force_new_selectable_false)
+    new_entries = remove_duplicates_against_new_entries(output_folder, new_entries, force_new_selectable_false, counts)
 
     # Step 2: Remove duplicates against existing_entries and update existing_entries if needed
-    unique_new_entries, updated_existing_entries = remove_duplicates_against_existing(output_folder, existing_entries, new_entries, preserve_selectable_value)
+    unique_new_entries, updated_existing_entries = remove_duplicates_against_existing(output_folder, existing_entries, new_entries, preserve_selectable_value, counts)
  
     # Use the updated_existing_entries list for further processing
     existing_entries = updated_existing_entries
@@ -253,6 +250,13 @@ def generate_output(existing_entries, new_entries, output_folder, sort_by, prese
         for entry in combined_entries:
             file.write(format_entry_block(entry) + "\n")
 
+    # Optionally, the complete enum load file around the merged entries (header of source_xml_file)
+    if source_xml_file:
+        write_enum_xml(os.path.join(output_folder, 'output_merged_file.xml'), source_xml_file, combined_entries)
+
+    counts['merged'] = len(combined_entries)
+    return counts
+
 def format_entry_block(entry_details):
     # Always include 'selectable' with a default of "true" if not specified
     selectable_value = entry_details.get('selectable', 'true')
@@ -288,28 +292,120 @@ def format_entry_block(entry_details):
     # No additional processing needed for indentation
     return entry_block
 
+def merge_enumeration(input_xml_file, new_entries_csv_file, output_folder, sort_by='name', preserve_original_order=False, preserve_existing_selectable_value=False, force_new_selectable_false=False, single_sort_order_value=False, write_xml=False):
+    # One merge: output_merged_file.txt (and output_merged_file.xml with write_xml) and the log files are written in output_folder, returns the counts of generate_output
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    extracted_xml_file = os.path.join(output_folder, 'extracted_xml.txt')
+    existing_entries = parse_xml(input_xml_file,extracted_xml_file)
+    extracted_new_entries_file_path = os.path.join(output_folder, 'extracted_new_entries.txt')
+    new_entries = read_new_entries(new_entries_csv_file,extracted_new_entries_file_path)
+    return generate_output(existing_entries, new_entries, output_folder, sort_by, preserve_original_order, preserve_existing_selectable_value, force_new_selectable_false, single_sort_order_value, input_xml_file if write_xml else None)
+
+# Batch manifest columns: the two files are required, the other columns are optional (empty value: option of the command line)
+MANIFEST_FILE_COLUMNS = ['input_xml_file', 'new_entries_csv_file']
+MANIFEST_FLAG_COLUMNS = ['preserve_original_order', 'preserve_existing_selectable_value', 'force_new_selectable_false', 'single_sort_order_value', 'write_xml']
+SUMMARY_COUNTS = ['existing', 'new_entries', 'csv_duplicates', 'existing_duplicates', 'added', 'selectable_updated', 'merged']
+
+def manifest_flag(value, default, line_number):
+    if not value:
+        return default
+    if value.strip().lower() in ('true', 'yes', '1'):
+        return True
+    if value.strip().lower() in ('false', 'no', '0'):
+        return False
+    raise ValueError(f"Manifest line {line_number}: '{value}' is not a true/false value")
+
+def read_batch_manifest(manifest_file, output_root, defaults):
+    # Merges of a '~' delimited manifest: header row with input_xml_file~new_entries_csv_file, and optionally output_folder, sort_by and the flag columns.
+    # Relative paths are read from the manifest folder; without output_folder, each merge is written in output_root/<XML file name>
+    manifest_folder = os.path.dirname(os.path.abspath(manifest_file))
+    merges = []
+    with open(manifest_file, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile, delimiter='~')
+        if not reader.fieldnames or not all(column in reader.fieldnames for column in MANIFEST_FILE_COLUMNS):
+            raise ValueError("Manifest file format is incorrect. Expected columns: " + ", ".join(MANIFEST_FILE_COLUMNS))
+        for line_number, row in enumerate(reader, 2):
+            if not row['input_xml_file']:
+                continue  # blank line
+            merge = {column: os.path.join(manifest_folder, row[column]) for column in MANIFEST_FILE_COLUMNS}
+            output_folder = row.get('output_folder') or os.path.splitext(os.path.basename(row['input_xml_file']))[0]
+            merge['output_folder'] = os.path.join(output_root, output_folder)
+            merge['sort_by'] = row.get('sort_by') or defaults['sort_by']
+            if merge['sort_by'] not in ['name', 'displayName']:
+                raise ValueError(f"Manifest line {line_number}: sort_by must be 'name' or 'displayName'")
+            for column in MANIFEST_FLAG_COLUMNS:
+                merge[column] = manifest_flag(row.get(column), defaults[column], line_number)
+            merges.append(merge)
+    output_folders = [os.path.normcase(os.path.abspath(merge['output_folder'])) for merge in merges]
+    if len(set(output_folders)) != len(output_folders):
+        raise ValueError("Manifest: two merges are written in the same output folder, set a distinct output_folder for each")
+    return merges
+
+def run_batch_merge(merge):
+    # One merge of the batch, in a worker process with --jobs: (status, counts or error message)
+    try:
+        return 'merged', merge_enumeration(**merge)
+    except Exception as e:
+        return 'failed', f"{type(e).__name__}: {e}"
+
+def run_batch(manifest_file, output_root, defaults, jobs=1):
+    # Every merge of the manifest in this process (or in a pool of worker processes), then one consolidated summary file
+    merges = read_batch_manifest(manifest_file, output_root, defaults)
+    if not os.path.exists(output_root):
+        os.makedirs(output_root)
+    if jobs > 1 and len(merges) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(merges))) as executor:
+            results = list(executor.map(run_batch_merge, merges))
+    else:
+        results = [run_batch_merge(merge) for merge in merges]
+
+    summary_file_path = os.path.join(output_root, 'batch_summary.txt')
+    with open(summary_file_path, 'w', encoding='utf-8') as file:
+        file.write('~'.join(['input_xml_file', 'output_folder', 'status'] + SUMMARY_COUNTS + ['error']) + '\n')
+        for merge, (status, result) in zip(merges, results):
+            counts = result if status == 'merged' else {}
+            error = result if status == 'failed' else ''
+            file.write('~'.join([merge['input_xml_file'], merge['output_folder'], status] + [str(counts.get(count, '')) for count in SUMMARY_COUNTS] + [error]) + '\n')
+
+    print(f"{'Enumeration':<40} {'Status':<8} {'Existing':>8} {'New':>6} {'Dupl.':>6} {'Added':>6} {'Updated':>8} {'Merged':>7}")
+    for merge, (status, result) in zip(merges, results):
+        name = os.path.splitext(os.path.basename(merge['input_xml_file']))[0]
+        if status == 'merged':
+            duplicates = result['csv_duplicates'] + result['existing_duplicates']
+            print(f"{name:<40} {status:<8} {result['existing']:>8} {result['new_entries']:>6} {duplicates:>6} {result['added']:>6} {result['selectable_updated']:>8} {result['merged']:>7}")
+        else:
+            print(f"{name:<40} {status:<8} {result}")
+    failed = sum(1 for status, _ in results if status == 'failed')
+    print(f"{len(merges) - failed} merged, {failed} failed, summary written to {summary_file_path}")
+    return failed
+
 def main():
     parser = argparse.ArgumentParser(description='Merge XML and CSV enumeration definitions.')
-    parser.add_argument('-i', '--input_xml_file', type=str, required=True, help='Path to the input XML file.')
-    parser.add_argument('-n', '--new_entries_csv_file', type=str, required=True, help='Path to the CSV file with new entries.')
-    parser.add_argument('-o', '--output_folder', type=str, required=True, help='Path for the output folder.')
+    parser.add_argument('-i', '--input_xml_file', type=str, help='Path to the input XML file.')
+    parser.add_argument('-n', '--new_entries_csv_file', type=str, help='Path to the CSV file with new entries.')
+    parser.add_argument('-o', '--output_folder', type=str, required=True, help='Path for the output folder (root output folder with -b).')
     parser.add_argument('-s', '--sort_by', type=str, choices=['name', 'displayName'], default='name', help="OPTIONAL (default is 'name') Sort entries by 'name' or 'displayName'.")
     parser.add_argument('-po', '--preserve_original_order', action='store_true', help="OPTIONAL (if -po not used, reorder all entries per name) Preserve the original order of entries & appending new ones at the end")
     parser.add_argument('-pes', '--preserve_existing_selectable_value', action='store_true', help="OPTIONAL (if -ps not used, selectable value updated to true on existing entries matching new entries) Preserve the original selectable value of existing entries matching new entries")
     parser.add_argument('-f', '--force_new_selectable_false', action='store_true', help="OPTIONAL (if -f not used, selectable value set to true on new entries added to existing) Force selectable value at false for the new entries added to existing entries")
     parser.add_argument('-sso', '--single_sort_order_value', action='store_true', help="OPTIONAL (if -sso not used, sort order is recalculated) Force sort order value to be equal to same value hard-coded to 0")
+    parser.add_argument('-x', '--write_xml', action='store_true', help="OPTIONAL (if -x not used, only the output_merged_file.txt fragment is written) Also write output_merged_file.xml: complete enum load file with the header of the input XML file and the merged members")
+    parser.add_argument('-c', '--model_cache', type=str, help="OPTIONAL (default is $WT_MODEL_CACHE, no cache if not set) Parsed model cache folder: an unchanged XML file is not parsed again")
+    parser.add_argument('-b', '--batch_manifest', type=str, help="OPTIONAL (replaces -i and -n) '~' delimited manifest of the merges to run in one process, see the batch mode in the header of this script")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="OPTIONAL (default is 1) Number of worker processes running the merges of -b")
 
     args = parser.parse_args()
-    # Ensure the output folder exists
-    output_folder = args.output_folder
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
-    extracted_xml_file = os.path.join(args.output_folder, 'extracted_xml.txt')
-    existing_entries = parse_xml(args.input_xml_file,extracted_xml_file)
-    extracted_new_entries_file_path = os.path.join(args.output_folder, 'extracted_new_entries.txt')
-    new_entries = read_new_entries(args.new_entries_csv_file,extracted_new_entries_file_path)
-    generate_output(existing_entries, new_entries, args.output_folder, args.sort_by, args.preserve_original_order, args.preserve_existing_selectable_value, args.force_new_selectable_false, args.single_sort_order_value)
+    if args.model_cache:
+        configure_model_cache(args.model_cache)
+    if args.batch_manifest:
+        defaults = {option: getattr(args, option) for option in ['sort_by'] + MANIFEST_FLAG_COLUMNS}
+        failed = run_batch(args.batch_manifest, args.output_folder, defaults, args.jobs)
+        sys.exit(1 if failed else 0)
+    if not args.input_xml_file or not args.new_entries_csv_file:
+        parser.error('-i/--input_xml_file and -n/--new_entries_csv_file are required without -b/--batch_manifest')
+    merge_enumeration(args.input_xml_file, args.new_entries_csv_file, args.output_folder, args.sort_by, args.preserve_original_order, args.preserve_existing_selectable_value, args.force_new_selectable_false, args.single_sort_order_value, args.write_xml)
 
 if __name__ == "__main__":
     main()